@@ -0,0 +1,142 @@
+# app/core/analytics.py
+"""
+Vectorized statistics over daily mood series.
+
+Every function accepts a 1-D series or a 2-D array with one series per row (e.g. one row per
+team), so hundreds of teams are processed with the same handful of NumPy operations. Days without
+records are NaN and are ignored by the statistics.
+"""
+import numpy as np
+
+
+def daily_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise numerator / denominator, NaN where the denominator is zero."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=denominator > 0)
+
+
+def rolling_ratio(numerator: np.ndarray, denominator: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sum(numerator) / sum(denominator) over the last `window` days, including the current one.
+
+    With intensity sums and record counts this is the rolling mean intensity weighted by the number
+    of records, so quiet days do not count as much as busy ones. NaN until `window` days are seen.
+    """
+    numerator_sums = _window_sums(np.asarray(numerator, dtype=float), window, include_current=True)
+    denominator_sums = _window_sums(np.asarray(denominator, dtype=float), window, include_current=True)
+    ratio = daily_ratio(numerator_sums, denominator_sums)
+    ratio[..., : window - 1] = np.nan
+    return ratio
+
+
+def zscores(values: np.ndarray, baseline_window: int, min_periods: int = 7) -> np.ndarray:
+    """
+    Z-score of each day against the previous `baseline_window` days (the day itself excluded).
+
+    NaN when the baseline has fewer than `min_periods` values or no variance.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    count = _window_sums(valid.astype(float), baseline_window, include_current=False)
+    total = _window_sums(filled, baseline_window, include_current=False)
+    total_squares = _window_sums(filled * filled, baseline_window, include_current=False)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        variance = total_squares / count - mean * mean
+        std = np.sqrt(np.clip(variance, 0.0, None))
+        scores = (values - mean) / std
+
+    scores[(count < min_periods) | (std < 1e-9) | ~valid] = np.nan
+    return scores
+
+
+def change_points(values: np.ndarray, window: int, threshold: float, min_periods: int = 3) -> np.ndarray:
+    """
+    Flags the days where the level of the series shifts: the mean of the `window` days starting at
+    that day differs from the mean of the `window` days before it by more than `threshold` pooled
+    standard deviations. Only the strongest day of each shift is flagged. Returns a boolean mask.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    before_count = _window_sums(valid.astype(float), window, include_current=False)
+    before_total = _window_sums(filled, window, include_current=False)
+    before_squares = _window_sums(filled * filled, window, include_current=False)
+
+    # Janela "depois" = janela "antes" do dia t + window
+    after_count = _shift_left(before_count, window)
+    after_total = _shift_left(before_total, window)
+    after_squares = _shift_left(before_squares, window)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        before_mean = before_total / before_count
+        after_mean = after_total / after_count
+        pooled_variance = (
+            (before_squares - before_count * before_mean ** 2) + (after_squares - after_count * after_mean ** 2)
+        ) / (before_count + after_count - 2)
+        score = np.abs(after_mean - before_mean) / np.sqrt(np.clip(pooled_variance, 1e-12, None))
+
+    score[(before_count < min_periods) | (after_count < min_periods)] = np.nan
+    score = np.nan_to_num(score, nan=0.0)
+
+    # Máximo local dentro de +-window dias: um único ponto por mudança de patamar
+    padded = np.pad(score, [(0, 0)] * (score.ndim - 1) + [(window, window)])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * window + 1, axis=-1)
+    return (score > threshold) & (score >= windows.max(axis=-1))
+
+
+def analyze_mood_series(
+    counts: np.ndarray,
+    intensity_sums: np.ndarray,
+    negative_counts: np.ndarray,
+    rolling_window: int,
+    baseline_window: int,
+    zscore_threshold: float,
+    change_point_window: int,
+    change_point_threshold: float,
+) -> dict[str, np.ndarray]:
+    """
+    Full analysis of daily series (records, intensity sum and negative records per day):
+    daily and rolling averages, z-scores, anomaly flags and change points of the mean intensity.
+    """
+    intensity = daily_ratio(intensity_sums, counts)
+    negative_ratio = daily_ratio(negative_counts, counts) * 100
+    intensity_zscore = zscores(intensity, baseline_window)
+    negative_ratio_zscore = zscores(negative_ratio, baseline_window)
+
+    with np.errstate(invalid="ignore"):
+        is_anomaly = (np.abs(intensity_zscore) >= zscore_threshold) | (
+            np.abs(negative_ratio_zscore) >= zscore_threshold
+        )
+
+    return {
+        "avg_intensity": intensity,
+        "negative_ratio": negative_ratio,
+        "rolling_intensity": rolling_ratio(intensity_sums, counts, rolling_window),
+        "rolling_negative_ratio": rolling_ratio(negative_counts, counts, rolling_window) * 100,
+        "intensity_zscore": intensity_zscore,
+        "negative_ratio_zscore": negative_ratio_zscore,
+        "is_anomaly": is_anomaly,
+        "change_point": change_points(intensity, change_point_window, change_point_threshold),
+    }
+
+
+def _window_sums(values: np.ndarray, window: int, include_current: bool) -> np.ndarray:
+    # Somas móveis via soma acumulada: O(n) independente do tamanho da janela
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    cumulative = np.concatenate([zeros, np.cumsum(values, axis=-1)], axis=-1)
+    end = np.arange(1, values.shape[-1] + 1) if include_current else np.arange(values.shape[-1])
+    start = np.clip(end - window, 0, None)
+    return cumulative[..., end] - cumulative[..., start]
+
+
+def _shift_left(values: np.ndarray, offset: int) -> np.ndarray:
+    shifted = np.zeros_like(values)
+    if offset < values.shape[-1]:
+        shifted[..., : values.shape[-1] - offset] = values[..., offset:]
+    return shifted
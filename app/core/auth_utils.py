@@ -2,8 +2,12 @@
 from decimal import Decimal
 from typing import Any, Dict, Union
 from fastapi import HTTPException, status
-from app.models.team_model import Team
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.crud import async_team_crud, team_crud
+from app.models.team_model import Team, TeamRole
 from app.models.user_model import UserInDB
+from app.utils.constants import Errors
 
 def _normalize(value: Any) -> str:
     """Converte id para string para comparação segura."""
@@ -54,4 +58,44 @@ def ensure_is_team_member_or_manager(team: Union[Team, Dict[str, Any]], user: Us
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem permissão para acessar esse time.",
-        )
\ No newline at end of file
+        )
+
+
+def require_team_manager(db: Session, team_id: int, user: UserInDB) -> TeamRole:
+    """Garantir que o usuário gerencia o time, sem carregar membros e registros do time."""
+    role = _get_team_role(db, team_id, user)
+    if role is not TeamRole.MANAGER:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Você não tem permissão para acessar esse time.",
+        )
+    return role
+
+
+def require_team_member_or_manager(db: Session, team_id: int, user: UserInDB) -> TeamRole:
+    """Garantir que o usuário gerencia ou participa do time, sem carregar membros e registros do time."""
+    return _ensure_member_or_manager(_get_team_role(db, team_id, user))
+
+
+async def require_team_member_or_manager_async(db: AsyncSession, team_id: int, user: UserInDB) -> TeamRole:
+    """Versão assíncrona de require_team_member_or_manager, para as rotas com AsyncSession."""
+    role = await async_team_crud.get_team_role(db, team_id, user.id)
+    if role is None:
+        raise Errors.NOT_FOUND
+    return _ensure_member_or_manager(role)
+
+
+def _ensure_member_or_manager(role: TeamRole) -> TeamRole:
+    if role is TeamRole.NONE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Você não tem permissão para acessar esse time.",
+        )
+    return role
+
+
+def _get_team_role(db: Session, team_id: int, user: UserInDB) -> TeamRole:
+    role = team_crud.get_team_role(db, team_id, user.id)
+    if role is None:
+        raise Errors.NOT_FOUND
+    return role
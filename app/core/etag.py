@@ -0,0 +1,41 @@
+# app/core/etag.py
+import hashlib
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag derived from the given parts (versions, user, URL)."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def check_not_modified(request: Request, response: Response, user_id: int, version: Any) -> None:
+    """
+    Answers 304 Not Modified when the client already has the current representation.
+
+    The ETag combines `version` with the URL (path and query) and the user, since the same
+    resource is rendered differently for each user. Call it after the permission checks and before
+    the heavy query; otherwise the ETag is added to the response. Nothing is done when `version`
+    is None (resource without a version, e.g. a team that does not exist).
+    """
+    if version is None:
+        return
+
+    etag = make_etag(request.url.path, request.url.query, user_id, version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    # Comparação fraca (RFC 9110): W/"x" e "x" são equivalentes
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
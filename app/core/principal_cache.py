@@ -0,0 +1,12 @@
+# app/core/principal_cache.py
+import os
+
+from app.utils.cache import TTLCache
+
+# Usuários autenticados, indexados pelo "sub" (email) do token.
+# O TTL é o tempo máximo que uma alteração feita fora da API (ex.: desativar o usuário direto no banco)
+# leva para ser percebida; alterações feitas via user_crud invalidam a entrada na hora.
+principal_cache = TTLCache(
+    max_size=int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30")),
+)
@@ -0,0 +1,72 @@
+# app/core/report_cache.py
+import copy
+import os
+import threading
+from functools import wraps
+
+from app.utils.cache import TTLCache
+
+# Resultados dos relatórios por time, indexados por (tipo do relatório, team_id, start_date, end_date).
+# As escritas feitas via API invalidam as entradas do time na hora; o TTL cobre alterações feitas
+# direto no banco.
+report_cache = TTLCache(
+    max_size=int(os.getenv("REPORT_CACHE_MAX_SIZE", "256")),
+    ttl_seconds=float(os.getenv("REPORT_CACHE_TTL_SECONDS", "300")),
+)
+
+# Relatórios sendo calculados agora, por time. A invalidação os descarta: um relatório calculado
+# antes de uma escrita não é guardado depois dela. Só guarda os cálculos em andamento, então o
+# tamanho acompanha a concorrência, e não o número de times.
+_building: dict[int, set[object]] = {}
+_building_lock = threading.Lock()
+
+
+def invalidate_team_reports(*team_ids: int | None) -> None:
+    """
+    Drops every cached report of the given teams.
+    """
+    teams = {team_id for team_id in team_ids if team_id is not None}
+    if not teams:
+        return
+
+    with _building_lock:
+        for team_id in teams:
+            _building.pop(team_id, None)
+    report_cache.invalidate_where(lambda key: key[1] in teams)
+
+
+def cached_report(report_type: str):
+    """
+    Caches a report function called as `report(db, team_id, start_date, end_date, **options)`.
+    Keyword options (e.g. the trend granularity) are part of the key. Callers get their own copy
+    of the report, so changing it never affects the cached one.
+    """
+    def decorator(build_report):
+        @wraps(build_report)
+        def wrapper(db, team_id: int, start_date=None, end_date=None, **options):
+            key = (report_type, team_id, start_date, end_date, *sorted(options.items()))
+            report = report_cache.get(key)
+            if report is not None:
+                return copy.deepcopy(report)
+
+            build = object()
+            with _building_lock:
+                _building.setdefault(team_id, set()).add(build)
+            cached = None
+            try:
+                report = build_report(db, team_id, start_date, end_date, **options)
+                cached = copy.deepcopy(report)
+            finally:
+                with _building_lock:
+                    builds = _building.get(team_id, set())
+                    still_valid = build in builds
+                    builds.discard(build)
+                    if not builds:
+                        _building.pop(team_id, None)
+                    if still_valid and cached is not None:
+                        report_cache.set(key, cached)
+            return report
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,249 @@
+# app/core/request_metrics.py
+"""
+HTTP request telemetry: per-route latency and response size histograms, status codes and
+in-flight requests, exposed in the Prometheus text format, plus a `Server-Timing` header that
+splits each response time into database, serialization and total, and the number of SQL
+statements each request ran (`X-DB-Statements` header and logs).
+"""
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.utils.logger import logger
+
+# Logger próprio, para poder ser amostrado separadamente (LOG_SAMPLING="MA.request=0.1")
+request_logger = logger.getChild("request")
+
+# Limites dos histogramas: duração em segundos e tamanho da resposta em bytes
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Rotas inexistentes ficam num único rótulo, para não criar uma série por URL
+UNMATCHED_ROUTE = "unmatched"
+
+# Requisições com mais comandos SQL do que isso geram um aviso no log (provável N+1)
+STATEMENT_WARNING_THRESHOLD = int(os.getenv("REQUEST_STATEMENT_WARNING_THRESHOLD", "25"))
+
+
+class RequestTiming:
+    """
+    SQL statements run by the current request, and time spent in the database and serializing the
+    response body.
+    """
+
+    __slots__ = ("statements", "db_seconds", "serialize_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+
+# Objeto mutável: as rotas síncronas rodam numa cópia do contexto (threadpool), mas somam no mesmo objeto
+current_timing: ContextVar[RequestTiming | None] = ContextVar("current_timing", default=None)
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus sense: one counter per upper bound plus sum and count."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else _format_number(bound), total))
+        return result
+
+
+class RequestMetrics:
+    """
+    Thread-safe registry of the HTTP metrics, labelled by method and route template
+    (`/teams/{team_id}`, never the concrete URL).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests: dict[tuple[str, str, int], int] = {}
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.response_size: dict[tuple[str, str], Histogram] = {}
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float, size: int) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, route)
+            self.requests[key + (status,)] = self.requests.get(key + (status,), 0) + 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.response_size.setdefault(key, Histogram(SIZE_BUCKETS)).observe(size)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.latency.clear()
+            self.response_size.clear()
+
+    def render(self) -> str:
+        """Metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            lines = [
+                "# HELP http_requests_in_flight Requests currently being processed.",
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+                "# HELP http_requests_total Requests processed, by route and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+            lines += _render_histograms(
+                "http_request_duration_seconds", "Time to process a request, by route.", self.latency
+            )
+            lines += _render_histograms(
+                "http_response_size_bytes", "Size of the response body, by route.", self.response_size
+            )
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware, so streaming responses are not buffered) that
+    records every HTTP request in `request_metrics`, adds the `Server-Timing` and `X-DB-Statements`
+    headers and logs how many statements each request ran.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(timing, time.perf_counter() - start).encode()))
+                headers.append((b"x-db-statements", str(timing.statements).encode()))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.request_started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timing.reset(token)
+            route = _route_template(scope)
+            self.metrics.request_finished(scope["method"], route, status, time.perf_counter() - start, size)
+            _log_statements(scope["method"], route, status, timing)
+
+
+def instrument_engine(engine) -> None:
+    """
+    Counts every statement executed by `engine`, and its time, in the timing of the current request.
+    For an AsyncEngine pass `async_engine.sync_engine`.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # O início fica no contexto de execução: se o comando falhar, ele é simplesmente descartado
+    context.query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = current_timing.get()
+    if timing is not None:
+        timing.statements += 1
+        timing.db_seconds += time.perf_counter() - context.query_started_at
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+def _log_statements(method: str, route: str, status: int, timing: RequestTiming) -> None:
+    if not timing.statements:
+        return
+
+    warning = timing.statements > STATEMENT_WARNING_THRESHOLD
+    level = logging.WARNING if warning else logging.DEBUG
+    if not request_logger.isEnabledFor(level):
+        return
+
+    db_ms = round(timing.db_seconds * 1000, 2)
+    request_logger.log(
+        level,
+        "%s %s -> %s: %s SQL statements, %s ms in the database%s",
+        method, route, status, timing.statements, db_ms,
+        " (possible N+1)" if warning else "",
+        extra={"method": method, "route": route, "status": status, "statements": timing.statements, "db_ms": db_ms},
+    )
+
+
+def _server_timing(timing: RequestTiming, total_seconds: float) -> str:
+    return (
+        f"db;dur={timing.db_seconds * 1000:.2f}, "
+        f"serialize;dur={timing.serialize_seconds * 1000:.2f}, "
+        f"total;dur={total_seconds * 1000:.2f}"
+    )
+
+
+def _render_histograms(name: str, description: str, histograms: dict[tuple[str, str], Histogram]) -> list[str]:
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for (method, route), histogram in sorted(histograms.items()):
+        for bound, count in histogram.cumulative():
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {count}")
+        lines.append(f"{name}_sum{_labels(method=method, route=route)} {_format_number(histogram.sum)}")
+        lines.append(f"{name}_count{_labels(method=method, route=route)} {histogram.count}")
+    return lines
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
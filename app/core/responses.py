@@ -0,0 +1,61 @@
+# app/core/responses.py
+"""
+Default response class of the API (orjson) and the fast path of the large list endpoints.
+
+FastAPI validates every returned object against `response_model` and converts it to JSON-compatible
+Python before rendering. For lists of thousands of records built from our own database rows that
+work is pure overhead, so those routes return `trusted_json_response(...)`: plain rows rendered
+straight by orjson. `response_model` stays on the route for the OpenAPI schema.
+"""
+import time
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from app.core.request_metrics import current_timing
+
+
+def _default(value: Any) -> Any:
+    # Modelos Pydantic no meio das linhas (ex.: dados do time) viram dicts
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class AppJSONResponse(ORJSONResponse):
+    """
+    orjson response that also accepts Pydantic models inside the content and adds the rendering
+    time to the current request timing (Server-Timing `serialize`).
+    """
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        try:
+            return orjson.dumps(
+                content,
+                default=_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z,
+            )
+        finally:
+            timing = current_timing.get()
+            if timing is not None:
+                timing.serialize_seconds += time.perf_counter() - start
+
+
+def trusted_json_response(content: Any, response: Response | None = None) -> AppJSONResponse:
+    """
+    Returns `content` as is, skipping the `response_model` validation and serialization. Only for
+    content built from database rows that already match the response model.
+
+    `response` is the Response injected in the route: its headers (e.g. ETag) are kept, as FastAPI
+    does for the responses it builds itself.
+    """
+    json_response = AppJSONResponse(content)
+    if response is not None:
+        if response.status_code:
+            json_response.status_code = response.status_code
+        json_response.headers.raw.extend(response.headers.raw)
+    return json_response
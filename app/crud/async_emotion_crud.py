@@ -0,0 +1,9 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import emotion_crud
+
+# Versões assíncronas das funções de emotion_crud, executadas via AsyncSession.run_sync.
+
+
+async def get_emotions_by_team(db: AsyncSession, team_id: int):
+    return await db.run_sync(emotion_crud.get_emotions_by_team, team_id)
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import emotion_record_crud
+from app.models.emotion_record_model import BulkEmotionRecord, EmotionRecord as EmotionRecordModel
+
+# Versões assíncronas das funções de emotion_record_crud. A lógica continua nas funções síncronas,
+# que o AsyncSession executa via run_sync sobre um driver assíncrono (asyncpg/aiosqlite), sem
+# ocupar threads do threadpool enquanto espera o banco.
+
+
+async def create_emotion_record(db: AsyncSession, emotion_record: EmotionRecordModel):
+    return await db.run_sync(emotion_record_crud.create_emotion_record, emotion_record)
+
+
+async def create_emotion_records_bulk(db: AsyncSession, emotion_records: list[BulkEmotionRecord]):
+    return await db.run_sync(emotion_record_crud.create_emotion_records_bulk, emotion_records)
+
+
+async def get_emotion_records_by_user_id(
+    db: AsyncSession,
+    users_id: list[int],
+    for_team: bool = False,
+    team_id: int = None,
+    include_feedbacks: bool = False,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+):
+    return await db.run_sync(
+        lambda session: emotion_record_crud.get_emotion_records_by_user_id(
+            session,
+            users_id,
+            for_team=for_team,
+            team_id=team_id,
+            include_feedbacks=include_feedbacks,
+            limit=limit,
+            after=after,
+        )
+    )
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import team_crud, team_version_crud
+from app.models.team_model import TeamRole
+
+# Versões assíncronas das funções de team_crud, executadas via AsyncSession.run_sync.
+
+
+async def get_team_by_id(
+    db: AsyncSession,
+    team_id: int,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+):
+    return await db.run_sync(
+        lambda session: team_crud.get_team_by_id(session, team_id, limit=limit, after=after)
+    )
+
+
+async def get_team_role(db: AsyncSession, team_id: int, user_id: int) -> TeamRole | None:
+    return await db.run_sync(team_crud.get_team_role, team_id, user_id)
+
+
+async def get_team_version(db: AsyncSession, team_id: int) -> int | None:
+    return await db.run_sync(team_version_crud.get_team_version, team_id)
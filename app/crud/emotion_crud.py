@@ -3,18 +3,21 @@ from sqlalchemy.orm import Session
 from app.schemas.emotion_record_schema import Emotion
 from app.models.emotion_model import Emotion as EmotionModel
 from app.crud.team_crud import is_manager_of_team
+from app.core.report_cache import invalidate_team_reports
+from app.crud.team_emotion_daily_crud import delete_emotion_rollup, sync_emotion_rollup
+from app.crud.team_version_crud import bump_catalog_version, bump_team_versions
 from app.schemas.team_schema import Team
 from app.utils.logger import logger
 
 
 def create_emotion(db: Session, emotion: EmotionModel, user_id: int):
     if not is_manager_of_team(db, user_id, emotion.team_id):
-        logger.error(f"User with ID {user_id} isn't the Team manager where Team's ID is {emotion.team_id}.")
+        logger.error("User with ID %s isn't the Team manager where Team's ID is %s.", user_id, emotion.team_id)
         return None
 
     db_team = db.query(Team).filter(Team.id == emotion.team_id).first()
     if db_team is None:
-        logger.error(f"Team with ID {emotion.team_id} not found.")
+        logger.error("Team with ID %s not found.", emotion.team_id)
         return None
 
     db_emotion = Emotion(
@@ -26,6 +29,8 @@ def create_emotion(db: Session, emotion: EmotionModel, user_id: int):
 
     )
     db.add(db_emotion)
+    bump_team_versions(db, emotion.team_id)
+    bump_catalog_version(db)
     db.commit()
     db.refresh(db_emotion)
 
@@ -35,11 +40,11 @@ def create_emotion(db: Session, emotion: EmotionModel, user_id: int):
 def get_emotion_by_id(db: Session, emotion_id: int, user_id: int):
     db_emotion = db.query(Emotion).filter(Emotion.id == emotion_id).first()
     if db_emotion is None:
-        logger.error(f"Emotion with ID {emotion_id} not found.")
+        logger.error("Emotion with ID %s not found.", emotion_id)
         return None
 
     if not is_manager_of_team(db, user_id, db_emotion.team_id):
-        logger.error(f"User with ID {user_id} isn't the Team manager where Team's ID is {db_emotion.team_id}.")
+        logger.error("User with ID %s isn't the Team manager where Team's ID is %s.", user_id, db_emotion.team_id)
         return None
 
     return db_emotion
@@ -48,7 +53,7 @@ def get_emotion_by_id(db: Session, emotion_id: int, user_id: int):
 def get_emotion_id_by_name(db: Session, emotion_name: str):
     db_emotion = db.query(Emotion).filter(Emotion.name == emotion_name).first()
     if db_emotion is None:
-        logger.error(f"Emotion {emotion_name} not found.")
+        logger.error("Emotion %s not found.", emotion_name)
         return None
 
     return db_emotion.id
@@ -64,21 +69,28 @@ def update_emotion(db: Session, emotion_id: int, emotion_update: dict, user_id:
     """
     db_emotion = db.query(Emotion).filter(Emotion.id == emotion_id).first()
     if db_emotion is None:
-        logger.error(f"Emotion with ID {emotion_id} not found.")
+        logger.error("Emotion with ID %s not found.", emotion_id)
         return None
 
     if not is_manager_of_team(db, user_id, db_emotion.team_id):
-        logger.error(f"User with ID {user_id} isn't the Team manager where Team's ID is {db_emotion.team_id}.")
+        logger.error("User with ID %s isn't the Team manager where Team's ID is %s.", user_id, db_emotion.team_id)
         return None
 
+    previous_team_id = db_emotion.team_id
     for key, value in emotion_update.items():
         if hasattr(db_emotion, key):
             setattr(db_emotion, key, value)
 
+    if "is_negative" in emotion_update or "team_id" in emotion_update:
+        sync_emotion_rollup(db, db_emotion)
+
+    bump_team_versions(db, previous_team_id, db_emotion.team_id)
+    bump_catalog_version(db)
     db.commit()
     db.refresh(db_emotion)
+    invalidate_team_reports(previous_team_id, db_emotion.team_id)
 
-    logger.debug(f"Emotion with ID {emotion_id} updated successfully.")
+    logger.debug("Emotion with ID %s updated successfully.", emotion_id)
     return db_emotion
 
 
@@ -88,17 +100,22 @@ def delete_emotion(db: Session, emotion_id: int, user_id: int):
     """
     db_emotion = db.query(Emotion).filter(Emotion.id == emotion_id).first()
     if db_emotion is None:
-        logger.error(f"Emotion with ID {emotion_id} not found.")
+        logger.error("Emotion with ID %s not found.", emotion_id)
         return False
 
     if not is_manager_of_team(db, user_id, db_emotion.team_id):
-        logger.error(f"User with ID {user_id} isn't the Team manager where Team's ID is{db_emotion.team_id}.")
+        logger.error("User with ID %s isn't the Team manager where Team's ID is%s.", user_id, db_emotion.team_id)
         return False
 
+    team_id = db_emotion.team_id
+    delete_emotion_rollup(db, emotion_id)
     db.delete(db_emotion)
+    bump_team_versions(db, team_id)
+    bump_catalog_version(db)
     db.commit()
+    invalidate_team_reports(team_id)
 
-    logger.debug(f"Emotion with ID {emotion_id} deleted successfully.")
+    logger.debug("Emotion with ID %s deleted successfully.", emotion_id)
     return True
 
 
@@ -1,15 +1,31 @@
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.models.emotion_record_model import (
+    BulkEmotionRecord,
+    BulkEmotionRecordResult,
     EmotionRecord as EmotionRecordModel,
-    EmotionRecordInDb,
-    EmotionRecordInTeam,
     EmotionRecordWithEmotion,
+    FeedbackSummary,
 )
 from app.models.emotion_model import EmotionInDb
-from app.schemas.emotion_record_schema import EmotionRecord as EmotionRecordSchema
+from app.schemas.emotion_record_schema import Emotion, EmotionRecord as EmotionRecordSchema
+from app.schemas.feedback_schema import Feedback
+from app.crud.team_emotion_daily_crud import add_to_daily_rollup, increment_daily_rollup
+from app.crud.team_version_crud import bump_team_versions
+from app.core.report_cache import invalidate_team_reports
 
+from app.utils.constants import Pagination
 from app.utils.logger import logger
+from app.utils.pagination import encode_cursor
+
+# Tamanho máximo da lista do IN ao buscar feedbacks: uma página cheia ainda cabe numa única consulta,
+# e listagens sem paginação (por emoção) não geram um IN sem limite
+FEEDBACK_LOOKUP_BATCH_SIZE = Pagination.MAX_LIMIT
 
 
 def create_emotion_record(db: Session, emotion_record: EmotionRecordModel):
@@ -21,89 +37,141 @@ def create_emotion_record(db: Session, emotion_record: EmotionRecordModel):
         user_id=emotion_record.user_id,
     )
     db.add(db_emotion_record)
+    # O rollup diário é atualizado na mesma transação do registro
+    db.flush()
+    team_id = increment_daily_rollup(db, db_emotion_record)
+    bump_team_versions(db, team_id)
     db.commit()
+    invalidate_team_reports(team_id)
     db.refresh(db_emotion_record)
 
     return db_emotion_record
 
 
+def create_emotion_records_bulk(db: Session, emotion_records: list[BulkEmotionRecord]):
+    """
+    Creates many emotion records in one transaction and returns one result per item, in order.
+
+    The emotions are validated with a single query and the valid records are written with one
+    multi-row INSERT ... RETURNING; items pointing to unknown emotions are rejected individually.
+    """
+    emotion_ids = {emotion_record.emotion_id for emotion_record in emotion_records}
+    emotions = {
+        row.id: row
+        for row in db.execute(
+            select(Emotion.id, Emotion.team_id, Emotion.is_negative).where(Emotion.id.in_(emotion_ids))
+        )
+    }
+
+    now = datetime.now()
+    rows, accepted, results = [], [], []
+    totals: dict[tuple, list[int]] = defaultdict(lambda: [0, 0, 0])
+    for index, emotion_record in enumerate(emotion_records):
+        emotion = emotions.get(emotion_record.emotion_id)
+        if emotion is None:
+            results.append(BulkEmotionRecordResult(index=index, status="rejected", error="Emotion not found"))
+            continue
+
+        created_at = emotion_record.created_at or now
+        rows.append({
+            "emotion_id": emotion_record.emotion_id,
+            "intensity": int(emotion_record.intensity),
+            "notes": emotion_record.notes,
+            "is_anonymous": bool(emotion_record.is_anonymous),
+            "user_id": emotion_record.user_id,
+            "created_at": created_at,
+        })
+        accepted.append(index)
+        results.append(BulkEmotionRecordResult(index=index, status="created"))
+
+        team_totals = totals[(emotion.team_id, emotion.id, created_at.date())]
+        team_totals[0] += 1
+        team_totals[1] += int(emotion_record.intensity)
+        team_totals[2] += 1 if emotion.is_negative else 0
+
+    if not rows:
+        return results
+
+    try:
+        record_ids = _insert_returning_ids(db, rows)
+        add_to_daily_rollup(db, {key: tuple(value) for key, value in totals.items()})
+        bump_team_versions(db, *{team_id for team_id, _, _ in totals})
+        db.commit()
+    except SQLAlchemyError as error:
+        db.rollback()
+        logger.error("Bulk insert of %s emotion records failed: %s", len(rows), error)
+        return None
+
+    for index, record_id in zip(accepted, record_ids):
+        results[index].id = record_id
+    invalidate_team_reports(*{team_id for team_id, _, _ in totals})
+
+    return results
+
+
+def _insert_returning_ids(db: Session, rows: list[dict]) -> list[int]:
+    # No PostgreSQL o SQLAlchemy garante a ordem do RETURNING em lotes (sort_by_parameter_order).
+    # No SQLite isso forçaria um INSERT por linha; lá os IDs são alocados em ordem crescente dentro
+    # do mesmo INSERT (escritor único), então basta ordená-los.
+    if db.get_bind().dialect.name == "postgresql":
+        statement = insert(EmotionRecordSchema).returning(EmotionRecordSchema.id, sort_by_parameter_order=True)
+        return db.scalars(statement, rows).all()
+
+    statement = insert(EmotionRecordSchema).returning(EmotionRecordSchema.id)
+    return sorted(db.scalars(statement, rows).all())
+
+
 def get_emotion_records_by_user_id(
     db: Session,
     users_id: list[int],
     for_team: bool = False,
     team_id: int = None,  # Adiciona parâmetro team_id
     include_feedbacks: bool = False,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
 ):
+    """
+    Returns the emotion records of the given users, newest first, and the cursor of the next page.
+    Records are plain dicts shaped like EmotionRecordInDb (EmotionRecordInTeam when `for_team`).
+
+    When `limit` is given the records are paginated by keyset on (created_at, id): `after` is the
+    decoded cursor of the previous page, so every page costs the same regardless of history size.
+    """
     # Se for para team e team_id for fornecido, filtra por emoções do time específico
     if for_team and team_id is not None:
         from app.schemas.emotion_record_schema import Emotion
-        emotion_records = (
+        query = (
             db.query(EmotionRecordSchema)
             .join(Emotion, EmotionRecordSchema.emotion_id == Emotion.id)
             .filter(
                 EmotionRecordSchema.user_id.in_(users_id),
                 Emotion.team_id == team_id  # Filtra por emoções do time específico
             )
-            .all()
         )
     else:
         # Lógica original para outros casos
-        emotion_records = (
-            db.query(EmotionRecordSchema)
-            .filter(EmotionRecordSchema.user_id.in_(users_id))
-            .all()
-        )
+        query = db.query(EmotionRecordSchema).filter(EmotionRecordSchema.user_id.in_(users_id))
+
+    emotion_records, next_cursor = _paginate(query, limit, after)
     if for_team:
-        result: list[EmotionRecordInTeam] = []
-        for emotion_record in emotion_records:
-            record = EmotionRecordInTeam(
-                id=emotion_record.id,
-                user_id=None if emotion_record.is_anonymous else emotion_record.user_id,
-                emotion_id=emotion_record.emotion_id,
-                intensity=emotion_record.intensity,
-                notes=emotion_record.notes,
-                is_anonymous=emotion_record.is_anonymous,
-                user_name=None,  # Será preenchido posteriormente
-                created_at=emotion_record.created_at,
-            )
-            result.append(record)
+        # Linhas já no formato de EmotionRecordInTeam: vão direto para o JSON, sem validação por linha
+        result = [
+            {
+                "user_id": None if emotion_record.is_anonymous else emotion_record.user_id,
+                "emotion_id": emotion_record.emotion_id,
+                "intensity": emotion_record.intensity,
+                "notes": emotion_record.notes,
+                "is_anonymous": emotion_record.is_anonymous,
+                "id": emotion_record.id,
+                "user_name": None,  # Será preenchido posteriormente
+                "created_at": emotion_record.created_at,
+            }
+            for emotion_record in emotion_records
+        ]
     else:
-        result: list[EmotionRecordInDb] = []
-        for emotion_record in emotion_records:
-            record = EmotionRecordInDb(
-                id=emotion_record.id,
-                user_id=None if emotion_record.is_anonymous else emotion_record.user_id,
-                emotion_id=emotion_record.emotion_id,
-                intensity=emotion_record.intensity,
-                notes=emotion_record.notes,
-                is_anonymous=emotion_record.is_anonymous,
-                created_at=emotion_record.created_at,
-                feedbacks=[]
-            )
-            
-            # Se solicitado, incluir os feedbacks
-            if include_feedbacks:
-                from app.schemas.feedback_schema import Feedback
-                from app.models.emotion_record_model import FeedbackSummary
-                
-                feedbacks = (
-                    db.query(Feedback)
-                    .filter(Feedback.emotion_record_id == emotion_record.id)
-                    .all()
-                )
-                for feedback in feedbacks:
-                    feedback_summary = FeedbackSummary(
-                        id=feedback.id,
-                        message=feedback.message,
-                        is_anonymous=feedback.is_anonymous,
-                        created_at=feedback.created_at,
-                        emotion_record_id=emotion_record.id,
-                    )
-                    record.feedbacks.append(feedback_summary)
-            
-            result.append(record)
-
-    return result
+        result = _build_records_with_feedbacks(db, emotion_records, include_feedbacks)
+
+    return result, next_cursor
 
 
 def get_emotion_records_by_user_id_and_emotion_id(
@@ -117,57 +185,39 @@ def get_emotion_records_by_user_id_and_emotion_id(
         )
         .all()
     )
-    result: list[EmotionRecordInDb] = []
-    for emotion_record in emotion_records:
-        record = EmotionRecordInDb(
-            id=emotion_record.id,
-            user_id=None if emotion_record.is_anonymous else emotion_record.user_id,
-            emotion_id=emotion_record.emotion_id,
-            intensity=emotion_record.intensity,
-            notes=emotion_record.notes,
-            is_anonymous=emotion_record.is_anonymous,
-            created_at=emotion_record.created_at,
-            feedbacks=[],
-        )
-        
-        # Se solicitado, incluir os feedbacks
-        if include_feedbacks:
-            from app.schemas.feedback_schema import Feedback
-            from app.models.emotion_record_model import FeedbackSummary
-            
-            feedbacks = (
-                db.query(Feedback)
-                .filter(Feedback.emotion_record_id == emotion_record.id)
-                .all()
-            )
-            for feedback in feedbacks:
-                feedback_summary = FeedbackSummary(
-                    id=feedback.id,
-                    message=feedback.message,
-                    is_anonymous=feedback.is_anonymous,
-                    created_at=feedback.created_at,
-                    emotion_record_id=emotion_record.id,
-                )
-                record.feedbacks.append(feedback_summary)
-        
-        result.append(record)
-
-    return result
 
+    return _build_records_with_feedbacks(db, emotion_records, include_feedbacks)
 
-def get_emotion_record_by_id(db: Session, record_id: int):
-    from app.schemas.emotion_record_schema import EmotionRecord as EmotionRecordSchema
 
-    db_record = (
-        db.query(EmotionRecordSchema)
-        .filter(EmotionRecordSchema.id == record_id)
-        .first()
+def get_emotion_record_by_id(
+    db: Session, record_id: int, user_id: int | None = None, include_feedbacks: bool = False
+):
+    """
+    Returns an emotion record with its emotion (and feedbacks, if requested) in a single query.
+    When `user_id` is given, only a record owned by that user is returned.
+    """
+    query = (
+        select(EmotionRecordSchema, Emotion)
+        .join(Emotion, EmotionRecordSchema.emotion_id == Emotion.id)
+        .where(EmotionRecordSchema.id == record_id)
     )
-    if db_record is None:
-        logger.error(f"Emotion record with ID {record_id} not found.")
+    if user_id is not None:
+        # A posse faz parte da consulta: registro de outro usuário é o mesmo que inexistente
+        query = query.where(EmotionRecordSchema.user_id == user_id)
+    if include_feedbacks:
+        query = (
+            query.add_columns(Feedback)
+            .outerjoin(Feedback, Feedback.emotion_record_id == EmotionRecordSchema.id)
+            .order_by(Feedback.id)
+        )
+
+    rows = db.execute(query).all()
+    if not rows:
+        logger.error("Emotion record with ID %s not found.", record_id)
         return None
 
-    record = EmotionRecordWithEmotion(
+    db_record, db_emotion = rows[0][0], rows[0][1]
+    return EmotionRecordWithEmotion(
         id=db_record.id,
         user_id=None if db_record.is_anonymous else db_record.user_id,
         emotion_id=db_record.emotion_id,
@@ -175,7 +225,76 @@ def get_emotion_record_by_id(db: Session, record_id: int):
         notes=db_record.notes,
         is_anonymous=db_record.is_anonymous,
         created_at=db_record.created_at,
-        feedbacks=[],
-        emotion=EmotionInDb.model_validate(db_record.emotion),
+        feedbacks=[
+            FeedbackSummary.model_validate(row[2]) for row in rows if include_feedbacks and row[2] is not None
+        ],
+        emotion=EmotionInDb.model_validate(db_emotion),
+    )
+
+
+def _build_records_with_feedbacks(db: Session, emotion_records, include_feedbacks: bool):
+    # Se solicitado, busca os feedbacks de todos os registros em uma única consulta
+    feedbacks_by_record = (
+        get_feedback_summaries_by_record_ids(db, [record.id for record in emotion_records])
+        if include_feedbacks
+        else {}
     )
-    return record
+
+    # Dicts no formato de EmotionRecordInDb; model_construct por linha foi medido mais lento que isso
+    return [
+        {
+            "user_id": None if emotion_record.is_anonymous else emotion_record.user_id,
+            "emotion_id": emotion_record.emotion_id,
+            "intensity": emotion_record.intensity,
+            "notes": emotion_record.notes,
+            "is_anonymous": emotion_record.is_anonymous,
+            "id": emotion_record.id,
+            "created_at": emotion_record.created_at,
+            "feedbacks": feedbacks_by_record.get(emotion_record.id, []),
+        }
+        for emotion_record in emotion_records
+    ]
+
+
+def get_feedback_summaries_by_record_ids(db: Session, record_ids: list[int]) -> dict[int, list[dict]]:
+    """
+    Loads the feedbacks of many emotion records grouped by emotion record ID, with one query per
+    FEEDBACK_LOOKUP_BATCH_SIZE records. Each feedback is a dict shaped like FeedbackSummary.
+    """
+    feedbacks_by_record: dict[int, list[dict]] = defaultdict(list)
+    for start in range(0, len(record_ids), FEEDBACK_LOOKUP_BATCH_SIZE):
+        feedbacks = (
+            db.query(Feedback)
+            .filter(Feedback.emotion_record_id.in_(record_ids[start:start + FEEDBACK_LOOKUP_BATCH_SIZE]))
+            .order_by(Feedback.emotion_record_id, Feedback.id)
+            .all()
+        )
+        for feedback in feedbacks:
+            feedbacks_by_record[feedback.emotion_record_id].append(
+                {
+                    "id": feedback.id,
+                    "message": feedback.message,
+                    "is_anonymous": feedback.is_anonymous,
+                    "created_at": feedback.created_at,
+                    "emotion_record_id": feedback.emotion_record_id,
+                }
+            )
+
+    return feedbacks_by_record
+
+
+def _paginate(query, limit: int | None, after: tuple[datetime, int] | None):
+    query = query.order_by(EmotionRecordSchema.created_at.desc(), EmotionRecordSchema.id.desc())
+    if after is not None:
+        query = query.filter(tuple_(EmotionRecordSchema.created_at, EmotionRecordSchema.id) < after)
+    if limit is None:
+        return query.all(), None
+
+    # Busca um registro a mais para saber se existe uma próxima página
+    emotion_records = query.limit(limit + 1).all()
+    if len(emotion_records) <= limit:
+        return emotion_records, None
+
+    emotion_records = emotion_records[:limit]
+    last = emotion_records[-1]
+    return emotion_records, encode_cursor(last.created_at, last.id)
@@ -1,120 +1,117 @@
+from datetime import datetime
+
+from sqlalchemy import exists, insert, not_, select, tuple_
 from sqlalchemy.orm import Session
 
 from app.models.feedback_model import FeedbackCreate, FeedbackResponse
 from app.schemas.feedback_schema import Feedback
 from app.schemas.emotion_record_schema import EmotionRecord
-from app.crud.team_crud import is_manager_of_team
+from app.schemas.team_schema import Team, user_teams
 
 from app.utils.logger import logger
+from app.utils.pagination import encode_cursor
 
 
-def create_feedback(db: Session, feedback: FeedbackCreate, manager_id: int):
-    # Verificar se o registro de emoção existe
-    emotion_record = db.query(EmotionRecord).filter(EmotionRecord.id == feedback.emotion_record_id).first()
-    if not emotion_record:
-        logger.error(f"Emotion record with ID {feedback.emotion_record_id} not found")
+def create_feedback(db: Session, feedback: FeedbackCreate, manager_id: int) -> FeedbackResponse | None:
+    """
+    Creates a feedback of a manager on an emotion record, in two statements: a permission check
+    that also reads the anonymity of the record, and an INSERT ... RETURNING.
+    Returns None if the record doesn't exist or the manager can't send feedback to it.
+    """
+    # Se o registro for anônimo, o gerente não sabe a identidade do colaborador
+    record_is_anonymous = db.scalar(
+        select(EmotionRecord.is_anonymous).where(
+            EmotionRecord.id == feedback.emotion_record_id,
+            _manages_record_owner(manager_id),
+        )
+    )
+    if record_is_anonymous is None:
+        logger.error(
+            "Manager %s cannot send feedback to emotion record %s", manager_id, feedback.emotion_record_id
+        )
         return None
-    
-    # Criar o feedback
-    db_feedback = Feedback(
+
+    row = db.execute(
+        insert(Feedback)
+        .values(
+            message=feedback.message,
+            emotion_record_id=feedback.emotion_record_id,
+            manager_id=manager_id,
+            is_anonymous=feedback.is_anonymous,
+        )
+        .returning(Feedback.id, Feedback.created_at)
+    ).one()
+    db.commit()
+
+    return FeedbackResponse(
+        id=row.id,
         message=feedback.message,
         emotion_record_id=feedback.emotion_record_id,
         manager_id=manager_id,
-        is_anonymous=feedback.is_anonymous
+        is_anonymous=feedback.is_anonymous,
+        created_at=row.created_at,
+        manager_knows_identity=not record_is_anonymous,
     )
-    
-    db.add(db_feedback)
-    db.commit()
-    db.refresh(db_feedback)
-    
-    return db_feedback
 
 
 def get_feedbacks_by_emotion_record_id(db: Session, emotion_record_id: int):
     return db.query(Feedback).filter(Feedback.emotion_record_id == emotion_record_id).all()
 
 
-def get_feedbacks_by_user_id(db: Session, user_id: int):
-    # Buscar todos os registros de emoção do usuário
-    emotion_records = db.query(EmotionRecord).filter(EmotionRecord.user_id == user_id).all()
-    
-    if not emotion_records:
-        return []
-    
-    # Buscar todos os feedbacks associados a esses registros
-    emotion_record_ids = [record.id for record in emotion_records]
-    feedbacks = db.query(Feedback).filter(Feedback.emotion_record_id.in_(emotion_record_ids)).all()
-    
-    # Converter para o modelo de resposta
-    result = []
-    for feedback in feedbacks:
-        # Verificar se o feedback é anônimo
-        emotion_record = db.query(EmotionRecord).filter(EmotionRecord.id == feedback.emotion_record_id).first()
-        
-        # Se o feedback for anônimo, o gerente não sabe a identidade do colaborador
-        manager_knows_identity = not emotion_record.is_anonymous
-        
-        feedback_response = FeedbackResponse(
-            id=feedback.id,
-            message=feedback.message,
-            emotion_record_id=feedback.emotion_record_id,
-            manager_id=feedback.manager_id,
-            is_anonymous=feedback.is_anonymous,
-            created_at=feedback.created_at,
-            manager_knows_identity=manager_knows_identity
+def get_feedbacks_by_user_id(
+    db: Session,
+    user_id: int,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+    since: datetime | None = None,
+):
+    """
+    Returns the feedbacks received on the emotion records of a user, newest first, and the cursor of
+    the next page. One query, joining feedback and emotion record: `manager_knows_identity` is
+    computed in SQL from the anonymity of the record.
+
+    When `limit` is given the feedbacks are paginated by keyset on (created_at, id), `after` being
+    the decoded cursor of the previous page. `since` keeps only feedbacks created from that moment on.
+    """
+    query = (
+        select(
+            Feedback.id,
+            Feedback.message,
+            Feedback.emotion_record_id,
+            Feedback.is_anonymous,
+            Feedback.manager_id,
+            Feedback.created_at,
+            # Se o registro for anônimo, o gerente não sabe a identidade do colaborador
+            not_(EmotionRecord.is_anonymous).label("manager_knows_identity"),
         )
-        result.append(feedback_response)
-    
-    return result
+        .join(EmotionRecord, Feedback.emotion_record_id == EmotionRecord.id)
+        .where(EmotionRecord.user_id == user_id)
+        .order_by(Feedback.created_at.desc(), Feedback.id.desc())
+    )
+    if since is not None:
+        if since.tzinfo is not None:
+            # As datas são gravadas sem fuso, na hora local do servidor
+            since = since.astimezone().replace(tzinfo=None)
+        query = query.where(Feedback.created_at >= since)
+    if after is not None:
+        query = query.where(tuple_(Feedback.created_at, Feedback.id) < after)
+    if limit is not None:
+        # Busca um feedback a mais para saber se existe uma próxima página
+        query = query.limit(limit + 1)
 
+    feedbacks = [dict(row) for row in db.execute(query).mappings()]
+    if limit is None or len(feedbacks) <= limit:
+        return feedbacks, None
 
-def can_manager_send_feedback(db: Session, manager_id: int, emotion_record_id: int):
-    """
-    Verifica se o gerente pode enviar feedback para um registro de emoção específico
-    """
-    # Buscar o registro de emoção
-    emotion_record = db.query(EmotionRecord).filter(EmotionRecord.id == emotion_record_id).first()
-    if not emotion_record:
-        return False
-    
-    # Se o registro for anônimo, o gerente pode enviar feedback sem saber quem é o colaborador
-    if emotion_record.is_anonymous:
-        # Mas ainda precisamos verificar se o gerente é gerente do time do colaborador
-        # Para isso, precisamos buscar o time do colaborador
-        from app.schemas.user_schema import User
-        from app.schemas.team_schema import Team, user_teams
-        
-        user = db.query(User).filter(User.id == emotion_record.user_id).first()
-        if not user:
-            return False
-        
-        # Buscar os times do usuário
-        teams = db.query(Team).join(user_teams).filter(user_teams.c.user_id == user.id).all()
-        
-        # Verificar se o gerente é gerente de algum dos times
-        for team in teams:
-            if team.manager_id == manager_id:
-                return True
-        
-        return False
-    else:
-        # Se o registro não for anônimo, o gerente precisa ser gerente do time do colaborador
-        user_id = emotion_record.user_id
-        
-        # Buscar os times do usuário
-        from app.schemas.user_schema import User
-        from app.schemas.team_schema import Team, user_teams
-        
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return False
-        
-        # Buscar os times do usuário
-        teams = db.query(Team).join(user_teams).filter(user_teams.c.user_id == user.id).all()
-        
-        # Verificar se o gerente é gerente de algum dos times
-        for team in teams:
-            if team.manager_id == manager_id:
-                return True
-        
-        return False 
\ No newline at end of file
+    feedbacks = feedbacks[:limit]
+    last = feedbacks[-1]
+    return feedbacks, encode_cursor(last["created_at"], last["id"])
+
+
+def _manages_record_owner(manager_id: int):
+    # O gerente precisa gerenciar algum time do dono do registro, seja ele anônimo ou não
+    return exists().where(
+        user_teams.c.user_id == EmotionRecord.user_id,
+        user_teams.c.team_id == Team.id,
+        Team.manager_id == manager_id,
+    )
@@ -1,25 +1,43 @@
+import math
+from datetime import date, datetime, timedelta
+
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, and_, case
+from sqlalchemy import Date, cast, literal_column, select, func, and_
 
-from app.schemas.emotion_record_schema import EmotionRecord, Emotion
+from app.schemas.emotion_record_schema import EmotionRecord, Emotion, TeamEmotionDaily
 from app.schemas.team_schema import user_teams
 from app.schemas.user_schema import User
 
-from app.models.reports_model import EmojiDistributionReport, EmojiDistribution
+from app.core.report_cache import cached_report
+from app.utils.constants import Analytics
+from app.utils.logger import logger
+from app.models.reports_model import (
+    AnomalyPoint,
+    AnomalyReport,
+    DashboardEmotion,
+    DashboardReport,
+    EmojiDistributionReport,
+    EmojiDistribution,
+    TrendBucket,
+    TrendReport,
+)
 
 
+@cached_report("emoji-distribution")
 def get_emoji_distribution_report(db: Session, team_id: int, start_date: str | None, end_date: str | None):
-    filters = build_emotion_filter(team_id, start_date, end_date)
+    # Lê o rollup diário: o custo depende de dias x emoções, não do número de registros
+    filters = build_rollup_filter(team_id, start_date, end_date)
+    frequency = func.sum(TeamEmotionDaily.count)
     query = (
         select(
             Emotion.name,
-            func.count(EmotionRecord.id).label('frequency'),
-            func.sum(case((Emotion.is_negative, 1), else_=0)).label('negative_count')
+            frequency.label('frequency'),
+            func.sum(TeamEmotionDaily.negative_count).label('negative_count')
         )
-        .join(EmotionRecord, EmotionRecord.emotion_id.is_(Emotion.id))
-        .where(and_(filters))
+        .join(TeamEmotionDaily, TeamEmotionDaily.emotion_id == Emotion.id)
+        .where(and_(*filters))
         .group_by(Emotion.emoji, Emotion.name)
-        .order_by(func.count(EmotionRecord.id).desc())
+        .order_by(frequency.desc())
     )
 
     result = db.execute(query).mappings().all()
@@ -37,20 +55,22 @@ def get_emoji_distribution_report(db: Session, team_id: int, start_date: str | N
     )
 
 
+@cached_report("average-intensity")
 def get_average_intensity_report(db: Session, team_id: int, start_date: str | None, end_date: str | None):
-    filters = build_emotion_filter(team_id, start_date, end_date)
+    filters = build_rollup_filter(team_id, start_date, end_date)
+    avg_intensity = func.sum(TeamEmotionDaily.intensity_sum) * 1.0 / func.sum(TeamEmotionDaily.count)
     query = (
         select(
             Emotion.emoji, 
             Emotion.name, 
-            func.avg(EmotionRecord.intensity).label('avg_intensity'),
-            func.sum(case((Emotion.is_negative, 1), else_=0)).label('negative_count'),
-            func.count(EmotionRecord.id).label('total_count')
+            avg_intensity.label('avg_intensity'),
+            func.sum(TeamEmotionDaily.negative_count).label('negative_count'),
+            func.sum(TeamEmotionDaily.count).label('total_count')
         )
-        .join(EmotionRecord, EmotionRecord.emotion_id.is_(Emotion.id))
-        .where(and_(filters))
+        .join(TeamEmotionDaily, TeamEmotionDaily.emotion_id == Emotion.id)
+        .where(and_(*filters))
         .group_by(Emotion.emoji, Emotion.name)
-        .order_by(func.avg(EmotionRecord.intensity).desc())
+        .order_by(avg_intensity.desc())
     )
 
     result = db.execute(query).mappings().all()
@@ -71,6 +91,201 @@ def get_average_intensity_report(db: Session, team_id: int, start_date: str | No
     }
 
 
+@cached_report("dashboard")
+def get_dashboard_report(db: Session, team_id: int, start_date: str | None, end_date: str | None):
+    """
+    Builds the manager dashboard (frequency, average intensity, negative ratio and alert of
+    every emotion of the team) from a single aggregate query over the daily rollup.
+    """
+    filters = build_rollup_filter(team_id, start_date, end_date)
+    frequency = func.sum(TeamEmotionDaily.count)
+    query = (
+        select(
+            Emotion.emoji,
+            Emotion.name,
+            frequency.label('frequency'),
+            (func.sum(TeamEmotionDaily.intensity_sum) * 1.0 / frequency).label('avg_intensity'),
+            func.sum(TeamEmotionDaily.negative_count).label('negative_count')
+        )
+        .join(TeamEmotionDaily, TeamEmotionDaily.emotion_id == Emotion.id)
+        .where(and_(*filters))
+        .group_by(Emotion.emoji, Emotion.name)
+        .order_by(frequency.desc(), Emotion.name)
+    )
+
+    result = db.execute(query).mappings().all()
+
+    total_records = sum(row["frequency"] for row in result)
+    total_negatives = sum(row["negative_count"] for row in result)
+    negative_emotion_ratio = (total_negatives / total_records) * 100 if total_records > 0 else 0
+
+    return DashboardReport(
+        emotions=[
+            DashboardEmotion(
+                emotion_name=row["name"],
+                emoji=row["emoji"],
+                frequency=row["frequency"],
+                avg_intensity=round(float(row["avg_intensity"]), 2),
+                negative_count=row["negative_count"],
+            )
+            for row in result
+        ],
+        total_records=total_records,
+        negative_emotion_ratio=negative_emotion_ratio,
+        alert=get_alert_message(negative_emotion_ratio),
+    )
+
+
+@cached_report("trend")
+def get_trend_report(
+    db: Session, team_id: int, start_date: str | None, end_date: str | None, granularity: str = "day"
+):
+    """
+    Groups the team's records in day, week or month buckets (computed by the database) with
+    the count, average intensity and negative ratio of each bucket.
+    """
+    filters = build_rollup_filter(team_id, start_date, end_date)
+    bucket = trend_bucket(db, granularity)
+    count = func.sum(TeamEmotionDaily.count)
+    query = (
+        select(
+            bucket.label('bucket_start'),
+            count.label('count'),
+            func.sum(TeamEmotionDaily.intensity_sum).label('intensity_sum'),
+            func.sum(TeamEmotionDaily.negative_count).label('negative_count')
+        )
+        .where(and_(*filters))
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+
+    result = db.execute(query).mappings().all()
+
+    return TrendReport(
+        granularity=granularity,
+        buckets=[
+            TrendBucket(
+                bucket_start=_as_date(row["bucket_start"]),
+                count=row["count"],
+                avg_intensity=round(row["intensity_sum"] / row["count"], 2),
+                negative_ratio=(row["negative_count"] / row["count"]) * 100,
+            )
+            for row in result
+        ],
+    )
+
+
+def trend_bucket(db: Session, granularity: str):
+    """
+    Returns the SQL expression of the first day of the bucket that contains `TeamEmotionDaily.day`.
+    Weeks start on Monday, as `date_trunc('week', ...)` does.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Literal no SQL (e não parâmetro): o PostgreSQL só aceita o GROUP BY se a expressão for idêntica
+        # à do SELECT.
+        unit = granularity if granularity in ("day", "week", "month") else "day"
+        return cast(func.date_trunc(literal_column(f"'{unit}'"), TeamEmotionDaily.day), Date)
+
+    if granularity == "week":
+        return func.strftime('%Y-%m-%d', TeamEmotionDaily.day, 'weekday 0', '-6 days')
+    if granularity == "month":
+        return func.strftime('%Y-%m-01', TeamEmotionDaily.day)
+    return func.strftime('%Y-%m-%d', TeamEmotionDaily.day)
+
+
+def _as_date(value) -> date:
+    # O SQLite devolve o texto 'YYYY-MM-DD'
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+@cached_report("anomalies")
+def get_anomaly_report(db: Session, team_id: int, start_date: date | None, end_date: date | None):
+    """
+    Daily series of the team (from the rollup) analyzed with NumPy: rolling averages, z-scores
+    against the previous weeks, anomaly flags and change points of the mean intensity.
+    Only days with records are listed; the statistics still account for the empty ones.
+    Returns None if the period is inverted (start after end).
+    """
+    # Importado aqui para não pesar na inicialização da API
+    import numpy as np
+    from app.core import analytics
+
+    end_date = end_date or date.today()
+    start_date = max(
+        start_date or end_date - timedelta(days=Analytics.MAX_DAYS - 1),
+        end_date - timedelta(days=Analytics.MAX_DAYS - 1),
+    )
+    if start_date > end_date:
+        logger.error("Invalid anomaly report period: %s to %s", start_date, end_date)
+        return None
+
+    query = (
+        select(
+            TeamEmotionDaily.day,
+            func.sum(TeamEmotionDaily.count).label('count'),
+            func.sum(TeamEmotionDaily.intensity_sum).label('intensity_sum'),
+            func.sum(TeamEmotionDaily.negative_count).label('negative_count')
+        )
+        .where(and_(*build_rollup_filter(team_id, start_date, end_date)))
+        .group_by(TeamEmotionDaily.day)
+    )
+    rows = db.execute(query).all()
+
+    # Série densa: uma posição por dia do período, zerada nos dias sem registros
+    days = (end_date - start_date).days + 1
+    series = np.zeros((3, days))
+    if rows:
+        offsets = np.array([(_as_date(row.day) - start_date).days for row in rows])
+        series[:, offsets] = np.array([(row.count, row.intensity_sum, row.negative_count) for row in rows]).T
+
+    counts, intensity_sums, negative_counts = series
+    result = analytics.analyze_mood_series(
+        counts,
+        intensity_sums,
+        negative_counts,
+        rolling_window=Analytics.ROLLING_WINDOW,
+        baseline_window=Analytics.BASELINE_WINDOW,
+        zscore_threshold=Analytics.ZSCORE_THRESHOLD,
+        change_point_window=Analytics.CHANGE_POINT_WINDOW,
+        change_point_threshold=Analytics.CHANGE_POINT_THRESHOLD,
+    )
+
+    points = [
+        AnomalyPoint(
+            day=start_date + timedelta(days=int(offset)),
+            count=int(counts[offset]),
+            avg_intensity=_finite(result["avg_intensity"][offset]),
+            negative_ratio=_finite(result["negative_ratio"][offset]),
+            rolling_intensity=_finite(result["rolling_intensity"][offset]),
+            rolling_negative_ratio=_finite(result["rolling_negative_ratio"][offset]),
+            intensity_zscore=_finite(result["intensity_zscore"][offset]),
+            negative_ratio_zscore=_finite(result["negative_ratio_zscore"][offset]),
+            is_anomaly=bool(result["is_anomaly"][offset]),
+            is_change_point=bool(result["change_point"][offset]),
+        )
+        for offset in np.flatnonzero(counts)
+    ]
+
+    return AnomalyReport(
+        start_date=start_date,
+        end_date=end_date,
+        rolling_window=Analytics.ROLLING_WINDOW,
+        baseline_window=Analytics.BASELINE_WINDOW,
+        zscore_threshold=Analytics.ZSCORE_THRESHOLD,
+        points=points,
+        anomalies=[point.day for point in points if point.is_anomaly],
+        change_points=[point.day for point in points if point.is_change_point],
+    )
+
+
+def _finite(value) -> float | None:
+    return None if math.isnan(value) else round(float(value), 3)
+
+
 def get_emotion_analysis_by_user(
     db: Session, 
     team_id: int, 
@@ -102,16 +317,16 @@ def get_emotion_analysis_by_user(
             func.count(EmotionRecord.id).label("frequency"),  # Frequency of the emotion
             func.avg(EmotionRecord.intensity).label("average_intensity")  # Average intensity
         )
-        .join(EmotionRecord, EmotionRecord.user_id.is_(User.id))  # Join with EmotionRecord
-        .join(Emotion, EmotionRecord.emotion_id.is_(Emotion.id))  # Join with Emotion
-        .join(user_teams, User.id.is_(user_teams.c.user_id))      # Join with user_teams table
+        .join(EmotionRecord, EmotionRecord.user_id == User.id)  # Join with EmotionRecord
+        .join(Emotion, EmotionRecord.emotion_id == Emotion.id)  # Join with Emotion
+        .join(user_teams, User.id == user_teams.c.user_id)      # Join with user_teams table
         .where(
             and_(
                 user_teams.c.team_id == team_id,            # Filter by team
                 User.id == user_id,                         # Filter by user
-                EmotionRecord.is_anonymous is False,        # Exclude anonymous records
-                EmotionRecord.timestamp >= start_date if start_date else True,  # Filter by start date
-                EmotionRecord.timestamp <= end_date if end_date else True       # Filter by end date
+                EmotionRecord.is_anonymous.is_(False),      # Exclude anonymous records
+                EmotionRecord.created_at >= start_date if start_date else True,  # Filter by start date
+                EmotionRecord.created_at <= end_date if end_date else True       # Filter by end date
             )
         )
         .group_by(User.name, Emotion.name, Emotion.emoji)  # Group by user and emotion
@@ -160,13 +375,13 @@ def get_anonymous_emotion_analysis(
             func.avg(EmotionRecord.intensity).label("average_intensity")  # Average intensity
         )
         .select_from(EmotionRecord)
-        .join(Emotion, EmotionRecord.emotion_id.is_(Emotion.id))  # Join with Emotion
+        .join(Emotion, EmotionRecord.emotion_id == Emotion.id)  # Join with Emotion
         .where(
             and_(
-                EmotionRecord.is_anonymous is True,  # Filter for anonymous records
+                EmotionRecord.is_anonymous.is_(True),  # Filter for anonymous records
                 Emotion.team_id == team_id,          # Filter by team
-                EmotionRecord.timestamp >= start_date if start_date else True,  # Filter by start date
-                EmotionRecord.timestamp <= end_date if end_date else True       # Filter by end date
+                EmotionRecord.created_at >= start_date if start_date else True,  # Filter by start date
+                EmotionRecord.created_at <= end_date if end_date else True       # Filter by end date
             )
         )
         .group_by(Emotion.name, Emotion.emoji)  # Group by emotion
@@ -186,15 +401,15 @@ def get_anonymous_emotion_analysis(
     return result
 
 
-def build_emotion_filter(team_id: int, start_date: str | None, end_date: str | None):
-    filters = [Emotion.team_id == team_id]
+def build_rollup_filter(team_id: int, start_date: str | None, end_date: str | None):
+    filters = [TeamEmotionDaily.team_id == team_id]
 
     if start_date and end_date:
-        filters.append(EmotionRecord.timestamp.between(start_date, end_date))
+        filters.append(TeamEmotionDaily.day.between(start_date, end_date))
     elif start_date:
-        filters.append(EmotionRecord.timestamp >= start_date)
+        filters.append(TeamEmotionDaily.day >= start_date)
     elif end_date:
-        filters.append(EmotionRecord.timestamp <= end_date)
+        filters.append(TeamEmotionDaily.day <= end_date)
 
     return filters
 
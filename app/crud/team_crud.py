@@ -1,14 +1,19 @@
-from sqlalchemy import delete, insert
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import and_, delete, exists, insert, select
 from sqlalchemy.orm import Session
 
+from app.schemas.emotion_record_schema import Emotion, EmotionRecord
 from app.schemas.team_schema import Team, user_teams
 from app.schemas.user_schema import User
 
 from app.crud.user_crud import get_user_by_id
 from app.crud.emotion_record_crud import get_emotion_records_by_user_id
+from app.crud.team_version_crud import bump_catalog_version, bump_team_versions
+from app.core.report_cache import invalidate_team_reports
 
-from app.models.team_model import Team as TeamModel
-from app.models.emotion_record_model import EmotionRecordInTeam
+from app.models.team_model import Team as TeamModel, TeamRole
 
 from app.utils.logger import logger
 
@@ -27,9 +32,14 @@ def create_team(db: Session, name: str, manager_id: int):
     return db_team
 
 
-def get_team_by_id(db: Session, team_id: int):
+def get_team_by_id(
+    db: Session,
+    team_id: int,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+):
     """
-    Returns a team by ID
+    Returns a team by ID, with a page of its emotion records when `limit` is given
     """
     team = db.query(Team).filter(Team.id == team_id).first()
 
@@ -38,8 +48,9 @@ def get_team_by_id(db: Session, team_id: int):
 
     # Obtém os registros de emoção dos membros do time
     member_ids = [user.id for user in team.members]
-    emotions_records: list[EmotionRecordInTeam] = get_emotion_records_by_user_id(
-        db, member_ids, for_team=True, team_id=team_id
+    emotions_records: list[dict]
+    emotions_records, next_cursor = get_emotion_records_by_user_id(
+        db, member_ids, for_team=True, team_id=team_id, limit=limit, after=after
     )
 
     # Cria um dicionário para mapear user_id -> user_name
@@ -47,24 +58,69 @@ def get_team_by_id(db: Session, team_id: int):
     
     # Atribui o user_name correto baseado no user_id, respeitando o anonimato
     for record in emotions_records:
-        if record.is_anonymous:
-            record.user_name = None  # Registros anônimos não devem mostrar o nome
-        elif record.user_id and record.user_id in user_name_map:
-            record.user_name = user_name_map[record.user_id]
+        if record["is_anonymous"]:
+            record["user_name"] = None  # Registros anônimos não devem mostrar o nome
+        elif record["user_id"] and record["user_id"] in user_name_map:
+            record["user_name"] = user_name_map[record["user_id"]]
         else:
-            record.user_name = None  # Fallback para casos onde o user_id não é encontrado
+            record["user_name"] = None  # Fallback para casos onde o user_id não é encontrado
 
     # Retorna os dados do time corretamente
     team_data = {
         "team_data": team,
         "members": team.members,
         "emotions_reports": emotions_records,
-        "manager": team.manager  # Adiciona o manager real do time
+        "manager": team.manager,  # Adiciona o manager real do time
+        "next_cursor": next_cursor,
     }
 
     return team_data
 
 
+# Colunas da exportação dos registros de emoção de um time (GET /teams/{team_id}/export)
+TEAM_EXPORT_COLUMNS = [
+    "id", "created_at", "emotion_id", "emotion_name", "intensity", "notes", "is_anonymous", "user_id", "user_name",
+]
+
+
+def iter_team_emotion_records(db: Session, team_id: int, batch_size: int = 1000) -> Iterator[dict]:
+    """
+    Streams the emotion records of a team's members, newest first, as plain rows.
+
+    Rows are fetched `batch_size` at a time from a server-side cursor, so memory use does not grow
+    with the team history. Anonymous records are masked as in `get_team_by_id`.
+    """
+    query = (
+        select(
+            EmotionRecord.id,
+            EmotionRecord.created_at,
+            EmotionRecord.emotion_id,
+            Emotion.name.label("emotion_name"),
+            EmotionRecord.intensity,
+            EmotionRecord.notes,
+            EmotionRecord.is_anonymous,
+            EmotionRecord.user_id,
+            User.name.label("user_name"),
+        )
+        .join(Emotion, EmotionRecord.emotion_id == Emotion.id)
+        .join(
+            user_teams,
+            and_(user_teams.c.user_id == EmotionRecord.user_id, user_teams.c.team_id == team_id),
+        )
+        .join(User, User.id == EmotionRecord.user_id)
+        .where(Emotion.team_id == team_id)
+        .order_by(EmotionRecord.created_at.desc(), EmotionRecord.id.desc())
+        .execution_options(yield_per=batch_size)
+    )
+
+    for row in db.execute(query).mappings():
+        record = dict(row)
+        if record["is_anonymous"]:
+            record["user_id"] = None
+            record["user_name"] = None
+        yield record
+
+
 def get_teams_by_manager(db: Session, manager_id: int):
     """
     Return all created teams in the database
@@ -84,24 +140,20 @@ def update_team(db: Session, team_id: int, team_update: TeamModel):
     Updates an existing team by ID
     """
     db_team = db.query(Team).filter(Team.id == team_id).first()
-    team_data = {
-        "team_data": db_team,
-        "members": db.query(User).join(user_teams).filter(user_teams.c.team_id == team_id).all(),
-    }
-    
     if db_team is None:
-        logger.error(f"Team with ID {team_id} not found.")
+        logger.error("Team with ID %s not found.", team_id)
         return None
 
     for key, value in team_update.dict().items():
         if hasattr(db_team, key):
             setattr(db_team, key, value)
 
+    bump_team_versions(db, team_id)
     db.commit()
     db.refresh(db_team)
-    logger.debug(f"Team with ID {team_id} was updated successfully.")
+    logger.debug("Team with ID %s was updated successfully.", team_id)
     
-    return team_data
+    return db_team
 
 
 def delete_team(db: Session, team_id: int):
@@ -110,12 +162,15 @@ def delete_team(db: Session, team_id: int):
     """
     db_team = db.query(Team).filter(Team.id == team_id).first()
     if db_team is None:
-        logger.error(f"Team with ID {team_id} not found.")
+        logger.error("Team with ID %s not found.", team_id)
         return False
 
     db.delete(db_team)
+    # As emoções do time são apagadas junto com ele
+    bump_catalog_version(db)
     db.commit()
-    logger.debug(f"Team with ID {team_id} was deleted successfully.")
+    invalidate_team_reports(team_id)
+    logger.debug("Team with ID %s was deleted successfully.", team_id)
     return True
 
 
@@ -125,31 +180,33 @@ def add_team_member(db: Session, team_id: int, user_id: int):
 
     existing_user_team = db.query(user_teams).filter_by(user_id=user_id, team_id=team_id).first()
     if existing_user_team:
-        logger.error(f"User with ID {user_id} is already a member of the team that has ID {team_id}")
+        logger.error("User with ID %s is already a member of the team that has ID %s", user_id, team_id)
         return None
 
     db.execute(insert(user_teams).values(user_id=user_id, team_id=team_id))
+    bump_team_versions(db, team_id)
     db.commit()
-    
-    return get_team_by_id(db, team_id)
+
+    return True
 
 
 def remove_team_member(db: Session, team_id: int, user_id: int):
     if not _validate_team_and_user_existence(db, team_id, user_id):
-        logger.error(f"Team with ID:= {team_id} doesn't exist")
+        logger.error("Team with ID:= %s doesn't exist", team_id)
         return None
 
     existing_user_team = db.query(user_teams).filter_by(user_id=user_id, team_id=team_id).first()
     if not existing_user_team:
-        logger.error(f"User with ID:= {user_id} doesn't belong to the team that has ID {team_id}")
+        logger.error("User with ID:= %s doesn't belong to the team that has ID %s", user_id, team_id)
         return None
 
     db.execute(
         delete(user_teams).where(user_teams.c.user_id == user_id, user_teams.c.team_id == team_id)
     )
+    bump_team_versions(db, team_id)
     db.commit()
-    
-    return get_team_by_id(db, team_id)
+
+    return True
 
 
 def is_manager_of_team(db: Session, user_id: int, team_id: int) -> bool:
@@ -160,15 +217,32 @@ def is_manager_of_team(db: Session, user_id: int, team_id: int) -> bool:
     return team is not None and team.manager_id == user_id
 
 
+def get_team_role(db: Session, team_id: int, user_id: int) -> TeamRole | None:
+    """
+    Returns the user's role in the team with a single query, or None if the team doesn't exist
+    """
+    is_member = exists().where(user_teams.c.team_id == Team.id, user_teams.c.user_id == user_id)
+    row = db.execute(select(Team.manager_id, is_member).where(Team.id == team_id)).first()
+    if row is None:
+        return None
+
+    manager_id, member = row
+    if manager_id == user_id:
+        return TeamRole.MANAGER
+    if member:
+        return TeamRole.MEMBER
+    return TeamRole.NONE
+
+
 def _validate_team_and_user_existence(db: Session, team_id: int, user_id: int) -> bool:
     db_team = db.query(Team).filter(Team.id == team_id).first()
     if db_team is None:
-        logger.error(f"Team with ID {team_id} not found.")
+        logger.error("Team with ID %s not found.", team_id)
         return False
 
     db_user = get_user_by_id(db, user_id)
     if db_user is None:
-        logger.error(f"User with ID {user_id} not found.")
+        logger.error("User with ID %s not found.", user_id)
         return False
 
     return True
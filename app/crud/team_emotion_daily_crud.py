@@ -0,0 +1,144 @@
+from datetime import date
+
+from sqlalchemy import case, delete, func, insert, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.report_cache import invalidate_team_reports, report_cache
+from app.crud.team_version_crud import bump_all_team_versions, bump_team_versions
+from app.schemas.emotion_record_schema import Emotion, EmotionRecord, TeamEmotionDaily
+from app.utils.logger import logger
+
+
+def increment_daily_rollup(db: Session, emotion_record: EmotionRecord) -> int | None:
+    """
+    Adds an emotion record to the daily rollup of its team, in the caller's transaction.
+    Returns the ID of the team, or None if the emotion does not exist.
+
+    The team and the negativity come from the emotion inside the same statement
+    (INSERT ... SELECT ... ON CONFLICT DO UPDATE), so no extra round trip is needed.
+    """
+    values = select(
+        Emotion.team_id,
+        Emotion.id,
+        literal(emotion_record.created_at.date(), TeamEmotionDaily.day.type),
+        literal(1),
+        literal(emotion_record.intensity),
+        case((Emotion.is_negative, 1), else_=0),
+    ).where(Emotion.id == emotion_record.emotion_id)
+
+    statement = _insert(db).from_select(
+        ["team_id", "emotion_id", "day", "count", "intensity_sum", "negative_count"], values
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[TeamEmotionDaily.team_id, TeamEmotionDaily.emotion_id, TeamEmotionDaily.day],
+        set_={
+            "count": TeamEmotionDaily.count + statement.excluded.count,
+            "intensity_sum": TeamEmotionDaily.intensity_sum + statement.excluded.intensity_sum,
+            "negative_count": TeamEmotionDaily.negative_count + statement.excluded.negative_count,
+        },
+    )
+    return db.execute(statement.returning(TeamEmotionDaily.team_id)).scalar()
+
+
+def add_to_daily_rollup(db: Session, totals: dict[tuple[int, int, date], tuple[int, int, int]]):
+    """
+    Adds pre-aggregated totals to the daily rollup, in the caller's transaction.
+    `totals` maps (team_id, emotion_id, day) to (count, intensity_sum, negative_count).
+    """
+    if not totals:
+        return
+
+    statement = _insert(db)
+    statement = statement.on_conflict_do_update(
+        index_elements=[TeamEmotionDaily.team_id, TeamEmotionDaily.emotion_id, TeamEmotionDaily.day],
+        set_={
+            "count": TeamEmotionDaily.count + statement.excluded.count,
+            "intensity_sum": TeamEmotionDaily.intensity_sum + statement.excluded.intensity_sum,
+            "negative_count": TeamEmotionDaily.negative_count + statement.excluded.negative_count,
+        },
+    )
+    db.execute(
+        statement,
+        [
+            {
+                "team_id": team_id,
+                "emotion_id": emotion_id,
+                "day": day,
+                "count": count,
+                "intensity_sum": intensity_sum,
+                "negative_count": negative_count,
+            }
+            for (team_id, emotion_id, day), (count, intensity_sum, negative_count) in totals.items()
+        ],
+    )
+
+
+def sync_emotion_rollup(db: Session, emotion: Emotion):
+    """
+    Propagates a change of team or negativity of an emotion to its rollup rows.
+    """
+    db.execute(
+        update(TeamEmotionDaily)
+        .where(TeamEmotionDaily.emotion_id == emotion.id)
+        .values(
+            team_id=emotion.team_id,
+            negative_count=TeamEmotionDaily.count if emotion.is_negative else 0,
+        )
+    )
+
+
+def delete_emotion_rollup(db: Session, emotion_id: int):
+    db.execute(delete(TeamEmotionDaily).where(TeamEmotionDaily.emotion_id == emotion_id))
+
+
+def rebuild_daily_rollup(db: Session, team_id: int | None = None) -> int:
+    """
+    Rebuilds the daily rollup from the raw emotion records, for one team or for all of them.
+    Returns the number of rollup rows written.
+    """
+    day = func.date(EmotionRecord.created_at)
+    values = (
+        select(
+            Emotion.team_id,
+            Emotion.id,
+            day,
+            func.count(EmotionRecord.id),
+            func.sum(EmotionRecord.intensity),
+            func.sum(case((Emotion.is_negative, 1), else_=0)),
+        )
+        .join(EmotionRecord, EmotionRecord.emotion_id == Emotion.id)
+        .where(EmotionRecord.created_at.is_not(None))
+        .group_by(Emotion.team_id, Emotion.id, day)
+    )
+
+    clear = delete(TeamEmotionDaily)
+    if team_id is not None:
+        values = values.where(Emotion.team_id == team_id)
+        clear = clear.where(TeamEmotionDaily.team_id == team_id)
+
+    db.execute(clear)
+    result = db.execute(
+        insert(TeamEmotionDaily).from_select(
+            ["team_id", "emotion_id", "day", "count", "intensity_sum", "negative_count"], values
+        )
+    )
+    if team_id is None:
+        bump_all_team_versions(db)
+    else:
+        bump_team_versions(db, team_id)
+    db.commit()
+    if team_id is None:
+        report_cache.clear()
+    else:
+        invalidate_team_reports(team_id)
+
+    logger.debug("Daily rollup rebuilt with %s rows.", result.rowcount)
+    return result.rowcount
+
+
+def _insert(db: Session):
+    # ON CONFLICT é específico de cada dialeto (PostgreSQL em produção, SQLite em desenvolvimento)
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(TeamEmotionDaily)
+    return sqlite.insert(TeamEmotionDaily)
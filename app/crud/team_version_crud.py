@@ -0,0 +1,64 @@
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.schemas.emotion_record_schema import EmotionCatalogVersion
+from app.schemas.team_schema import Team, user_teams
+
+# Cada time tem um contador de versão, incrementado na mesma transação de toda escrita que muda o
+# que as rotas do time devolvem (registros, emoções, membros, dados do time). As rotas de leitura
+# derivam o ETag dele e respondem 304 sem montar a resposta. As listas de emoções usam um contador
+# próprio, o do catálogo, que só as escritas de emoções incrementam: check-ins não o alteram.
+
+
+def bump_team_versions(db: Session, *team_ids: int | None) -> None:
+    """
+    Increments the version of the given teams, in the caller's transaction.
+    """
+    teams = {team_id for team_id in team_ids if team_id is not None}
+    if teams:
+        db.execute(
+            update(Team)
+            .where(Team.id.in_(teams))
+            .values(version=Team.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def bump_user_team_versions(db: Session, user_id: int) -> None:
+    """
+    Increments the version of every team the user manages or belongs to (their name is shown there).
+    """
+    member_of = select(user_teams.c.team_id).where(user_teams.c.user_id == user_id)
+    db.execute(
+        update(Team)
+        .where(or_(Team.manager_id == user_id, Team.id.in_(member_of)))
+        .values(version=Team.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_all_team_versions(db: Session) -> None:
+    db.execute(update(Team).values(version=Team.version + 1).execution_options(synchronize_session=False))
+
+
+def get_team_version(db: Session, team_id: int) -> int | None:
+    return db.execute(select(Team.version).where(Team.id == team_id)).scalar()
+
+
+def bump_catalog_version(db: Session) -> None:
+    """
+    Increments the version of the emotion catalog, in the caller's transaction. Called by every
+    write that creates, changes or removes emotions.
+    """
+    db.execute(
+        update(EmotionCatalogVersion)
+        .values(version=EmotionCatalogVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_catalog_version(db: Session) -> int:
+    """
+    Version of the emotion catalog: one primary-key lookup, whatever the number of teams.
+    """
+    return db.execute(select(EmotionCatalogVersion.version).where(EmotionCatalogVersion.id == 1)).scalar() or 0
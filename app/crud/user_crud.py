@@ -5,6 +5,8 @@ from sqlalchemy import select
 from app.schemas.user_schema import User as UserModel
 from app.models.user_model import UserCreate, UserInDB
 from app.schemas.team_schema import user_teams
+from app.core.principal_cache import principal_cache
+from app.crud.team_version_crud import bump_user_team_versions
 
 from app.utils.logger import logger
 
@@ -44,25 +46,31 @@ def update_user(db: Session, user_id: int, user_update: dict):
     user = db.query(UserModel).filter(UserModel.id == user_id).first()
 
     if user is None:
-        logger.error(f"User with ID {user_id} not found.")
+        logger.error("User with ID %s not found.", user_id)
         return None
 
+    previous_email = user.email
     for key, value in user_update.items():
         if hasattr(user, key):
             logger.debug("Updating user field %s to: %s", key, value)
             setattr(user, key, value)
 
+    bump_user_team_versions(db, user_id)
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(previous_email)
+    principal_cache.invalidate(user.email)
 
-    logger.debug(f"User with ID {user_id} updated successfully.")
+    logger.debug("User with ID %s updated successfully.", user_id)
     return user
 
 
 def delete_user(db: Session, user_id: int):
     user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    bump_user_team_versions(db, user_id)
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(user.email)
 
 
 def get_password_hash(password: str) -> str:
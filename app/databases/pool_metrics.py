@@ -0,0 +1,139 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Limites (em segundos) do histograma de tempo de checkout de conexões
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """
+    Telemetry of a connection pool: checkout latency, connections in use and checkout timeouts.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.pool = None
+        self.checkouts = 0
+        self.checkins = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.checkout_buckets = [0] * (len(CHECKOUT_BUCKETS) + 1)
+
+    def record_checkout_latency(self, seconds: float) -> None:
+        with self._lock:
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+            for index, bound in enumerate(CHECKOUT_BUCKETS):
+                if seconds <= bound:
+                    self.checkout_buckets[index] += 1
+                    break
+            else:
+                self.checkout_buckets[-1] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def on_checkout(self, *args) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def on_checkin(self, *args) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+    def on_connect(self, *args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def on_invalidate(self, *args) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            snapshot = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "checkout_seconds_avg": self.checkout_seconds_total / self.checkouts if self.checkouts else 0.0,
+                "checkout_seconds_max": self.checkout_seconds_max,
+                "checkout_seconds_buckets": {
+                    **{str(bound): count for bound, count in zip(CHECKOUT_BUCKETS, self.checkout_buckets)},
+                    "+Inf": self.checkout_buckets[-1],
+                },
+            }
+
+        if isinstance(self.pool, QueuePool):
+            snapshot.update(
+                pool_size=self.pool.size(),
+                checked_out=self.pool.checkedout(),
+                overflow=self.pool.overflow(),
+            )
+        return snapshot
+
+
+class _TimedCheckoutPool:
+    """Mixin that measures how long `connect()` waits for a connection, including pool timeouts."""
+
+    metrics: PoolMetrics | None = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_checkout_latency(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() recria o pool; as métricas continuam as mesmas
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = new_pool
+        return new_pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(pool, name: str) -> PoolMetrics:
+    """
+    Attaches the pool event listeners and returns the metrics they fill.
+    """
+    metrics = PoolMetrics(name)
+    metrics.pool = pool
+    if isinstance(pool, _TimedCheckoutPool):
+        pool.metrics = metrics
+
+    event.listen(pool, "checkout", metrics.on_checkout)
+    event.listen(pool, "checkin", metrics.on_checkin)
+    event.listen(pool, "connect", metrics.on_connect)
+    event.listen(pool, "invalidate", metrics.on_invalidate)
+    return metrics
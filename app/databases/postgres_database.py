@@ -1,7 +1,14 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import configure_mappers, sessionmaker
+import asyncio
 import os
+import threading
+
+from app.core.request_metrics import instrument_engine
+from app.databases.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
 
 # Obter URL do banco de dados da variável de ambiente ou usar SQLite como fallback
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ma.db")
@@ -13,13 +20,139 @@ if DATABASE_URL.startswith("postgres://"):
 # Para SQLite, adicionar check_same_thread=False
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Configuração do pool de conexões (SQLite em memória usa um pool próprio, de conexão única)
+IN_MEMORY_DATABASE = DATABASE_URL in ("sqlite://", "sqlite:///:memory:")
+pool_options = {} if IN_MEMORY_DATABASE else {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+}
+
+# Inicialização da API: cria as tabelas que faltarem (desligue quando o schema vem só das migrações)
+# e abre algumas conexões de cada pool antes da primeira requisição
+CREATE_SCHEMA_ON_STARTUP = os.getenv("DB_CREATE_SCHEMA", "true").lower() in ("1", "true", "yes")
+POOL_WARMUP_CONNECTIONS = 0 if IN_MEMORY_DATABASE else min(
+    int(os.getenv("DB_POOL_WARMUP", "2")), pool_options.get("pool_size", 0)
+)
+
+# Engine assíncrono para as rotas async: asyncpg no PostgreSQL e aiosqlite no SQLite
+ASYNC_DATABASE_URL = (
+    DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+    .replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    .replace("sqlite://", "sqlite+aiosqlite://", 1)
+)
+
+# Os engines só são criados no primeiro uso: importar o app (workers, testes, scripts, Alembic)
+# não carrega o driver do banco nem abre conexões
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
+# Telemetria dos pools, exposta em /admin/metrics (preenchida quando cada engine é criado)
+POOL_NAMES = ("sync", "async")
+pool_metrics = {}
+
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """Returns the sync engine, creating it (and its instrumentation) on the first call."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    DATABASE_URL,
+                    connect_args=connect_args,
+                    **({"poolclass": InstrumentedQueuePool, **pool_options} if pool_options else {}),
+                )
+                # Tempo gasto no banco por requisição, usado no cabeçalho Server-Timing
+                instrument_engine(engine)
+                pool_metrics["sync"] = instrument_pool(engine.pool, "sync")
+                _engine = engine
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Returns the async engine, creating it (and its instrumentation) on the first call."""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                engine = create_async_engine(
+                    ASYNC_DATABASE_URL,
+                    **({"poolclass": InstrumentedAsyncQueuePool, **pool_options} if pool_options else {}),
+                )
+                instrument_engine(engine.sync_engine)
+                pool_metrics["async"] = instrument_pool(engine.sync_engine.pool, "async")
+                _async_engine = engine
+    return _async_engine
+
+
+def prepare_database(create_schema: bool = True, warmup_connections: int = 0) -> None:
+    """
+    Startup work of the sync side: creates the missing tables, configures the ORM mappers (otherwise
+    done by the first query) and opens `warmup_connections` connections of the pool.
+    """
+    engine = get_engine()
+    if create_schema:
+        Base.metadata.create_all(bind=engine)
+    configure_mappers()
+
+    connections = []
+    try:
+        for _ in range(warmup_connections):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        # Devolvidas ao pool, continuam abertas para as próximas requisições
+        for connection in connections:
+            connection.close()
+
+
+async def warm_async_pool(connections: int) -> None:
+    """Opens `connections` connections of the async pool at the same time, so they stay in the pool."""
+    if connections <= 0:
+        return
+
+    engine = get_async_engine()
+
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
+def pool_snapshots() -> dict:
+    """Telemetry of every pool; a pool whose engine was not created yet is reported as such."""
+    return {
+        name: {"created": True, **pool_metrics[name].snapshot()} if name in pool_metrics else {"created": False}
+        for name in POOL_NAMES
+    }
+
+
+async def dispose_engines() -> None:
+    """Closes the pooled connections of the engines created so far."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
 def get_db():
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
\ No newline at end of file
@@ -1,8 +1,17 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware  # 🚀 Importação do CORS
+from starlette.concurrency import run_in_threadpool
 
-from app.schemas.user_schema import db
-from app.databases.postgres_database import Base, engine, get_db
+from app.core.principal_cache import principal_cache
+from app.core.report_cache import report_cache
+from app.core.request_metrics import MetricsMiddleware, request_metrics
+from app.core.responses import AppJSONResponse
+from app.databases import postgres_database
+from app.databases.postgres_database import pool_snapshots
+from app.routers.authentication import require_metrics_access
 from app.routers.user_router import router as user_router
 from app.routers.emotion_router import router as emotion_router
 from app.routers.emotion_record_router import router as emotion_record_router
@@ -13,9 +22,22 @@ from dotenv import load_dotenv
 
 load_dotenv()  # Carrega as variáveis do arquivo .env
 
-db.Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nada disso roda na importação: schema, pools e caches são preparados uma vez por worker
+    await run_in_threadpool(
+        postgres_database.prepare_database,
+        postgres_database.CREATE_SCHEMA_ON_STARTUP,
+        postgres_database.POOL_WARMUP_CONNECTIONS,
+    )
+    await postgres_database.warm_async_pool(postgres_database.POOL_WARMUP_CONNECTIONS)
+    app.openapi()  # Gerado (e guardado) na primeira visita a /docs
+    yield
+    await postgres_database.dispose_engines()
+
+
+app = FastAPI(default_response_class=AppJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,7 +46,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-DB-Statements"],
 )
+# Registrado por último para ser o mais externo e medir a requisição inteira
+app.add_middleware(MetricsMiddleware)
 # 🚀 Incluindo as rotas
 app.include_router(user_router)
 app.include_router(emotion_router)
@@ -37,3 +62,17 @@ app.include_router(feedback_router)
 @app.get("/ping", tags=["admin"])
 async def root():
     return {"message": "pong"}
+
+
+@app.get("/admin/metrics", tags=["admin"], dependencies=[Depends(require_metrics_access)])
+async def metrics():
+    return {
+        "principal_cache": principal_cache.stats(),
+        "report_cache": report_cache.stats(),
+        "pool": pool_snapshots(),
+    }
+
+
+@app.get("/metrics", tags=["admin"], response_class=PlainTextResponse, dependencies=[Depends(require_metrics_access)])
+async def prometheus_metrics():
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,9 +1,10 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 from enum import Enum
 
 from app.models.emotion_model import EmotionInDb
+from app.utils.constants import BulkIngest
 
 class IntensityEnum(int, Enum):
     ONE = 1
@@ -50,6 +51,7 @@ class EmotionRecordWithEmotion(EmotionRecordInDb):
 
 class AllEmotionReportsResponse(BaseModel):
     emotion_records: List[EmotionRecordInDb]
+    next_cursor: str | None = None
 
 
 class EmotionRecordInTeam(EmotionRecord):
@@ -58,3 +60,25 @@ class EmotionRecordInTeam(EmotionRecord):
     id: int | None = None
     user_name: str | None = None
     created_at: datetime = Field(default_factory=datetime.now)
+
+
+class BulkEmotionRecord(EmotionRecord):
+    # Check-ins feitos offline chegam com o horário original; sem ele, vale o horário do envio
+    created_at: datetime | None = None
+
+
+class BulkEmotionRecordRequest(BaseModel):
+    records: List[BulkEmotionRecord] = Field(min_length=1, max_length=BulkIngest.MAX_RECORDS)
+
+
+class BulkEmotionRecordResult(BaseModel):
+    index: int
+    status: Literal["created", "rejected"]
+    id: int | None = None
+    error: str | None = None
+
+
+class BulkEmotionRecordResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[BulkEmotionRecordResult]
@@ -30,4 +30,5 @@ class FeedbackResponse(FeedbackInDb):
 
 
 class AllFeedbacksResponse(BaseModel):
-    feedbacks: List[FeedbackResponse] 
\ No newline at end of file
+    feedbacks: List[FeedbackResponse]
+    next_cursor: str | None = None 
\ No newline at end of file
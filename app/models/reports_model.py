@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List
+from datetime import date
+from typing import List, Literal
 
 
 class EmojiDistribution(BaseModel):
@@ -32,4 +33,50 @@ class AnalysisByUser(BaseModel):
     user_name: str
     all_user_emotion_records: List[EmotionAvgAndFrequency]
 
-    
\ No newline at end of file
+
+class DashboardEmotion(EmotionAvgAndFrequency):
+    emoji: str | None = None
+    negative_count: int
+
+
+class DashboardReport(BaseModel):
+    emotions: List[DashboardEmotion]
+    total_records: int
+    negative_emotion_ratio: float
+    alert: str | None = None
+
+
+class TrendBucket(BaseModel):
+    bucket_start: date
+    count: int
+    avg_intensity: float
+    negative_ratio: float
+
+
+class TrendReport(BaseModel):
+    granularity: Literal["day", "week", "month"]
+    buckets: List[TrendBucket]
+
+
+class AnomalyPoint(BaseModel):
+    day: date
+    count: int
+    avg_intensity: float | None = None
+    negative_ratio: float | None = None
+    rolling_intensity: float | None = None
+    rolling_negative_ratio: float | None = None
+    intensity_zscore: float | None = None
+    negative_ratio_zscore: float | None = None
+    is_anomaly: bool = False
+    is_change_point: bool = False
+
+
+class AnomalyReport(BaseModel):
+    start_date: date
+    end_date: date
+    rolling_window: int
+    baseline_window: int
+    zscore_threshold: float
+    points: List[AnomalyPoint]
+    anomalies: List[date]
+    change_points: List[date]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
+from enum import Enum
 from app.models.user_model import UserInTeam
 from app.models.emotion_record_model import EmotionRecordInTeam
 from app.models.emotion_model import EmotionInDb
@@ -28,12 +29,20 @@ class TeamResponse(BaseModel):
     emotions_reports: List[EmotionRecordInTeam]
     emotions: List[EmotionInDb]
     manager: UserInTeam  # Adiciona o manager real do time
+    next_cursor: str | None = None
 
 
 class AllTeamsResponse(BaseModel):
     teams: List[TeamData]
 
 
+class TeamRole(str, Enum):
+    """Relationship between a user and a team, used for authorization checks."""
+    MANAGER = "manager"
+    MEMBER = "member"
+    NONE = "none"
+
+
 # class Team(BaseModel):
 #     name: str
 
@@ -1,24 +1,32 @@
+import hmac
+import os
+
 import jwt
 from jwt.exceptions import InvalidTokenError
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
 from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.crud import user_crud
+from app.core.principal_cache import principal_cache
 
 from app.models.user_model import UserInDB
 from app.models.token_model import TokenData
 
 from app.databases.postgres_database import get_db
-from app.utils.constants import Errors, SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.utils.constants import Errors, Role, SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 from app.utils.logger import logger
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Token fixo para coletores de métricas (ex.: Prometheus), que não têm usuário; sem ele, só gerentes
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
 
 def create_access_token(data: dict | None = None):
     to_encode = data.copy()
@@ -52,9 +60,16 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Se
     except InvalidTokenError:
         raise Errors.CREDENTIALS_EXCEPTION
 
-    user = user_crud.get_user_by_email(db, email=token_data.email)
+    user = principal_cache.get(token_data.email)
     if user is None:
-        raise Errors.CREDENTIALS_EXCEPTION
+        # A consulta ao banco é síncrona: roda no threadpool para não bloquear o event loop
+        db_user = await run_in_threadpool(user_crud.get_user_by_email, db, email=token_data.email)
+        if db_user is None:
+            raise Errors.CREDENTIALS_EXCEPTION
+
+        # Guarda uma cópia desacoplada da sessão, que pode ser compartilhada entre requisições
+        user = UserInDB.model_validate(db_user, from_attributes=True)
+        principal_cache.set(token_data.email, user)
     return user
 
 
@@ -62,3 +77,16 @@ async def get_current_active_user(current_user: Annotated[UserInDB, Depends(get_
     if current_user.disabled:
         raise Errors.INACTIVE_USER
     return current_user
+
+
+async def require_metrics_access(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)):
+    """
+    Guards the telemetry endpoints: accepts the METRICS_TOKEN bearer token, when configured, or the
+    access token of an active manager.
+    """
+    if METRICS_TOKEN and hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        return
+
+    user = await get_current_active_user(await get_current_user(token, db))
+    if user.role != Role.MANAGER:
+        raise Errors.NO_PERMISSION
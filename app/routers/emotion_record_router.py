@@ -1,7 +1,9 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
+from app.crud import async_emotion_record_crud
 from app.crud import emotion_record_crud
 from app.crud import emotion_crud
 
@@ -9,6 +11,8 @@ from app.models.emotion_record_model import (
     EmotionRecordInDb,
     EmotionRecord,
     AllEmotionReportsResponse,
+    BulkEmotionRecordRequest,
+    BulkEmotionRecordResponse,
     EmotionRecordWithEmotion,
 )
 
@@ -16,10 +20,13 @@ from app.models.user_model import UserInDB
 
 from app.routers.authentication import get_current_active_user
 
-from app.databases.postgres_database import get_db
+from app.core.responses import trusted_json_response
 
-from app.utils.constants import Errors, Role
+from app.databases.postgres_database import get_async_db, get_db
+
+from app.utils.constants import Errors, Pagination, Role
 from app.utils.logger import logger
+from app.utils.pagination import decode_cursor
 
 
 router = APIRouter(
@@ -29,36 +36,64 @@ router = APIRouter(
 
 
 @router.post("/", response_model=EmotionRecordInDb)
-def create_emotion_record(
+async def create_emotion_record(
     emotion_record: EmotionRecord,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     logger.debug("call to create emotion record")
 
     emotion_record.user_id = current_user.id
-    response = emotion_record_crud.create_emotion_record(db, emotion_record)
+    response = await async_emotion_record_crud.create_emotion_record(db, emotion_record)
     if response is None:
         raise Errors.INVALID_PARAMS
 
     return response
 
 
+@router.post("/bulk", response_model=BulkEmotionRecordResponse)
+async def create_emotion_records_bulk(
+    request: BulkEmotionRecordRequest,
+    current_user: Annotated[UserInDB, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_async_db),
+):
+    logger.debug("call to create %s emotion records in bulk", len(request.records))
+
+    for emotion_record in request.records:
+        emotion_record.user_id = current_user.id
+
+    results = await async_emotion_record_crud.create_emotion_records_bulk(db, request.records)
+    if results is None:
+        raise Errors.INVALID_PARAMS
+
+    created = sum(1 for result in results if result.status == "created")
+    return BulkEmotionRecordResponse(created=created, rejected=len(results) - created, results=results)
+
+
 @router.get("/", response_model=AllEmotionReportsResponse)
-def get_all_emotion_report_for_logged_user(
+async def get_all_emotion_report_for_logged_user(
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     include_feedbacks: bool = False,
+    limit: int = Query(Pagination.DEFAULT_LIMIT, ge=1, le=Pagination.MAX_LIMIT),
+    cursor: str | None = None,
 ):
     logger.debug("call to get all emotion records")
 
-    response = emotion_record_crud.get_emotion_records_by_user_id(
-        db, [current_user.id], for_team=False, include_feedbacks=include_feedbacks
+    after = decode_cursor(cursor) if cursor else None
+    response, next_cursor = await async_emotion_record_crud.get_emotion_records_by_user_id(
+        db,
+        [current_user.id],
+        for_team=False,
+        include_feedbacks=include_feedbacks,
+        limit=limit,
+        after=after,
     )
     if response is None:
-        logger.error(f"no emotion record found in the database")
+        logger.error("no emotion record found in the database")
 
-    return AllEmotionReportsResponse(emotion_records=response)
+    # Linhas montadas pelo CRUD a partir do banco: dispensam a validação do response_model
+    return trusted_json_response({"emotion_records": response, "next_cursor": next_cursor})
 
 
 @router.get("/{emotion_name}", response_model=AllEmotionReportsResponse)
@@ -76,10 +111,10 @@ def get_emotion_report_for_logged_user_by_emotion_name(
     )
     if response is None:
         logger.error(
-            f"no emotion record found in the database for this emotion name: {emotion_name}"
+            "no emotion record found in the database for this emotion name: %s", emotion_name
         )
         raise Errors.NOT_FOUND
-    return AllEmotionReportsResponse(emotion_records=response)
+    return trusted_json_response({"emotion_records": response, "next_cursor": None})
 
 
 @router.get("/id/{record_id}", response_model=EmotionRecordWithEmotion)
@@ -87,18 +122,14 @@ def get_emotion_record_by_id(
     record_id: int,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     db: Session = Depends(get_db),
+    include_feedbacks: bool = False,
 ):
     logger.debug("call to get emotion record by id")
 
-    from app.schemas.emotion_record_schema import EmotionRecord as EmotionRecordSchema
-
-    db_record = (
-        db.query(EmotionRecordSchema)
-        .filter(EmotionRecordSchema.id == record_id)
-        .first()
+    record = emotion_record_crud.get_emotion_record_by_id(
+        db, record_id, user_id=current_user.id, include_feedbacks=include_feedbacks
     )
-    if db_record is None or db_record.user_id != current_user.id:
+    if record is None:
         raise Errors.NOT_FOUND
 
-    record = emotion_record_crud.get_emotion_record_by_id(db, record_id)
     return record
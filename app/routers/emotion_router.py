@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 from typing import Annotated
 
+from app.core.etag import check_not_modified
 from app.crud import emotion_crud
+from app.crud import team_version_crud
 
 from app.models.emotion_model import EmotionInDb, Emotion, AllEmotionsResponse
-from app.models.emotion_record_model import AllEmotionReportsResponse
 
 from app.models.user_model import UserInDB
 
@@ -40,7 +41,7 @@ def create_emotion(
     return response
 
 
-@router.get("/{emotion_id}", response_model=AllEmotionReportsResponse)
+@router.get("/{emotion_id}", response_model=EmotionInDb)
 def get_emotion_by_id(
         current_user: Annotated[UserInDB, Depends(get_current_active_user)],
         emotion_id: int,
@@ -51,27 +52,30 @@ def get_emotion_by_id(
     if current_user.role != Role.MANAGER:
         raise Errors.NO_PERMISSION
     
-    reports = emotion_crud.get_emotion_by_id(db, emotion_id, current_user.id)
-    if reports is None:
-        logger.error(f"no emotion report found for this id: ", emotion_id)
+    emotion = emotion_crud.get_emotion_by_id(db, emotion_id, current_user.id)
+    if emotion is None:
+        logger.error("no emotion found for this id: %s", emotion_id)
         raise Errors.NOT_FOUND
     
-    return AllEmotionReportsResponse(reports=reports)
+    return emotion
 
 
 @router.get("/", response_model=AllEmotionsResponse)
 def get_all_emotions(
+        request: Request,
+        response: Response,
         current_user: Annotated[UserInDB, Depends(get_current_active_user)],
         db: Session = Depends(get_db),
 ):
     logger.debug("call to get all emotions")
+    check_not_modified(request, response, current_user.id, team_version_crud.get_catalog_version(db))
 
     # if current_user.role != Role.MANAGER:
     #     raise Errors.NO_PERMISSION
 
     emotions = emotion_crud.get_all_emotions(db, current_user.id)
     if emotions is None:
-        logger.error(f"no emotions found in the database")
+        logger.error("no emotions found in the database")
     
     return AllEmotionsResponse(emotions=emotions)
 
@@ -83,14 +87,14 @@ def update_emotion_by_id(
         current_user: Annotated[UserInDB, Depends(get_current_active_user)],
         db: Session = Depends(get_db),
 ):
-    logger.debug(f"Call to update emotion by id: {emotion_id}")
+    logger.debug("Call to update emotion by id: %s", emotion_id)
 
     if current_user.role != Role.MANAGER:
         raise Errors.NO_PERMISSION
 
     updated_emotion = emotion_crud.update_emotion(db, emotion_id, emotion_update, current_user.id)
     if updated_emotion is None:
-        logger.error(f"Failed to update emotion with name: {emotion_id}")
+        logger.error("Failed to update emotion with name: %s", emotion_id)
         raise Errors.INVALID_PARAMS
 
     return updated_emotion
@@ -102,7 +106,7 @@ def delete_emotion_by_id(
         current_user: Annotated[UserInDB, Depends(get_current_active_user)],
         db: Session = Depends(get_db),
 ):
-    logger.debug(f"Call to delete emotion by ID: {emotion_id}")
+    logger.debug("Call to delete emotion by ID: %s", emotion_id)
 
     if current_user.role != Role.MANAGER:
         raise Errors.NO_PERMISSION
@@ -1,6 +1,7 @@
+from datetime import datetime
 from sqlalchemy.orm import Session
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.crud import feedback_crud
 from app.crud import emotion_record_crud
@@ -12,8 +13,9 @@ from app.routers.authentication import get_current_active_user
 
 from app.databases.postgres_database import get_db
 
-from app.utils.constants import Errors, Role
+from app.utils.constants import Errors, Pagination, Role
 from app.utils.logger import logger
+from app.utils.pagination import decode_cursor
 
 
 router = APIRouter(
@@ -36,36 +38,14 @@ def create_feedback(
 
     # Verificar se o usuário é um gerente
     if current_user.role != Role.MANAGER:
-        logger.error(f"User {current_user.id} is not a manager")
+        logger.error("User %s is not a manager", current_user.id)
         raise Errors.NO_PERMISSION
 
-    # Verificar se o gerente pode enviar feedback para este registro de emoção
-    can_send = feedback_crud.can_manager_send_feedback(db, current_user.id, feedback.emotion_record_id)
-    if not can_send:
-        logger.error(f"Manager {current_user.id} cannot send feedback to emotion record {feedback.emotion_record_id}")
+    # A permissão (gerente de algum time do colaborador) é verificada junto com a criação
+    response = feedback_crud.create_feedback(db, feedback, current_user.id)
+    if response is None:
         raise Errors.NO_PERMISSION
 
-    # Criar o feedback
-    db_feedback = feedback_crud.create_feedback(db, feedback, current_user.id)
-    if db_feedback is None:
-        raise Errors.INVALID_PARAMS
-
-    # Buscar o registro de emoção para verificar se é anônimo
-    emotion_record = db.query(emotion_record_crud.EmotionRecordSchema).filter(
-        emotion_record_crud.EmotionRecordSchema.id == feedback.emotion_record_id
-    ).first()
-
-    # Converter para o modelo de resposta
-    response = FeedbackResponse(
-        id=db_feedback.id,
-        message=db_feedback.message,
-        emotion_record_id=db_feedback.emotion_record_id,
-        manager_id=db_feedback.manager_id,
-        is_anonymous=db_feedback.is_anonymous,
-        created_at=db_feedback.created_at,
-        manager_knows_identity=not emotion_record.is_anonymous
-    )
-
     return response
 
 
@@ -73,14 +53,21 @@ def create_feedback(
 def get_feedbacks_for_current_user(
         current_user: Annotated[UserInDB, Depends(get_current_active_user)],
         db: Session = Depends(get_db),
+        limit: int = Query(Pagination.DEFAULT_LIMIT, ge=1, le=Pagination.MAX_LIMIT),
+        cursor: str | None = None,
+        since: datetime | None = None,
 ):
     """
-    Retorna todos os feedbacks recebidos pelo usuário atual.
+    Retorna os feedbacks recebidos pelo usuário atual, do mais recente ao mais antigo.
+    Use `next_cursor` para a próxima página e `since` para buscar só os feedbacks novos.
     """
     logger.debug("call to get feedbacks for current user")
 
-    feedbacks = feedback_crud.get_feedbacks_by_user_id(db, current_user.id)
-    return AllFeedbacksResponse(feedbacks=feedbacks)
+    after = decode_cursor(cursor) if cursor else None
+    feedbacks, next_cursor = feedback_crud.get_feedbacks_by_user_id(
+        db, current_user.id, limit=limit, after=after, since=since
+    )
+    return AllFeedbacksResponse(feedbacks=feedbacks, next_cursor=next_cursor)
 
 
 @router.get("/emotion-record/{emotion_record_id}", response_model=AllFeedbacksResponse)
@@ -93,7 +80,7 @@ def get_feedbacks_by_emotion_record(
     Retorna todos os feedbacks para um registro de emoção específico.
     O usuário só pode ver feedbacks para seus próprios registros de emoção.
     """
-    logger.debug(f"call to get feedbacks for emotion record {emotion_record_id}")
+    logger.debug("call to get feedbacks for emotion record %s", emotion_record_id)
 
     # Verificar se o registro de emoção pertence ao usuário
     emotion_record = db.query(emotion_record_crud.EmotionRecordSchema).filter(
@@ -101,11 +88,11 @@ def get_feedbacks_by_emotion_record(
     ).first()
 
     if not emotion_record:
-        logger.error(f"Emotion record {emotion_record_id} not found")
+        logger.error("Emotion record %s not found", emotion_record_id)
         raise Errors.NOT_FOUND
 
     if emotion_record.user_id != current_user.id and current_user.role != Role.MANAGER:
-        logger.error(f"User {current_user.id} cannot access emotion record {emotion_record_id}")
+        logger.error("User %s cannot access emotion record %s", current_user.id, emotion_record_id)
         raise Errors.NO_PERMISSION
 
     feedbacks = feedback_crud.get_feedbacks_by_emotion_record_id(db, emotion_record_id)
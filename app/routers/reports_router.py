@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
-from typing import Annotated
+from typing import Annotated, Literal
 from datetime import date
 
+from app.core.auth_utils import require_team_manager
+from app.core.etag import check_not_modified
 from app.crud import reports_crud
+from app.crud import team_version_crud
 
 from app.models.user_model import UserInDB
 import app.models.reports_model as reports_model
@@ -21,6 +24,8 @@ router = APIRouter(
  
 @router.get("/emoji-distribution/{team_id}", response_model=reports_model.EmojiDistributionReport)
 def emoji_distribution_by_team(
+    request: Request,
+    response: Response,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     team_id: int,
     start_date: date | None = None,
@@ -30,14 +35,17 @@ def emoji_distribution_by_team(
 
     if current_user.role != Role.MANAGER:
         raise Errors.NO_PERMISSION
+    _check_report_not_modified(request, response, db, team_id, current_user)
 
-    response = reports_crud.get_emoji_distribution_report(db, team_id, start_date, end_date)
+    report = reports_crud.get_emoji_distribution_report(db, team_id, start_date, end_date)
 
-    return response
+    return report
 
 
 @router.get("/average-intensity/{team_id}", response_model=reports_model.AverageIntensityReport)
 def average_intensity_by_team(
+    request: Request,
+    response: Response,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     team_id: int,
     start_date: date | None = None,
@@ -47,14 +55,84 @@ def average_intensity_by_team(
 
     if current_user.role != Role.MANAGER:
         raise Errors.NO_PERMISSION
+    _check_report_not_modified(request, response, db, team_id, current_user)
 
-    response = reports_crud.get_average_intensity_report(db, team_id, start_date, end_date)
+    report = reports_crud.get_average_intensity_report(db, team_id, start_date, end_date)
     
-    return response
+    return report
+
+
+@router.get("/dashboard/{team_id}", response_model=reports_model.DashboardReport)
+def dashboard_by_team(
+    request: Request,
+    response: Response,
+    current_user: Annotated[UserInDB, Depends(get_current_active_user)],
+    team_id: int,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Emoji distribution and average intensity of the team in one report (one aggregate query).
+    """
+    require_team_manager(db, team_id, current_user)
+    _check_report_not_modified(request, response, db, team_id, current_user)
+
+    report = reports_crud.get_dashboard_report(db, team_id, start_date, end_date)
+
+    return report
+
+
+@router.get("/trend/{team_id}", response_model=reports_model.TrendReport)
+def trend_by_team(
+    request: Request,
+    response: Response,
+    current_user: Annotated[UserInDB, Depends(get_current_active_user)],
+    team_id: int,
+    granularity: Literal["day", "week", "month"] = "day",
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Mood of the team over time, grouped by day, week or month.
+    """
+    require_team_manager(db, team_id, current_user)
+    _check_report_not_modified(request, response, db, team_id, current_user)
+
+    report = reports_crud.get_trend_report(db, team_id, start_date, end_date, granularity=granularity)
+
+    return report
+
+
+@router.get("/anomalies/{team_id}", response_model=reports_model.AnomalyReport)
+def anomalies_by_team(
+    request: Request,
+    response: Response,
+    current_user: Annotated[UserInDB, Depends(get_current_active_user)],
+    team_id: int,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Daily mood of the team with rolling averages, z-scores, anomalies and change points.
+    Covers at most one year, ending at `end_date` (today by default).
+    """
+    require_team_manager(db, team_id, current_user)
+    _check_report_not_modified(request, response, db, team_id, current_user)
+
+    report = reports_crud.get_anomaly_report(db, team_id, start_date, end_date)
+    if report is None:
+        raise Errors.INVALID_PARAMS
+
+    return report
 
 
 @router.get("/user_emotion_analysis/{team_id}/{user_id}", response_model=reports_model.AnalysisByUser)
 def get_emotion_analysis_by_user(
+    request: Request,
+    response: Response,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     team_id: int,
     user_id: int,
@@ -65,14 +143,17 @@ def get_emotion_analysis_by_user(
 
     if current_user.role != Role.MANAGER:
         raise Errors.NO_PERMISSION
+    _check_report_not_modified(request, response, db, team_id, current_user)
 
-    response = reports_crud.get_emotion_analysis_by_user(db, team_id, user_id, start_date, end_date)
+    report = reports_crud.get_emotion_analysis_by_user(db, team_id, user_id, start_date, end_date)
     
-    return response
+    return report
 
 
 @router.get("/anonymous_records_emotion_analysis/{team_id}", response_model=reports_model.AnalysisByUser)
 def get_anonymous_emotion_analysis_by_team(
+    request: Request,
+    response: Response,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     team_id: int,
     start_date: date | None = None,
@@ -82,7 +163,17 @@ def get_anonymous_emotion_analysis_by_team(
 
     if current_user.role != Role.MANAGER:
         raise Errors.NO_PERMISSION
+    _check_report_not_modified(request, response, db, team_id, current_user)
 
-    response = reports_crud.get_anonymous_emotion_analysis(db, team_id, start_date, end_date)
+    report = reports_crud.get_anonymous_emotion_analysis(db, team_id, start_date, end_date)
     
-    return response
+    return report
+
+
+def _check_report_not_modified(
+    request: Request, response: Response, db: Session, team_id: int, current_user: UserInDB
+):
+    # Sem end_date os relatórios vão até hoje: a data também faz parte da versão
+    version = team_version_crud.get_team_version(db, team_id)
+    if version is not None:
+        check_not_modified(request, response, current_user.id, (version, date.today()))
@@ -1,14 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Annotated
-from app.core.auth_utils import ensure_is_team_manager, ensure_is_team_member_or_manager
+from typing import Annotated, Literal
+from app.core.auth_utils import (
+    require_team_manager,
+    require_team_member_or_manager,
+    require_team_member_or_manager_async,
+)
+from app.core.etag import check_not_modified
+from app.core.responses import trusted_json_response
 from app.models.team_model import Team, TeamResponse, AllTeamsResponse, TeamData
-from app.models.user_model import UserInDB
-from app.models.emotion_model import AllEmotionsResponse
-from app.databases.postgres_database import get_db
-from app.utils.constants import Errors, Role, Messages
+from app.models.user_model import UserInDB, UserInTeam
+from app.models.emotion_model import AllEmotionsResponse, EmotionInDb
+from app.databases.postgres_database import SessionLocal, get_async_db, get_db, get_engine
+from app.utils.constants import Errors, Role, Messages, Pagination
 from app.utils.logger import logger
+from app.utils.export import csv_chunks, ndjson_chunks
+from app.utils.pagination import decode_cursor
+from app.crud import async_emotion_crud
+from app.crud import async_team_crud
 from app.crud import team_crud
+from app.crud import team_version_crud
 from app.crud import emotion_crud
 from app.crud import user_crud
 from app.routers.authentication import get_current_active_user
@@ -32,7 +45,7 @@ def create_team(
     logger.debug("Call to create a new team.")
 
     if current_user.role != Role.MANAGER:
-        logger.error(f"User doesn't have the permission to create new teams.")
+        logger.error("User doesn't have the permission to create new teams.")
         raise Errors.NO_PERMISSION
     
     db_team = team_crud.create_team(db, team.name, current_user.id)
@@ -43,21 +56,37 @@ def create_team(
 
 
 @router.get("/{team_id}", response_model=TeamResponse)
-def get_team_by_id(
+async def get_team_by_id(
     team_id: int,
+    request: Request,
+    response: Response,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(Pagination.DEFAULT_LIMIT, ge=1, le=Pagination.MAX_LIMIT),
+    cursor: str | None = None,
 ):
-    team = team_crud.get_team_by_id(db, team_id)
+    await require_team_member_or_manager_async(db, team_id, current_user)
+    check_not_modified(request, response, current_user.id, await async_team_crud.get_team_version(db, team_id))
+
+    after = decode_cursor(cursor) if cursor else None
+    team = await async_team_crud.get_team_by_id(db, team_id, limit=limit, after=after)
     if not team:
         raise Errors.NOT_FOUND
 
-    ensure_is_team_member_or_manager(team, current_user)
+    emotions = await async_emotion_crud.get_emotions_by_team(db, team_id)
 
-    emotions = emotion_crud.get_emotions_by_team(db, team_id)
-    team["emotions"] = emotions
-
-    return team
+    # Só os poucos objetos do time são validados; os registros de emoção já vêm prontos do CRUD
+    return trusted_json_response(
+        {
+            "team_data": TeamData.model_validate(team["team_data"], from_attributes=True),
+            "members": [UserInTeam.model_validate(member, from_attributes=True) for member in team["members"]],
+            "emotions_reports": team["emotions_reports"],
+            "emotions": [EmotionInDb.model_validate(emotion, from_attributes=True) for emotion in emotions],
+            "manager": UserInTeam.model_validate(team["manager"], from_attributes=True),
+            "next_cursor": team.get("next_cursor"),
+        },
+        response,
+    )
 
 
 @router.get("/", response_model=AllTeamsResponse)
@@ -73,20 +102,15 @@ def get_all_teams(
     return AllTeamsResponse(teams=teams)
 
 
-@router.put("/{team_id}", response_model=TeamResponse)
+@router.put("/{team_id}", response_model=TeamData)
 def update_team(
     team_id: int,
     team_update: Team,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     db: Session = Depends(get_db),
 ):
-    team = team_crud.get_team_by_id(db, team_id)
-    if not team:
-        raise Errors.NOT_FOUND
+    require_team_manager(db, team_id, current_user)
 
-    ensure_is_team_manager(team, current_user)
-
-    team_update.manager_id = current_user.id
     return team_crud.update_team(db, team_id, team_update)
 
 @router.delete("/{team_id}")
@@ -95,11 +119,7 @@ def delete_team(
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     db: Session = Depends(get_db),
 ):
-    team = team_crud.get_team_by_id(db, team_id)
-    if not team:
-        raise Errors.NOT_FOUND
-
-    ensure_is_team_manager(team, current_user)
+    require_team_manager(db, team_id, current_user)
 
     team_crud.delete_team(db, team_id)
     return {"message": f"Team {team_id} deleted."}
@@ -111,11 +131,7 @@ def add_team_member(
         db: Session = Depends(get_db),
         user_email: str = Query(..., description="Email do usuário a ser adicionado"),
 ):
-    team = team_crud.get_team_by_id(db, team_id)
-    if not team:
-        raise Errors.NOT_FOUND
-
-    ensure_is_team_manager(team, current_user)
+    require_team_manager(db, team_id, current_user)
 
     user = user_crud.get_user_by_email(db, user_email)
     if not user:
@@ -132,11 +148,7 @@ def remove_team_member(
         db: Session = Depends(get_db),
         user_email: str = Query(..., description="Email do usuário a ser removido"),
 ):
-    team = team_crud.get_team_by_id(db, team_id)
-    if not team:
-        raise Errors.NOT_FOUND
-
-    ensure_is_team_manager(team, current_user)
+    require_team_manager(db, team_id, current_user)
 
     user = user_crud.get_user_by_email(db, user_email)
     if not user:
@@ -149,14 +161,49 @@ def remove_team_member(
 @router.get("/{team_id}/emotions", response_model=AllEmotionsResponse)
 def get_emotions_by_team(
     team_id: int,
+    request: Request,
+    response: Response,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     db: Session = Depends(get_db),
 ):
-    team = team_crud.get_team_by_id(db, team_id)
-    if not team:
-        raise Errors.NOT_FOUND
-
-    ensure_is_team_member_or_manager(team, current_user)
+    require_team_member_or_manager(db, team_id, current_user)
+    # Mesmo token de GET /emotions/: check-ins no time não invalidam a lista de emoções
+    check_not_modified(request, response, current_user.id, team_version_crud.get_catalog_version(db))
 
     emotions = emotion_crud.get_emotions_by_team(db, team_id)
     return AllEmotionsResponse(emotions=emotions)
+
+
+@router.get("/{team_id}/export")
+def export_team_emotion_records(
+    team_id: int,
+    current_user: Annotated[UserInDB, Depends(get_current_active_user)],
+    db: Session = Depends(get_db),
+    format: Literal["csv", "ndjson"] = "csv",
+):
+    """
+    Streams every emotion record of the team as CSV or NDJSON.
+    Only the team manager can export; anonymous records are masked.
+    """
+    require_team_manager(db, team_id, current_user)
+    logger.debug("Call to export the emotion records of team %s as %s.", team_id, format)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_team_export(team_id, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="team_{team_id}_emotion_records.{format}"'},
+    )
+
+
+def _stream_team_export(team_id: int, format: str):
+    # A sessão da requisição é fechada antes do corpo ser enviado, então o streaming usa a sua própria
+    db = SessionLocal(bind=get_engine())
+    try:
+        rows = team_crud.iter_team_emotion_records(db, team_id)
+        if format == "csv":
+            yield from csv_chunks(rows, team_crud.TEAM_EXPORT_COLUMNS)
+        else:
+            yield from ndjson_chunks(rows)
+    finally:
+        db.close()
@@ -91,11 +91,11 @@ def update_user_by_id(
         current_user: Annotated[UserInDB, Depends(get_current_active_user)],
         db: Session = Depends(get_db),
 ):
-    logger.debug(f"Call to update emotion by id: {current_user.id}")
+    logger.debug("Call to update emotion by id: %s", current_user.id)
 
     updated_user = user_crud.update_user(db, current_user.id, user_update)
     if updated_user is None:
-        logger.error(f"Failed to update emotion with name: {current_user.id}")
+        logger.error("Failed to update emotion with name: %s", current_user.id)
         raise Errors.INVALID_PARAMS
 
     return updated_user
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Index, event, insert
 from sqlalchemy.orm import relationship
 import datetime
 import app.databases.postgres_database as db
@@ -17,6 +17,11 @@ class Emotion(db.Base):
     is_negative = Column(Boolean, nullable=False, default=False)
 
     team = relationship("Team", back_populates="emotions")
+
+    __table_args__ = (
+        # Emoções do time (relatórios, GET /teams/{team_id}/emotions)
+        Index("ix_emotion_team_id", "team_id"),
+    )
     
 
 class EmotionRecord(db.Base):
@@ -34,3 +39,46 @@ class EmotionRecord(db.Base):
     emotion = relationship("Emotion")
 
     created_at = Column(DateTime, default=datetime.datetime.now)
+
+    __table_args__ = (
+        # Listagem paginada por usuário, ordenada por (created_at, id)
+        Index("ix_emotion_record_user_id_created_at", "user_id", "created_at", "id"),
+        # Relatórios por time: join emotion -> emotion_record filtrado por data
+        Index("ix_emotion_record_emotion_id_created_at", "emotion_id", "created_at"),
+    )
+
+
+class TeamEmotionDaily(db.Base):
+    """
+    Daily rollup of the emotion records of a team, kept up to date by the record writes.
+    """
+    __tablename__ = DataBase.TEAM_EMOTION_DAILY_TABLE_NAME
+
+    team_id = Column(Integer, ForeignKey("team.id", ondelete="CASCADE"), primary_key=True)
+    emotion_id = Column(Integer, ForeignKey("emotion.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    intensity_sum = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Relatórios por time filtrados por período
+        Index("ix_team_emotion_daily_team_id_day", "team_id", "day"),
+    )
+
+
+class EmotionCatalogVersion(db.Base):
+    """
+    Single row (id 1) with the version of the emotion catalog, incremented by every emotion write.
+    The emotion lists derive their ETag from it (see team_version_crud).
+    """
+    __tablename__ = DataBase.EMOTION_CATALOG_VERSION_TABLE_NAME
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+@event.listens_for(EmotionCatalogVersion.__table__, "after_create")
+def _insert_catalog_version_row(table, connection, **kwargs):
+    # A linha existe desde a criação da tabela, então o incremento é sempre um UPDATE simples
+    connection.execute(insert(table).values(id=1, version=0))
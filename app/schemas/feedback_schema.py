@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 import datetime
 import app.databases.postgres_database as db
@@ -17,4 +17,9 @@ class Feedback(db.Base):
     created_at = Column(DateTime, default=datetime.datetime.now)
 
     emotion_record = relationship("EmotionRecord")
-    manager = relationship("User", foreign_keys=[manager_id]) 
\ No newline at end of file
+    manager = relationship("User", foreign_keys=[manager_id])
+
+    __table_args__ = (
+        # Feedbacks de uma página de registros de emoção
+        Index("ix_feedback_emotion_record_id", "emotion_record_id"),
+    ) 
\ No newline at end of file
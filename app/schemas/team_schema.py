@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 import app.databases.postgres_database as db
 from app.utils.constants import DataBase
@@ -10,7 +10,9 @@ user_teams = Table(
     "user_teams",
     db.Base.metadata,
     Column("user_id", Integer, ForeignKey("user.id"), primary_key=True),
-    Column("team_id", Integer, ForeignKey("team.id"), primary_key=True)
+    Column("team_id", Integer, ForeignKey("team.id"), primary_key=True),
+    # A chave primária (user_id, team_id) não atende buscas pelos membros de um time
+    Index("ix_user_teams_team_id", "team_id", "user_id"),
 )
 
 
@@ -21,9 +23,15 @@ class Team(db.Base):
     name = Column(String, nullable=False)
     manager_id = Column(Integer, ForeignKey("user.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.now)
+    # Incrementada a cada escrita que afeta o time; base dos ETags (ver team_version_crud)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     manager = relationship("User", back_populates="managed_teams")
 
     members = relationship("User", secondary="user_teams", back_populates="teams")
 
     emotions = relationship("Emotion", back_populates="team", cascade="all, delete")
+
+    __table_args__ = (
+        Index("ix_team_manager_id", "manager_id"),
+    )
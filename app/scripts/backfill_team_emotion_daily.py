@@ -0,0 +1,28 @@
+"""
+Rebuilds the `team_emotion_daily` rollup from the raw emotion records.
+
+    python -m app.scripts.backfill_team_emotion_daily [--team-id ID]
+"""
+import argparse
+
+from app.crud.team_emotion_daily_crud import rebuild_daily_rollup
+from app.databases.postgres_database import SessionLocal, get_engine
+from app.schemas import emotion_record_schema, feedback_schema, team_schema, user_schema  # noqa: F401
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Rebuilds the daily rollup used by the team reports.")
+    parser.add_argument("--team-id", type=int, default=None, help="rebuild only this team")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal(bind=get_engine())
+    try:
+        rows = rebuild_daily_rollup(db, team_id=args.team_id)
+    finally:
+        db.close()
+
+    print(f"team_emotion_daily: {rows} rows written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Fills a database with a synthetic organization: teams with a manager, members, the team emotions,
+daily check-ins over some months and manager feedbacks. Used by the benchmark suite and for
+manual tests with realistic volumes.
+
+    python -m app.scripts.seed --database-url sqlite:///./seed.db --teams 20 --users-per-team 25 --months 12
+
+Every seeded user can log in with the password `SEED_PASSWORD`.
+"""
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.crud.team_emotion_daily_crud import rebuild_daily_rollup
+from app.crud.team_version_crud import bump_catalog_version
+from app.crud.user_crud import get_password_hash
+from app.databases.postgres_database import Base
+from app.schemas.emotion_record_schema import Emotion, EmotionRecord
+from app.schemas.feedback_schema import Feedback
+from app.schemas.team_schema import Team, user_teams
+from app.schemas.user_schema import User
+from app.utils.constants import Role
+
+SEED_PASSWORD = "benchmark"
+
+# (nome, emoji, cor, negativa)
+SEED_EMOTIONS = [
+    ("Feliz", "😀", "#FFD93D", False),
+    ("Animado", "🤩", "#6BCB77", False),
+    ("Calmo", "😌", "#4D96FF", False),
+    ("Grato", "🙏", "#9B72AA", False),
+    ("Cansado", "😴", "#A0A0A0", True),
+    ("Ansioso", "😰", "#FF8C32", True),
+    ("Triste", "😢", "#5C7AEA", True),
+    ("Irritado", "😠", "#FF6B6B", True),
+]
+
+FEEDBACK_MESSAGES = [
+    "Obrigado por compartilhar, vamos conversar?",
+    "Ótimo saber! Continue assim.",
+    "Estou à disposição se precisar de algo.",
+    "Vamos ajustar as prioridades da semana.",
+]
+
+BATCH_SIZE = 10_000
+
+
+@dataclass
+class SeedConfig:
+    teams: int = 5
+    users_per_team: int = 10
+    months: int = 3
+    checkins_per_day: float = 1.0
+    feedback_rate: float = 0.05
+    anonymous_rate: float = 0.2
+    seed: int = 42
+
+
+def seed_database(engine: Engine, config: SeedConfig) -> dict:
+    """
+    Creates the tables if needed and appends a synthetic organization to the database.
+    Returns how many rows of each kind were written.
+    """
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(config.seed)
+    password = get_password_hash(SEED_PASSWORD)
+    days = config.months * 30
+    first_day = date.today() - timedelta(days=days - 1)
+
+    with engine.begin() as connection:
+        # Os IDs vêm do banco (RETURNING), então as sequências do PostgreSQL avançam normalmente;
+        # a contagem de usuários existentes só numera os e-mails para não colidirem entre execuções
+        existing_users = connection.execute(select(func.count()).select_from(User.__table__)).scalar()
+        managers = [_user(f"manager{existing_users + index + 1}", Role.MANAGER, password)
+                    for index in range(config.teams)]
+        manager_ids = _insert_returning_ids(connection, User.__table__, managers)
+        team_ids = _insert_returning_ids(connection, Team.__table__, [
+            {"name": f"Time {existing_users + index + 1}", "manager_id": manager_id, "created_at": datetime.combine(first_day, time(8))}
+            for index, manager_id in enumerate(manager_ids)
+        ])
+        teams = [{"id": team_id, "manager_id": manager_id} for team_id, manager_id in zip(team_ids, manager_ids)]
+
+        employees = [
+            _user(f"employee{existing_users + config.teams + index + 1}", Role.EMPLOYEE, password)
+            for index in range(config.teams * config.users_per_team)
+        ]
+        employee_ids = _insert_returning_ids(connection, User.__table__, employees)
+        team_members = {
+            team_id: employee_ids[index * config.users_per_team:(index + 1) * config.users_per_team]
+            for index, team_id in enumerate(team_ids)
+        }
+        memberships = [{"user_id": user_id, "team_id": team_id}
+                       for team_id, members in team_members.items() for user_id in members]
+        if memberships:
+            connection.execute(insert(user_teams), memberships)
+
+        emotions = [
+            {"name": name, "emoji": emoji, "color": color, "team_id": team_id, "is_negative": is_negative}
+            for team_id in team_ids for name, emoji, color, is_negative in SEED_EMOTIONS
+        ]
+        emotion_ids = _insert_returning_ids(connection, Emotion.__table__, emotions)
+        bump_catalog_version(connection)
+        team_emotions = {
+            team_id: [(emotion_id, is_negative) for emotion_id, (*_, is_negative)
+                      in zip(emotion_ids[index * len(SEED_EMOTIONS):], SEED_EMOTIONS)]
+            for index, team_id in enumerate(team_ids)
+        }
+
+        # Feedbacks pendentes guardam a posição do registro no lote até o INSERT devolver o ID dele
+        records, feedbacks = [], []
+        totals = {"records": 0, "feedbacks": 0}
+        for team in teams:
+            # Cada time tem um "clima" que oscila ao longo do período
+            base_mood = rng.uniform(-0.15, 0.15)
+            for day_offset in range(days):
+                day = first_day + timedelta(days=day_offset)
+                negative_bias = min(max(0.35 + base_mood + 0.15 * rng.uniform(-1, 1), 0.05), 0.9)
+                for user_id in team_members[team["id"]]:
+                    for _ in range(_checkins(rng, config.checkins_per_day)):
+                        emotion_id, is_negative = _pick_emotion(rng, team_emotions[team["id"]], negative_bias)
+                        is_anonymous = rng.random() < config.anonymous_rate
+                        records.append({
+                            "user_id": user_id,
+                            "emotion_id": emotion_id,
+                            "intensity": rng.randint(3, 5) if is_negative else rng.randint(1, 5),
+                            "notes": None if rng.random() < 0.6 else f"Check-in de {day.isoformat()}",
+                            "is_anonymous": is_anonymous,
+                            "created_at": datetime.combine(day, time(rng.randint(8, 19), rng.randint(0, 59))),
+                        })
+                        if rng.random() < config.feedback_rate:
+                            feedbacks.append({
+                                "message": rng.choice(FEEDBACK_MESSAGES),
+                                "emotion_record_id": len(records) - 1,
+                                "manager_id": team["manager_id"],
+                                "is_anonymous": is_anonymous,
+                                "created_at": datetime.combine(day, time(20)),
+                            })
+
+                if len(records) >= BATCH_SIZE:
+                    _flush(connection, records, feedbacks, totals)
+
+        _flush(connection, records, feedbacks, totals)
+
+    with Session(engine) as db:
+        rebuild_daily_rollup(db)
+
+    return {"users": len(managers) + len(employees), "teams": len(teams), "emotions": len(emotions), **totals}
+
+
+def _user(name: str, role: str, password: str) -> dict:
+    return {"name": name.capitalize(), "email": f"{name}@seed.agilemood",
+            "disabled": False, "hashed_password": password, "role": role, "avatar": None}
+
+
+def _checkins(rng: random.Random, per_day: float) -> int:
+    # Parte inteira garantida, parte fracionária como probabilidade de um check-in extra
+    return int(per_day) + (1 if rng.random() < per_day - int(per_day) else 0)
+
+
+def _pick_emotion(rng: random.Random, emotions: list[tuple[int, bool]], negative_bias: float):
+    negative = rng.random() < negative_bias
+    return rng.choice([emotion for emotion in emotions if emotion[1] == negative])
+
+
+def _insert_returning_ids(connection, table, rows: list[dict]) -> list[int]:
+    # Mesma estratégia de emotion_record_crud._insert_returning_ids: ordem garantida pelo SQLAlchemy
+    # no PostgreSQL; no SQLite os IDs de um mesmo INSERT saem crescentes, então basta ordená-los.
+    if not rows:
+        return []
+    if connection.dialect.name == "postgresql":
+        statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        return connection.scalars(statement, rows).all()
+    return sorted(connection.scalars(insert(table).returning(table.c.id), rows).all())
+
+
+def _flush(connection, records: list[dict], feedbacks: list[dict], totals: dict):
+    record_ids = _insert_returning_ids(connection, EmotionRecord.__table__, records)
+    for feedback in feedbacks:
+        feedback["emotion_record_id"] = record_ids[feedback["emotion_record_id"]]
+    if feedbacks:
+        connection.execute(insert(Feedback.__table__), feedbacks)
+
+    totals["records"] += len(records)
+    totals["feedbacks"] += len(feedbacks)
+    records.clear()
+    feedbacks.clear()
+
+
+def main(argv: list[str] | None = None):
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(description="Seeds a database with a synthetic organization.")
+    parser.add_argument("--database-url", default="sqlite:///./seed.db")
+    parser.add_argument("--teams", type=int, default=defaults.teams)
+    parser.add_argument("--users-per-team", type=int, default=defaults.users_per_team)
+    parser.add_argument("--months", type=int, default=defaults.months)
+    parser.add_argument("--checkins-per-day", type=float, default=defaults.checkins_per_day)
+    parser.add_argument("--feedback-rate", type=float, default=defaults.feedback_rate)
+    parser.add_argument("--anonymous-rate", type=float, default=defaults.anonymous_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate every table first")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+
+    config = SeedConfig(**{key: getattr(args, key) for key in asdict(defaults)})
+    summary = seed_database(engine, config)
+    engine.dispose()
+
+    print(", ".join(f"{key}: {value}" for key, value in summary.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,26 @@ class DataBase:
     USER_TABLE_NAME = "user"
     TEAM_TABLE_NAME = "team"
     FEEDBACK_TABLE_NAME = "feedback"
+    TEAM_EMOTION_DAILY_TABLE_NAME = "team_emotion_daily"
+    EMOTION_CATALOG_VERSION_TABLE_NAME = "emotion_catalog_version"
+
+
+class Pagination:
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 500
+
+
+class BulkIngest:
+    MAX_RECORDS = 5000
+
+
+class Analytics:
+    MAX_DAYS = 366
+    ROLLING_WINDOW = 7
+    BASELINE_WINDOW = 28
+    ZSCORE_THRESHOLD = 2.5
+    CHANGE_POINT_WINDOW = 14
+    CHANGE_POINT_THRESHOLD = 1.5
 
 
 class Role:
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterable, Iterator
+
+# Quantidade de linhas agrupadas em cada pedaço enviado ao cliente
+CHUNK_ROWS = 500
+
+
+def csv_chunks(rows: Iterable[dict], columns: list[str]) -> Iterator[str]:
+    """
+    Serializes rows as CSV (header first), yielding a chunk every `CHUNK_ROWS` rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow({key: _csv_value(value) for key, value in row.items()})
+        if count % CHUNK_ROWS == 0:
+            yield _drain(buffer)
+
+    yield _drain(buffer)
+
+
+def ndjson_chunks(rows: Iterable[dict]) -> Iterator[str]:
+    """
+    Serializes rows as newline delimited JSON, yielding a chunk every `CHUNK_ROWS` rows.
+    """
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, default=_json_default, ensure_ascii=False))
+        if len(lines) == CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _drain(buffer: io.StringIO) -> str:
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+def _csv_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
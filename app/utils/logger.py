@@ -1,15 +1,103 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
-# Create a console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
+# Nível configurável por ambiente (DEBUG em desenvolvimento, INFO ou acima em produção)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
+# "json" (padrão) para agregadores de log, "text" para leitura no terminal
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
 
-logger = logging.getLogger('MA')
-logger.setLevel(logging.DEBUG)
+# Amostragem por logger, ex.: "MA.request=0.1,MA=0.5". Avisos e erros nunca são descartados.
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+
+# Atributos padrão de um LogRecord; o resto veio de `extra=` e vai junto no JSON
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line, including the fields passed in `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of the records below WARNING of each configured logger. The rate of the
+    most specific configured name applies ("MA.request" wins over "MA").
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+
+        name = record.name
+        while name:
+            if name in self.rates:
+                return random.random() < self.rates[name]
+            name = name.rpartition(".")[0]
+        return True
 
-logger.addHandler(console_handler)
 
+class _ThreadQueueHandler(QueueHandler):
+    # A fila é consumida por uma thread do mesmo processo: o registro não precisa ser formatado
+    # (nem serializado) aqui, só ter a mensagem fixada antes que os argumentos mudem
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def parse_sampling(value: str) -> dict[str, float]:
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+def _build_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(
+        JsonFormatter() if LOG_FORMAT == "json"
+        else logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    )
+    return handler
+
+
+# Os registros vão para uma fila; a escrita no stream (e a formatação) acontece na thread do listener
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+queue_handler = _ThreadQueueHandler(log_queue)
+queue_handler.addFilter(SamplingFilter(parse_sampling(LOG_SAMPLING)))
+
+listener = QueueListener(log_queue, _build_handler(), respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)
+
+logger = logging.getLogger('MA')
+logger.setLevel(LOG_LEVEL)
 
+logger.addHandler(queue_handler)
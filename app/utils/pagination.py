@@ -0,0 +1,25 @@
+import base64
+import json
+from datetime import datetime
+
+from app.utils.constants import Errors
+
+
+def encode_cursor(created_at: datetime, record_id: int) -> str:
+    """
+    Builds an opaque cursor that points to the (created_at, id) key of the last row of a page.
+    """
+    payload = json.dumps([created_at.isoformat(), record_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Reads a cursor built by `encode_cursor`. Raises `Errors.INVALID_PARAMS` if it was tampered with.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(record_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise Errors.INVALID_PARAMS
@@ -0,0 +1,291 @@
+"""
+Benchmark suite for the API endpoints over seeded databases of several sizes.
+
+    python -m benchmarks.run                          # small and medium, compared with the baseline
+    python -m benchmarks.run --sizes large --iterations 10
+    python -m benchmarks.run --update-baseline        # records the current numbers as the baseline
+
+Each size runs in its own process with DATABASE_URL pointing to a freshly seeded SQLite file (or
+to `--database-url`, which must be an empty database). For every endpoint it records the latency
+percentiles and the number of SQL statements per request, and compares them with
+`benchmarks/baseline.json`.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import date, datetime
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+
+SIZES = {
+    "small": {"teams": 3, "users_per_team": 8, "months": 1},
+    "medium": {"teams": 10, "users_per_team": 20, "months": 6},
+    "large": {"teams": 20, "users_per_team": 25, "months": 12},
+}
+
+
+def endpoint_cases(ids: dict) -> list[dict]:
+    """
+    Requests measured for every size. Deletes are left out so that every iteration sees the same
+    data; writes add a handful of rows per iteration, which does not change the volumes.
+    """
+    team, member, record, emotion = ids["team_id"], ids["member_id"], ids["record_id"], ids["emotion_id"]
+    today = date.today()
+    quarter = f"start_date={date.fromordinal(today.toordinal() - 90)}&end_date={today}"
+    bulk = {"records": [{"emotion_id": emotion, "intensity": 1 + index % 5} for index in range(100)]}
+
+    return [
+        {"name": "POST /user/login", "method": "POST", "path": "/user/login", "auth": None,
+         "data": {"username": ids["member_email"], "password": ids["password"]}},
+        {"name": "GET /user/logged", "method": "GET", "path": "/user/logged", "auth": "member"},
+        {"name": "GET /user/{user_id}", "method": "GET", "path": f"/user/{member}", "auth": None},
+        {"name": "GET /user/?email", "method": "GET", "path": f"/user/?email={ids['member_email']}", "auth": None},
+        {"name": "POST /emotion_record/", "method": "POST", "path": "/emotion_record/", "auth": "member",
+         "json": {"emotion_id": emotion, "intensity": 3}},
+        {"name": "POST /emotion_record/bulk (100)", "method": "POST", "path": "/emotion_record/bulk",
+         "auth": "member", "json": bulk},
+        {"name": "GET /emotion_record/", "method": "GET", "path": "/emotion_record/", "auth": "member"},
+        {"name": "GET /emotion_record/?include_feedbacks", "method": "GET",
+         "path": "/emotion_record/?include_feedbacks=true", "auth": "member"},
+        {"name": "GET /emotion_record/{emotion_name}", "method": "GET", "path": "/emotion_record/Feliz",
+         "auth": "member"},
+        {"name": "GET /emotion_record/id/{record_id}", "method": "GET", "path": f"/emotion_record/id/{record}",
+         "auth": "member"},
+        {"name": "GET /emotions/", "method": "GET", "path": "/emotions/", "auth": "manager"},
+        {"name": "GET /emotions/{emotion_id}", "method": "GET", "path": f"/emotions/{emotion}", "auth": "manager"},
+        {"name": "PUT /emotions/{emotion_id}", "method": "PUT", "path": f"/emotions/{emotion}", "auth": "manager",
+         "json": {"color": "#FFD93D"}},
+        {"name": "GET /teams/", "method": "GET", "path": "/teams/", "auth": "manager"},
+        {"name": "GET /teams/{team_id}", "method": "GET", "path": f"/teams/{team}", "auth": "manager"},
+        {"name": "PUT /teams/{team_id}", "method": "PUT", "path": f"/teams/{team}", "auth": "manager",
+         "json": {"name": f"Time {team}"}},
+        {"name": "GET /teams/{team_id}/emotions", "method": "GET", "path": f"/teams/{team}/emotions",
+         "auth": "member"},
+        {"name": "GET /teams/{team_id}/export", "method": "GET", "path": f"/teams/{team}/export", "auth": "manager"},
+        {"name": "POST /feedback/", "method": "POST", "path": "/feedback/", "auth": "manager",
+         "json": {"message": "Vamos conversar?", "emotion_record_id": record}},
+        {"name": "GET /feedback/", "method": "GET", "path": "/feedback/", "auth": "member"},
+        {"name": "GET /feedback/emotion-record/{id}", "method": "GET", "path": f"/feedback/emotion-record/{record}",
+         "auth": "member"},
+        {"name": "GET /reports/emoji-distribution", "method": "GET",
+         "path": f"/reports/emoji-distribution/{team}?{quarter}", "auth": "manager"},
+        {"name": "GET /reports/average-intensity", "method": "GET",
+         "path": f"/reports/average-intensity/{team}?{quarter}", "auth": "manager"},
+        {"name": "GET /reports/dashboard", "method": "GET", "path": f"/reports/dashboard/{team}?{quarter}",
+         "auth": "manager"},
+        {"name": "GET /reports/trend (week)", "method": "GET", "path": f"/reports/trend/{team}?granularity=week",
+         "auth": "manager"},
+        {"name": "GET /reports/anomalies", "method": "GET", "path": f"/reports/anomalies/{team}", "auth": "manager"},
+        {"name": "GET /reports/user_emotion_analysis", "method": "GET",
+         "path": f"/reports/user_emotion_analysis/{team}/{member}", "auth": "manager"},
+        {"name": "GET /reports/anonymous_records_emotion_analysis", "method": "GET",
+         "path": f"/reports/anonymous_records_emotion_analysis/{team}", "auth": "manager"},
+    ]
+
+
+def run_size(size: str, iterations: int, database_url: str | None) -> dict:
+    """Seeds one database and measures every endpoint against it (runs inside the worker process)."""
+    # Relatórios medidos sem cache: o objetivo é o custo das consultas
+    os.environ["REPORT_CACHE_TTL_SECONDS"] = "0"
+    workdir = tempfile.mkdtemp(prefix=f"agilemood-bench-{size}-")
+    os.environ["DATABASE_URL"] = database_url or f"sqlite:///{workdir}/bench.db"
+
+    from sqlalchemy import event, select
+    from sqlalchemy.orm import Session
+
+    from app.scripts.seed import SEED_PASSWORD, SeedConfig, seed_database
+    from app.databases.postgres_database import get_async_engine, get_engine
+    from app.schemas.emotion_record_schema import Emotion, EmotionRecord
+    from app.schemas.team_schema import Team, user_teams
+    from app.schemas.user_schema import User
+
+    engine, async_engine = get_engine(), get_async_engine()
+    config = SeedConfig(**SIZES[size])
+    seed_started = time.perf_counter()
+    summary = seed_database(engine, config)
+    seed_seconds = time.perf_counter() - seed_started
+
+    with Session(engine) as db:
+        team = db.scalars(select(Team).order_by(Team.id)).first()
+        member_id = db.scalars(
+            select(user_teams.c.user_id).where(user_teams.c.team_id == team.id).order_by(user_teams.c.user_id)
+        ).first()
+        ids = {
+            "team_id": team.id,
+            "member_id": member_id,
+            "member_email": db.get(User, member_id).email,
+            "manager_email": db.get(User, team.manager_id).email,
+            "password": SEED_PASSWORD,
+            "emotion_id": db.scalars(select(Emotion.id).where(Emotion.team_id == team.id).order_by(Emotion.id)).first(),
+            "record_id": db.scalars(
+                select(EmotionRecord.id).where(EmotionRecord.user_id == member_id).order_by(EmotionRecord.id.desc())
+            ).first(),
+        }
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    # Endpoints quebrados entram no resultado como status 500, sem interromper a suíte
+    client = TestClient(app, raise_server_exceptions=False)
+    tokens = {
+        role: client.post("/user/login", data={"username": ids[f"{role}_email"], "password": SEED_PASSWORD})
+        .json()["access_token"]
+        for role in ("member", "manager")
+    }
+
+    statements = [0]
+
+    def count_statement(*args):
+        statements[0] += 1
+
+    for bind in (engine, async_engine.sync_engine):
+        event.listen(bind, "before_cursor_execute", count_statement)
+
+    endpoints = {}
+    for case in endpoint_cases(ids):
+        headers = {"Authorization": f"Bearer {tokens[case['auth']]}"} if case["auth"] else {}
+        request = {key: case[key] for key in ("json", "data") if key in case}
+
+        def send():
+            return client.request(case["method"], case["path"], headers=headers, **request)
+
+        response = send()  # aquecimento (caches do principal, planos do SQLite)
+        timings = []
+        statements[0] = 0
+        for _ in range(iterations):
+            started = time.perf_counter()
+            response = send()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        endpoints[case["name"]] = {
+            "status": response.status_code,
+            "p50_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "queries": round(statements[0] / iterations, 2),
+            "response_bytes": len(response.content),
+        }
+
+    return {"config": asdict(config), "rows": summary, "seed_seconds": round(seed_seconds, 2), "endpoints": endpoints}
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list[str]:
+    """
+    Lists the regressions of `results` against `baseline`: p50 slower than `tolerance` times the
+    baseline (and by more than `min_delta_ms`), more queries per request, or a different status code.
+    """
+    regressions = []
+    for size, current in results.get("sizes", {}).items():
+        previous = baseline.get("sizes", {}).get(size)
+        if previous is None:
+            continue
+
+        for name, now in current["endpoints"].items():
+            before = previous["endpoints"].get(name)
+            if before is None:
+                continue
+
+            label = f"[{size}] {name}"
+            if now["status"] != before["status"]:
+                regressions.append(f"{label}: status {before['status']} -> {now['status']}")
+            if now["queries"] > before["queries"]:
+                regressions.append(f"{label}: queries {before['queries']} -> {now['queries']}")
+            if now["p50_ms"] > before["p50_ms"] * tolerance and now["p50_ms"] - before["p50_ms"] > min_delta_ms:
+                regressions.append(f"{label}: p50 {before['p50_ms']:.1f} ms -> {now['p50_ms']:.1f} ms")
+
+    return regressions
+
+
+def print_table(results: dict, baseline: dict | None):
+    for size, current in results["sizes"].items():
+        previous = (baseline or {}).get("sizes", {}).get(size, {}).get("endpoints", {})
+        rows = current["rows"]
+        print(f"\n== {size}: {rows['records']} records, {rows['feedbacks']} feedbacks, {rows['users']} users ==")
+        print(f"{'endpoint':<48} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'baseline p50':>13}")
+        for name, now in current["endpoints"].items():
+            before = previous.get(name)
+            reference = f"{before['p50_ms']:.2f}" if before else "-"
+            print(f"{name:<48} {now['status']:>6} {now['p50_ms']:>9.2f} {now['p95_ms']:>9.2f} "
+                  f"{now['queries']:>8} {reference:>13}")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Runs the API benchmark suite.")
+    parser.add_argument("--sizes", default="small,medium", help=f"comma separated, among {', '.join(SIZES)}")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--database-url", default=None, help="empty database to seed instead of a SQLite file")
+    parser.add_argument("--output", type=Path, default=None, help="where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed p50 slowdown factor")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        result = run_size(args.worker, args.iterations, args.database_url)
+        args.worker_output.write_text(json.dumps(result))
+        return
+
+    results = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+        },
+        "sizes": {},
+    }
+    for size in [size.strip() for size in args.sizes.split(",") if size.strip()]:
+        if size not in SIZES:
+            parser.error(f"unknown size: {size}")
+
+        # Um processo por tamanho: o app lê o DATABASE_URL na importação
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as output:
+            output_path = Path(output.name)
+        command = [sys.executable, "-m", "benchmarks.run", "--worker", size,
+                   "--iterations", str(args.iterations), "--worker-output", str(output_path)]
+        if args.database_url:
+            command += ["--database-url", args.database_url]
+        print(f"running {size}...", file=sys.stderr)
+        worker = subprocess.run(command, cwd=BENCHMARKS_DIR.parent, capture_output=True, text=True)
+        if worker.returncode != 0:
+            sys.exit(f"benchmark of size {size} failed:\n{worker.stderr[-5000:]}")
+        results["sizes"][size] = json.loads(output_path.read_text())
+        output_path.unlink()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    print_table(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+        print(f"\nbaseline written to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms) if baseline else []
+    if regressions:
+        print("\nregressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    elif baseline:
+        print("\nno regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+CPU spent turning a page of emotion records into the response body, before and after the list
+endpoints started returning trusted rows.
+
+    python -m benchmarks.serialization                  # 10k records, best of 5
+    python -m benchmarks.serialization --records 50000 --repeat 3
+
+`validated` is the previous path: one EmotionRecordInDb per row in the CRUD, FastAPI's
+`response_model` validation and conversion, then the standard JSONResponse. `trusted` is the
+current one: dict rows rendered straight by AppJSONResponse (orjson). No database is involved;
+the rows are built in memory so only serialization is measured.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import AppJSONResponse
+from app.models.emotion_record_model import AllEmotionReportsResponse, EmotionRecordInDb, FeedbackSummary
+
+RESPONSE_FIELD = create_model_field(name="Response", type_=AllEmotionReportsResponse, mode="serialization")
+
+
+def sample_rows(count: int, feedback_rate: float = 0.05, seed: int = 42) -> list[SimpleNamespace]:
+    """Rows with the attributes of the emotion record table, plus their feedbacks."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 8, 0)
+    rows = []
+    for index in range(count):
+        created_at = start + timedelta(minutes=37 * index)
+        feedbacks = [
+            SimpleNamespace(id=index, message="Obrigado por compartilhar, vamos conversar?", is_anonymous=False,
+                            created_at=created_at + timedelta(hours=2), emotion_record_id=index + 1)
+        ] if rng.random() < feedback_rate else []
+        rows.append(SimpleNamespace(
+            id=index + 1, user_id=7, emotion_id=rng.randint(1, 8), intensity=rng.randint(1, 5),
+            notes=None if rng.random() < 0.6 else f"Check-in {index}", is_anonymous=rng.random() < 0.2,
+            created_at=created_at, feedbacks=feedbacks,
+        ))
+    return rows
+
+
+def validated_body(rows: list[SimpleNamespace]) -> bytes:
+    records = [
+        EmotionRecordInDb(
+            id=row.id,
+            user_id=None if row.is_anonymous else row.user_id,
+            emotion_id=row.emotion_id,
+            intensity=row.intensity,
+            notes=row.notes,
+            is_anonymous=row.is_anonymous,
+            created_at=row.created_at,
+            feedbacks=[
+                FeedbackSummary(id=feedback.id, message=feedback.message, is_anonymous=feedback.is_anonymous,
+                                created_at=feedback.created_at, emotion_record_id=feedback.emotion_record_id)
+                for feedback in row.feedbacks
+            ],
+        )
+        for row in rows
+    ]
+    content = asyncio.run(serialize_response(
+        field=RESPONSE_FIELD,
+        response_content=AllEmotionReportsResponse(emotion_records=records, next_cursor=None),
+        is_coroutine=True,
+    ))
+    return JSONResponse(content).body
+
+
+def trusted_body(rows: list[SimpleNamespace]) -> bytes:
+    records = [
+        {
+            "user_id": None if row.is_anonymous else row.user_id,
+            "emotion_id": row.emotion_id,
+            "intensity": row.intensity,
+            "notes": row.notes,
+            "is_anonymous": row.is_anonymous,
+            "id": row.id,
+            "created_at": row.created_at,
+            "feedbacks": [
+                {"id": feedback.id, "message": feedback.message, "is_anonymous": feedback.is_anonymous,
+                 "created_at": feedback.created_at, "emotion_record_id": feedback.emotion_record_id}
+                for feedback in row.feedbacks
+            ],
+        }
+        for row in rows
+    ]
+    return AppJSONResponse({"emotion_records": records, "next_cursor": None}).body
+
+
+def measure(records: int, repeat: int) -> dict:
+    """Best CPU time (process_time) of each path, in milliseconds."""
+    rows = sample_rows(records)
+    result = {"records": records}
+    for name, build in (("validated", validated_body), ("trusted", trusted_body)):
+        timings = []
+        for _ in range(repeat):
+            start = time.process_time()
+            body = build(rows)
+            timings.append(time.process_time() - start)
+        result[f"{name}_ms"] = round(min(timings) * 1000, 1)
+        result[f"{name}_bytes"] = len(body)
+    result["saved_ms_per_10k"] = round((result["validated_ms"] - result["trusted_ms"]) * 10_000 / records, 1)
+    return result
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Measures the serialization of the emotion record list.")
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(measure(args.records, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
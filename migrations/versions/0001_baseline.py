@@ -0,0 +1,117 @@
+"""Baseline schema
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+Creates the schema that `Base.metadata.create_all` used to build. Tables that already exist are
+skipped, so databases created before the migrations can be upgraded in place.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "user" not in existing_tables:
+        op.create_table(
+            "user",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("disabled", sa.Boolean(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("role", sa.String(), nullable=False),
+            sa.Column("avatar", sa.String(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("email"),
+        )
+        op.create_index("ix_user_id", "user", ["id"])
+
+    if "team" not in existing_tables:
+        op.create_table(
+            "team",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("manager_id", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["manager_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_team_id", "team", ["id"])
+
+    if "user_teams" not in existing_tables:
+        op.create_table(
+            "user_teams",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("team_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("user_id", "team_id"),
+        )
+
+    if "emotion" not in existing_tables:
+        op.create_table(
+            "emotion",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("emoji", sa.String(), nullable=True),
+            sa.Column("color", sa.String(), nullable=True),
+            sa.Column("team_id", sa.Integer(), nullable=False),
+            sa.Column("is_negative", sa.Boolean(), nullable=False),
+            sa.ForeignKeyConstraint(["team_id"], ["team.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_emotion_id", "emotion", ["id"])
+
+    if "emotion_record" not in existing_tables:
+        op.create_table(
+            "emotion_record",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=True),
+            sa.Column("emotion_id", sa.Integer(), nullable=False),
+            sa.Column("intensity", sa.Integer(), nullable=False),
+            sa.Column("notes", sa.String(), nullable=True),
+            sa.Column("is_anonymous", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["emotion_id"], ["emotion.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_emotion_record_id", "emotion_record", ["id"])
+
+    if "feedback" not in existing_tables:
+        op.create_table(
+            "feedback",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("message", sa.String(), nullable=False),
+            sa.Column("emotion_record_id", sa.Integer(), nullable=False),
+            sa.Column("manager_id", sa.Integer(), nullable=False),
+            sa.Column("is_anonymous", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["emotion_record_id"], ["emotion_record.id"]),
+            sa.ForeignKeyConstraint(["manager_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_feedback_id", "feedback", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("feedback")
+    op.drop_table("emotion_record")
+    op.drop_table("emotion")
+    op.drop_table("user_teams")
+    op.drop_table("team")
+    op.drop_table("user")
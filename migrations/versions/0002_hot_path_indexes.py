@@ -0,0 +1,51 @@
+"""Hot path indexes
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 09:30:00
+
+Indexes matched to the queries in emotion_record_crud, team_crud, feedback_crud and reports_crud.
+`if_not_exists` keeps the migration safe on databases where `create_all` already built them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_hot_path_indexes"
+down_revision: Union[str, Sequence[str], None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /emotion_record/ e visão do time: filtro por usuário, ordenado por (created_at, id)
+    op.create_index(
+        "ix_emotion_record_user_id_created_at",
+        "emotion_record",
+        ["user_id", "created_at", "id"],
+        if_not_exists=True,
+    )
+    # Relatórios: join emotion -> emotion_record com filtro de data
+    op.create_index(
+        "ix_emotion_record_emotion_id_created_at",
+        "emotion_record",
+        ["emotion_id", "created_at"],
+        if_not_exists=True,
+    )
+    op.create_index("ix_emotion_team_id", "emotion", ["team_id"], if_not_exists=True)
+    op.create_index("ix_feedback_emotion_record_id", "feedback", ["emotion_record_id"], if_not_exists=True)
+    op.create_index("ix_user_teams_team_id", "user_teams", ["team_id", "user_id"], if_not_exists=True)
+    op.create_index("ix_team_manager_id", "team", ["manager_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_team_manager_id", table_name="team")
+    op.drop_index("ix_user_teams_team_id", table_name="user_teams")
+    op.drop_index("ix_feedback_emotion_record_id", table_name="feedback")
+    op.drop_index("ix_emotion_team_id", table_name="emotion")
+    op.drop_index("ix_emotion_record_emotion_id_created_at", table_name="emotion_record")
+    op.drop_index("ix_emotion_record_user_id_created_at", table_name="emotion_record")
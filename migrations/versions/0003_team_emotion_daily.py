@@ -0,0 +1,58 @@
+"""Team emotion daily rollup
+
+Revision ID: 0003_team_emotion_daily
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-18 11:00:00
+
+Creates the `team_emotion_daily` rollup read by the team reports and fills it from the existing
+emotion records. The same backfill can be run later with `python -m app.scripts.backfill_team_emotion_daily`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_team_emotion_daily"
+down_revision: Union[str, Sequence[str], None] = "0002_hot_path_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "team_emotion_daily" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "team_emotion_daily",
+            sa.Column("team_id", sa.Integer(), nullable=False),
+            sa.Column("emotion_id", sa.Integer(), nullable=False),
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.Column("intensity_sum", sa.Integer(), nullable=False),
+            sa.Column("negative_count", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["emotion_id"], ["emotion.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["team_id"], ["team.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("team_id", "emotion_id", "day"),
+        )
+    op.create_index(
+        "ix_team_emotion_daily_team_id_day", "team_emotion_daily", ["team_id", "day"], if_not_exists=True
+    )
+
+    # Backfill: refaz o rollup a partir dos registros existentes
+    op.execute("DELETE FROM team_emotion_daily")
+    op.execute(
+        """
+        INSERT INTO team_emotion_daily (team_id, emotion_id, day, count, intensity_sum, negative_count)
+        SELECT emotion.team_id, emotion.id, date(emotion_record.created_at), count(emotion_record.id),
+               sum(emotion_record.intensity), sum(CASE WHEN emotion.is_negative THEN 1 ELSE 0 END)
+        FROM emotion JOIN emotion_record ON emotion_record.emotion_id = emotion.id
+        WHERE emotion_record.created_at IS NOT NULL
+        GROUP BY emotion.team_id, emotion.id, date(emotion_record.created_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("team_emotion_daily")
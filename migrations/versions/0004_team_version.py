@@ -0,0 +1,34 @@
+"""Team version counter
+
+Revision ID: 0004_team_version
+Revises: 0003_team_emotion_daily
+Create Date: 2026-10-18 12:00:00
+
+Adds `team.version`, incremented by every write that changes what the team routes return and used
+to build their ETags.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_team_version"
+down_revision: Union[str, Sequence[str], None] = "0003_team_emotion_daily"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("team")}
+    if "version" not in columns:
+        with op.batch_alter_table("team") as batch_op:
+            batch_op.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("team") as batch_op:
+        batch_op.drop_column("version")
@@ -0,0 +1,37 @@
+"""Emotion catalog version
+
+Revision ID: 0005_emotion_catalog_version
+Revises: 0004_team_version
+Create Date: 2026-10-18 13:00:00
+
+Adds `emotion_catalog_version`, a single-row counter incremented only by emotion writes and used to
+build the ETag of the emotion lists, so check-ins no longer change it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_emotion_catalog_version"
+down_revision: Union[str, Sequence[str], None] = "0004_team_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "emotion_catalog_version" not in sa.inspect(op.get_bind()).get_table_names():
+        table = op.create_table(
+            "emotion_catalog_version",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.bulk_insert(table, [{"id": 1, "version": 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("emotion_catalog_version")
@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+
+from app.core import analytics
+from app.utils.constants import Analytics
+
+
+def _mood_series(teams: int, days: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, 12, size=(teams, days)).astype(float)
+    intensity_sums = counts * rng.normal(3.0, 0.4, size=(teams, days))
+    negative_counts = np.floor(counts * rng.uniform(0, 0.4, size=(teams, days)))
+    return counts, intensity_sums, negative_counts
+
+
+def _analyze(counts, intensity_sums, negative_counts):
+    return analytics.analyze_mood_series(
+        counts,
+        intensity_sums,
+        negative_counts,
+        rolling_window=Analytics.ROLLING_WINDOW,
+        baseline_window=Analytics.BASELINE_WINDOW,
+        zscore_threshold=Analytics.ZSCORE_THRESHOLD,
+        change_point_window=Analytics.CHANGE_POINT_WINDOW,
+        change_point_threshold=Analytics.CHANGE_POINT_THRESHOLD,
+    )
+
+
+def test_rolling_ratio_weights_days_by_record_count():
+    counts = np.array([1, 3, 0, 2])
+    intensity_sums = np.array([5, 3, 0, 8])
+
+    rolling = analytics.rolling_ratio(intensity_sums, counts, window=2)
+
+    assert np.isnan(rolling[0])
+    np.testing.assert_allclose(rolling[1:], [8 / 4, 3 / 3, 8 / 2])
+
+
+def test_zscores_flag_a_spike_against_the_previous_days():
+    values = np.tile([2.0, 2.5, 3.0, 2.5], 10)
+    values[30] = 5.0
+    values[12] = np.nan
+
+    scores = analytics.zscores(values, baseline_window=28)
+
+    assert np.isnan(scores[:7]).all()
+    assert np.isnan(scores[12])
+    assert scores[30] > 5
+    assert np.nanmax(np.abs(np.delete(scores, 30))) < 2
+
+
+def test_change_points_mark_one_day_per_level_shift():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.normal(2.0, 0.2, 60), rng.normal(4.0, 0.2, 60)])
+
+    flags = analytics.change_points(values, window=14, threshold=1.5)
+
+    assert np.flatnonzero(flags).tolist() == [60]
+
+
+def test_analysis_of_many_teams_matches_the_analysis_of_each_team():
+    counts, intensity_sums, negative_counts = _mood_series(teams=3, days=120)
+
+    batch = _analyze(counts, intensity_sums, negative_counts)
+    single = _analyze(counts[1], intensity_sums[1], negative_counts[1])
+
+    for name, values in single.items():
+        np.testing.assert_array_equal(batch[name][1], values)
+
+
+def test_benchmark_a_year_of_daily_data_for_hundreds_of_teams():
+    counts, intensity_sums, negative_counts = _mood_series(teams=500, days=365)
+    _analyze(counts[:1], intensity_sums[:1], negative_counts[:1])  # aquecimento
+
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        result = _analyze(counts, intensity_sums, negative_counts)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    assert result["intensity_zscore"].shape == (500, 365)
+    assert best < 0.25, f"analyze_mood_series: 500 teams x 365 days in {best * 1000:.1f} ms"
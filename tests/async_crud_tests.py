@@ -0,0 +1,85 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.crud import async_emotion_crud, async_emotion_record_crud, async_team_crud
+from app.databases import postgres_database
+from app.databases.postgres_database import get_async_db
+from app.models.emotion_record_model import BulkEmotionRecord, EmotionRecord
+from app.models.team_model import TeamRole
+from app.schemas.team_schema import user_teams
+
+
+@pytest.fixture
+def run_async(db, monkeypatch):
+    """
+    Runs `call(session)` with a session from get_async_db, whose engine is an aiosqlite one
+    pointing to the database of the `db` fixture.
+    """
+    db.execute(user_teams.insert().values(user_id=2, team_id=1))
+    db.commit()
+
+    def run(call):
+        async def main():
+            engine = create_async_engine(db.get_bind().url.set(drivername="sqlite+aiosqlite"))
+            monkeypatch.setattr(postgres_database, "_async_engine", engine)
+            try:
+                async with aclosing(get_async_db()) as sessions:
+                    return await call(await anext(sessions))
+            finally:
+                # As conexões pertencem a este event loop
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_async_team_crud_reads_the_team(run_async):
+    async def call(db):
+        return (
+            await async_team_crud.get_team_by_id(db, 1, limit=10),
+            await async_team_crud.get_team_role(db, 1, 1),
+            await async_team_crud.get_team_role(db, 1, 2),
+            await async_team_crud.get_team_version(db, 1),
+        )
+
+    team, manager_role, member_role, version = run_async(call)
+
+    assert team["team_data"].name == "Team"
+    assert [member.id for member in team["members"]] == [2]
+    assert team["emotions_reports"] == []
+    assert (manager_role, member_role) == (TeamRole.MANAGER, TeamRole.MEMBER)
+    assert version == 1
+
+
+def test_async_emotion_crud_lists_the_team_emotions(run_async):
+    async def call(db):
+        return await async_emotion_crud.get_emotions_by_team(db, 1)
+
+    assert sorted(emotion.name for emotion in run_async(call)) == ["Feliz", "Triste"]
+
+
+def test_async_emotion_record_crud_writes_and_reads_records(run_async):
+    async def call(db):
+        created = await async_emotion_record_crud.create_emotion_record(
+            db, EmotionRecord(user_id=2, emotion_id=1, intensity=4, notes="Bom dia")
+        )
+        bulk = await async_emotion_record_crud.create_emotion_records_bulk(db, [
+            BulkEmotionRecord(user_id=2, emotion_id=2, intensity=3),
+            BulkEmotionRecord(user_id=2, emotion_id=99, intensity=3),
+        ])
+        records, next_cursor = await async_emotion_record_crud.get_emotion_records_by_user_id(
+            db, [2], for_team=True, team_id=1, limit=10
+        )
+        return created, bulk, records, next_cursor, await async_team_crud.get_team_version(db, 1)
+
+    created, bulk, records, next_cursor, version = run_async(call)
+
+    assert created.id is not None and created.notes == "Bom dia"
+    assert [result.status for result in bulk] == ["created", "rejected"]
+    assert sorted(record["id"] for record in records) == sorted([created.id, bulk[0].id])
+    assert next_cursor is None
+    assert version == 3
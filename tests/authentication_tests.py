@@ -0,0 +1,115 @@
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+import asyncio
+import time
+
+import httpx
+
+from app.main import app
+from app.core.principal_cache import principal_cache
+from app.crud import user_crud
+from app.models.user_model import UserInDB
+from app.utils.cache import TTLCache
+from app.utils.constants import Role
+from app.routers import authentication
+from app.routers.authentication import create_access_token
+
+client = TestClient(app)
+
+logged_user = UserInDB(
+    id=1,
+    name="User",
+    email="user@example.com",
+    disabled=False,
+    role=Role.EMPLOYEE,
+    hashed_password="x",
+)
+
+
+def test_principal_is_cached_between_requests():
+    token = create_access_token({"sub": logged_user.email})
+    with patch("app.crud.user_crud.get_user_by_email", return_value=logged_user) as mock_get_user, \
+         patch("app.crud.user_crud.get_user_team", return_value=None):
+        for _ in range(3):
+            response = client.get("/user/logged", headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200
+
+        assert mock_get_user.call_count == 1
+        assert principal_cache.stats()["hits"] >= 2
+
+
+def test_update_user_invalidates_cached_principal():
+    token = create_access_token({"sub": logged_user.email})
+    disabled_user = logged_user.model_copy(update={"disabled": True})
+    with patch("app.crud.user_crud.get_user_by_email", return_value=logged_user), \
+         patch("app.crud.user_crud.get_user_team", return_value=None):
+        assert client.get("/user/logged", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    db_user = MagicMock(email=logged_user.email)
+    mock_db = MagicMock()
+    mock_db.query.return_value.filter.return_value.first.return_value = db_user
+    user_crud.update_user(mock_db, logged_user.id, {"disabled": True})
+
+    with patch("app.crud.user_crud.get_user_by_email", return_value=disabled_user):
+        response = client.get("/user/logged", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 404
+
+
+def test_admin_metrics_exposes_principal_cache_stats(api_client):
+    manager = {"Authorization": f"Bearer {create_access_token({'sub': 'manager@example.com'})}"}
+    response = api_client.get("/admin/metrics", headers=manager)
+    assert response.status_code == 200
+    assert {"hits", "misses", "size"} <= response.json()["principal_cache"].keys()
+
+
+def test_admin_metrics_require_a_manager_or_the_metrics_token(api_client, monkeypatch):
+    employee = {"Authorization": f"Bearer {create_access_token({'sub': 'employee@example.com'})}"}
+    assert api_client.get("/admin/metrics").status_code == 401
+    assert api_client.get("/admin/metrics", headers=employee).status_code == 403
+
+    monkeypatch.setattr(authentication, "METRICS_TOKEN", "scraper-secret")
+    assert api_client.get("/admin/metrics", headers={"Authorization": "Bearer scraper-secret"}).status_code == 200
+    assert api_client.get("/admin/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_ttl_cache_expires_and_evicts():
+    cache = TTLCache(max_size=2, ttl_seconds=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+    time.sleep(0.06)
+    assert cache.get("c") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_concurrent_requests_do_not_queue_behind_user_lookup():
+    """Carga: a busca do usuário no banco não pode bloquear o event loop e serializar as requisições."""
+    db_latency = 0.2
+    concurrent_requests = 10
+
+    def slow_get_user_by_email(db, email):
+        time.sleep(db_latency)  # simula um round trip lento ao banco
+        return logged_user.model_copy(update={"email": email})
+
+    async def fire_requests():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            tokens = [
+                create_access_token({"sub": f"user{i}@example.com"}) for i in range(concurrent_requests)
+            ]
+            return await asyncio.gather(*[
+                async_client.get("/user/logged", headers={"Authorization": f"Bearer {token}"})
+                for token in tokens
+            ])
+
+    with patch("app.crud.user_crud.get_user_by_email", side_effect=slow_get_user_by_email), \
+         patch("app.crud.user_crud.get_user_team", return_value=None):
+        start = time.perf_counter()
+        responses = asyncio.run(fire_requests())
+        elapsed = time.perf_counter() - start
+
+    assert all(response.status_code == 200 for response in responses)
+    # Serializadas levariam concurrent_requests * db_latency (2s)
+    assert elapsed < concurrent_requests * db_latency / 3
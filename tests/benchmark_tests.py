@@ -0,0 +1,51 @@
+import json
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.scripts.seed import SeedConfig, seed_database
+from app.schemas.emotion_record_schema import EmotionRecord, TeamEmotionDaily
+from app.schemas.feedback_schema import Feedback
+from benchmarks.run import compare
+from benchmarks.serialization import sample_rows, trusted_body, validated_body
+
+
+def test_seed_database_builds_a_consistent_organization(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    config = SeedConfig(teams=2, users_per_team=3, months=1, checkins_per_day=1.5, feedback_rate=0.2)
+
+    summary = seed_database(engine, config)
+    again = seed_database(engine, config)
+
+    assert summary["users"] == again["users"] == 2 * (1 + 3)
+    assert summary["records"] == again["records"]
+    assert 30 * 6 <= summary["records"] <= 30 * 6 * 2
+    with Session(engine) as db:
+        assert db.scalar(select(func.count(EmotionRecord.id))) == 2 * summary["records"]
+        assert db.scalar(select(func.count(Feedback.id))) == summary["feedbacks"] + again["feedbacks"]
+        assert db.scalar(select(func.sum(TeamEmotionDaily.count))) == 2 * summary["records"]
+    engine.dispose()
+
+
+def test_compare_reports_slower_endpoints_and_extra_queries():
+    def results(p50, queries, status=200):
+        endpoint = {"status": status, "p50_ms": p50, "queries": queries}
+        return {"sizes": {"small": {"endpoints": {"GET /teams/{team_id}": endpoint}}}}
+
+    baseline = results(10.0, 3)
+
+    assert compare(results(14.0, 3), baseline, tolerance=1.5, min_delta_ms=2.0) == []
+    assert compare(results(11.5, 3), results(5.0, 3), tolerance=1.5, min_delta_ms=2.0) == [
+        "[small] GET /teams/{team_id}: p50 5.0 ms -> 11.5 ms"
+    ]
+    assert compare(results(10.0, 4), baseline, tolerance=1.5, min_delta_ms=2.0) == [
+        "[small] GET /teams/{team_id}: queries 3 -> 4"
+    ]
+    assert compare(results(10.0, 3, status=500), baseline, tolerance=1.5, min_delta_ms=2.0) == [
+        "[small] GET /teams/{team_id}: status 200 -> 500"
+    ]
+
+
+def test_trusted_rows_render_the_same_json_as_the_validated_path():
+    rows = sample_rows(200, feedback_rate=0.3)
+    assert json.loads(trusted_body(rows)) == json.loads(validated_body(rows))
@@ -0,0 +1,106 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.principal_cache import principal_cache
+from app.core.report_cache import report_cache
+from app.core.request_metrics import instrument_engine
+from app.databases import postgres_database
+from app.databases.postgres_database import Base, get_async_db, get_db
+from app.main import app
+from app.schemas.emotion_record_schema import Emotion
+from app.schemas.team_schema import Team
+from app.schemas.user_schema import User
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    # Os testes trocam o usuário retornado por get_user_by_email a cada caso
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_report_cache():
+    # Cada teste usa o seu próprio banco, com os mesmos IDs de time
+    report_cache.clear()
+    yield
+    report_cache.clear()
+
+
+@pytest.fixture
+def db(tmp_path):
+    # Banco SQLite real com um gerente (1), um colaborador (2), um time (1) e duas emoções
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+
+    manager = User(id=1, name="Manager", email="manager@example.com", hashed_password="x", role="manager")
+    employee = User(id=2, name="Employee", email="employee@example.com", hashed_password="x", role="employee")
+    team = Team(id=1, name="Team", manager_id=1)
+    session.add_all([manager, employee, team])
+    session.add_all([
+        Emotion(id=1, name="Feliz", emoji="😀", team_id=1, is_negative=False),
+        Emotion(id=2, name="Triste", emoji="😢", team_id=1, is_negative=True),
+    ])
+    session.commit()
+
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def api_client(db, monkeypatch):
+    """TestClient whose sync and async sessions both point to the database of the `db` fixture."""
+    # A inicialização do app não deve criar tabelas nem abrir conexões no banco padrão
+    monkeypatch.setattr(postgres_database, "CREATE_SCHEMA_ON_STARTUP", False)
+    monkeypatch.setattr(postgres_database, "POOL_WARMUP_CONNECTIONS", 0)
+    url = db.get_bind().url
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(url.set(drivername="sqlite+aiosqlite"))
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    session_factory = sessionmaker(autoflush=False, bind=engine)
+    async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+        # As conexões assíncronas pertencem ao event loop do TestClient
+        client.portal.call(async_engine.dispose)
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Asserts that a response ran at most `max_statements` SQL statements (X-DB-Statements header),
+    so an endpoint that regresses to one query per row fails its test.
+    """
+
+    def check(response, max_statements: int) -> int:
+        statements = int(response.headers["x-db-statements"])
+        assert statements <= max_statements, (
+            f"{response.request.method} {response.request.url.path} ran {statements} SQL statements, "
+            f"budget is {max_statements}"
+        )
+        return statements
+
+    return check
@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+from unittest.mock import patch
+
+from app.main import app
+from app.databases import postgres_database
+from app.databases.pool_metrics import InstrumentedQueuePool, instrument_pool
+from app.models.user_model import UserInDB
+from app.routers.authentication import create_access_token
+from app.utils.constants import Role
+
+client = TestClient(app)
+
+MANAGER = UserInDB(id=1, name="Manager", email="manager@example.com", disabled=False, role=Role.MANAGER,
+                   hashed_password="x")
+
+
+def test_pool_metrics_record_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics = instrument_pool(engine.pool, "test")
+
+    with engine.connect():
+        assert metrics.snapshot()["in_use"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["timeouts"] == 1
+    assert snapshot["checkouts"] == 1
+    assert snapshot["in_use"] == 0
+    assert snapshot["checkout_seconds_max"] >= 0.05
+    engine.dispose()
+
+
+def test_admin_metrics_exposes_pool_telemetry():
+    # Os engines são criados no primeiro uso; este TestClient não roda o lifespan
+    postgres_database.get_engine()
+    postgres_database.get_async_engine()
+    token = create_access_token({"sub": "manager@example.com"})
+    with patch("app.crud.user_crud.get_user_by_email", return_value=MANAGER):
+        response = client.get("/admin/metrics", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    pools = response.json()["pool"]
+    assert {"sync", "async"} <= pools.keys()
+    assert {"in_use", "timeouts", "checkout_seconds_avg"} <= pools["sync"].keys()
+    assert pools["async"]["created"] is True
+
+
+def test_pools_not_created_yet_are_reported(monkeypatch):
+    monkeypatch.setattr(postgres_database, "pool_metrics", {})
+    assert postgres_database.pool_snapshots() == {"sync": {"created": False}, "async": {"created": False}}
@@ -4,13 +4,21 @@ from datetime import datetime
 
 from app.main import app
 from app.models.user_model import UserInDB
+from sqlalchemy import event
+
+from app.crud import emotion_record_crud
 from app.models.emotion_record_model import (
+    BulkEmotionRecord,
+    BulkEmotionRecordResult,
     EmotionRecordWithEmotion,
     IntensityEnum,
 )
+from app.schemas.emotion_record_schema import EmotionRecord, TeamEmotionDaily
+from app.schemas.feedback_schema import Feedback
 from app.models.emotion_model import EmotionInDb
-from app.utils.constants import Role
+from app.utils.constants import BulkIngest, Role
 from app.routers.authentication import create_access_token
+from app.utils.pagination import encode_cursor
 
 client = TestClient(app)
 
@@ -52,13 +60,161 @@ def test_get_emotion_record_by_id():
         assert body["emotion"]["name"] == "Happy"
 
 
-def test_get_emotion_record_by_id_not_found():
+def test_get_emotion_record_by_id_not_found(api_client):
     token = create_access_token({"sub": logged_user.email})
     with patch("app.crud.user_crud.get_user_by_email", return_value=logged_user), patch(
         "app.routers.emotion_record_router.emotion_record_crud.get_emotion_record_by_id",
         return_value=None,
     ):
-        response = client.get(
+        response = api_client.get(
             "/emotion_record/id/1", headers={"Authorization": f"Bearer {token}"}
         )
         assert response.status_code == 404
+
+
+def test_get_all_emotion_records_returns_next_cursor():
+    token = create_access_token({"sub": logged_user.email})
+    with patch("app.crud.user_crud.get_user_by_email", return_value=logged_user), patch(
+        "app.routers.emotion_record_router.emotion_record_crud.get_emotion_records_by_user_id",
+        return_value=([mock_record], "next-page"),
+    ) as mock_get_records:
+        response = client.get(
+            "/emotion_record/?limit=1", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["next_cursor"] == "next-page"
+        assert [record["id"] for record in body["emotion_records"]] == [1]
+        assert mock_get_records.call_args.kwargs["limit"] == 1
+        assert mock_get_records.call_args.kwargs["after"] is None
+
+
+def test_get_all_emotion_records_follows_cursor():
+    token = create_access_token({"sub": logged_user.email})
+    cursor = encode_cursor(mock_record.created_at, mock_record.id)
+    with patch("app.crud.user_crud.get_user_by_email", return_value=logged_user), patch(
+        "app.routers.emotion_record_router.emotion_record_crud.get_emotion_records_by_user_id",
+        return_value=([], None),
+    ) as mock_get_records:
+        response = client.get(
+            f"/emotion_record/?cursor={cursor}", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] is None
+        assert mock_get_records.call_args.kwargs["after"] == (mock_record.created_at, mock_record.id)
+
+
+def test_get_all_emotion_records_invalid_cursor():
+    token = create_access_token({"sub": logged_user.email})
+    with patch("app.crud.user_crud.get_user_by_email", return_value=logged_user):
+        response = client.get(
+            "/emotion_record/?cursor=not-a-cursor", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 422
+
+
+def test_create_emotion_records_bulk_sets_owner_and_counts_results():
+    token = create_access_token({"sub": logged_user.email})
+    results = [
+        BulkEmotionRecordResult(index=0, status="created", id=10),
+        BulkEmotionRecordResult(index=1, status="rejected", error="Emotion not found"),
+    ]
+    with patch("app.crud.user_crud.get_user_by_email", return_value=logged_user), patch(
+        "app.routers.emotion_record_router.emotion_record_crud.create_emotion_records_bulk",
+        return_value=results,
+    ) as mock_bulk:
+        response = client.post(
+            "/emotion_record/bulk",
+            json={"records": [{"emotion_id": 2, "intensity": 3}, {"emotion_id": 99, "intensity": 1}]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["created"], body["rejected"]) == (1, 1)
+        assert body["results"][0]["id"] == 10
+        assert all(record.user_id == logged_user.id for record in mock_bulk.call_args.args[1])
+
+
+def test_create_emotion_records_bulk_rejects_oversized_batches():
+    token = create_access_token({"sub": logged_user.email})
+    records = [{"emotion_id": 2, "intensity": 3}] * (BulkIngest.MAX_RECORDS + 1)
+    with patch("app.crud.user_crud.get_user_by_email", return_value=logged_user):
+        response = client.post(
+            "/emotion_record/bulk", json={"records": records}, headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 422
+
+
+def test_bulk_crud_inserts_thousands_of_records_in_one_transaction(db):
+    records = [
+        BulkEmotionRecord(user_id=2, emotion_id=1 + index % 2, intensity=1 + index % 5)
+        for index in range(3000)
+    ]
+    records.insert(10, BulkEmotionRecord(user_id=2, emotion_id=99, intensity=3))
+    records.append(BulkEmotionRecord(user_id=2, emotion_id=2, intensity=5, created_at=datetime(2024, 5, 1, 8)))
+
+    statements = []
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    results = emotion_record_crud.create_emotion_records_bulk(db, records)
+
+    assert len(results) == len(records)
+    assert results[10].status == "rejected" and results[10].id is None
+    created = [result for result in results if result.status == "created"]
+    assert len(created) == 3001
+    assert len({result.id for result in created}) == 3001
+
+    stored = db.get(EmotionRecord, results[0].id)
+    assert (stored.emotion_id, stored.intensity) == (1, 1)
+    assert db.get(EmotionRecord, results[-1].id).created_at == datetime(2024, 5, 1, 8)
+
+    assert sum(row.count for row in db.query(TeamEmotionDaily).all()) == 3001
+    # Validação, inserts em lote e rollup; nada por registro
+    assert len(statements) < 20
+
+
+def test_get_emotion_record_by_id_loads_record_emotion_and_feedbacks_in_one_query(db):
+    record = EmotionRecord(user_id=2, emotion_id=1, intensity=4, is_anonymous=True)
+    db.add(record)
+    db.flush()
+    db.add_all([
+        Feedback(message="Primeiro", emotion_record_id=record.id, manager_id=1, is_anonymous=False),
+        Feedback(message="Segundo", emotion_record_id=record.id, manager_id=1, is_anonymous=False),
+    ])
+    db.commit()
+    record_id = record.id
+    db.expunge_all()
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    result = emotion_record_crud.get_emotion_record_by_id(db, record_id, user_id=2, include_feedbacks=True)
+
+    assert len(statements) == 1
+    assert result.emotion.name == "Feliz"
+    assert result.user_id is None  # Anônimo, mesmo para o dono
+    assert [feedback.message for feedback in result.feedbacks] == ["Primeiro", "Segundo"]
+    assert emotion_record_crud.get_emotion_record_by_id(db, record_id, user_id=2).feedbacks == []
+    assert emotion_record_crud.get_emotion_record_by_id(db, record_id, user_id=1) is None
+
+
+def test_record_listings_load_feedbacks_with_a_fixed_number_of_queries(db, monkeypatch):
+    for index in range(5):
+        record = EmotionRecord(user_id=2, emotion_id=1, intensity=3)
+        db.add(record)
+        db.flush()
+        db.add(Feedback(message=f"Feedback {index}", emotion_record_id=record.id, manager_id=1, is_anonymous=False))
+    db.commit()
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    records, _ = emotion_record_crud.get_emotion_records_by_user_id(db, [2], include_feedbacks=True, limit=10)
+    assert len(statements) == 2  # registros + feedbacks, independente da quantidade
+    assert all(len(record["feedbacks"]) == 1 for record in records)
+
+    # Listagem sem paginação: o IN é dividido em lotes, uma consulta por lote
+    statements.clear()
+    monkeypatch.setattr(emotion_record_crud, "FEEDBACK_LOOKUP_BATCH_SIZE", 2)
+    records = emotion_record_crud.get_emotion_records_by_user_id_and_emotion_id(db, 2, 1, include_feedbacks=True)
+    assert len(statements) == 1 + 3
+    assert sorted(record["feedbacks"][0]["message"] for record in records) == [f"Feedback {index}" for index in range(5)]
@@ -0,0 +1,20 @@
+from app.routers.authentication import create_access_token
+
+MANAGER = {"Authorization": f"Bearer {create_access_token({'sub': 'manager@example.com'})}"}
+EMPLOYEE = {"Authorization": f"Bearer {create_access_token({'sub': 'employee@example.com'})}"}
+
+
+def test_manager_can_get_emotion_by_id(api_client):
+    response = api_client.get("/emotions/1", headers=MANAGER)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Feliz"
+    assert response.json()["team_id"] == 1
+
+
+def test_employee_cannot_get_emotion_by_id(api_client):
+    assert api_client.get("/emotions/1", headers=EMPLOYEE).status_code == 403
+
+
+def test_get_missing_emotion(api_client):
+    assert api_client.get("/emotions/999", headers=MANAGER).status_code == 404
@@ -0,0 +1,84 @@
+import pytest
+
+from app.routers.authentication import create_access_token
+from app.schemas.team_schema import user_teams
+
+MANAGER = {"Authorization": f"Bearer {create_access_token({'sub': 'manager@example.com'})}"}
+EMPLOYEE = {"Authorization": f"Bearer {create_access_token({'sub': 'employee@example.com'})}"}
+
+
+@pytest.fixture
+def team(db):
+    db.execute(user_teams.insert().values(user_id=2, team_id=1))
+    db.commit()
+    return db
+
+
+@pytest.mark.parametrize(
+    "path, headers",
+    [
+        ("/teams/1", MANAGER),
+        ("/teams/1/emotions", EMPLOYEE),
+        ("/emotions/", EMPLOYEE),
+        ("/reports/dashboard/1", MANAGER),
+        ("/reports/trend/1?granularity=week", MANAGER),
+    ],
+)
+def test_unchanged_resources_answer_304(api_client, team, path, headers):
+    first = api_client.get(path, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = api_client.get(path, headers={**headers, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    # Sem a consulta pesada: só autenticação, permissão e versão
+    assert int(second.headers["x-db-statements"]) < int(first.headers["x-db-statements"])
+
+
+def test_writes_change_the_team_etag(api_client, team):
+    etag = api_client.get("/teams/1", headers=MANAGER).headers["etag"]
+    report_etag = api_client.get("/reports/dashboard/1", headers=MANAGER).headers["etag"]
+
+    created = api_client.post("/emotion_record/", json={"emotion_id": 1, "intensity": 4}, headers=EMPLOYEE)
+    assert created.status_code == 200, created.text
+
+    refreshed = api_client.get("/teams/1", headers={**MANAGER, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    report = api_client.get("/reports/dashboard/1", headers={**MANAGER, "If-None-Match": report_etag})
+    assert report.status_code == 200
+    assert report.json()["total_records"] == 1
+
+
+def test_emotion_changes_change_the_catalog_etag(api_client, team):
+    etag = api_client.get("/emotions/", headers=EMPLOYEE).headers["etag"]
+
+    updated = api_client.put("/emotions/1", json={"name": "Alegre", "emoji": "😀", "team_id": 1}, headers=MANAGER)
+    assert updated.status_code == 200, updated.text
+
+    catalog = api_client.get("/emotions/", headers={**EMPLOYEE, "If-None-Match": etag})
+    assert catalog.status_code == 200
+    assert "Alegre" in [emotion["name"] for emotion in catalog.json()["emotions"]]
+
+
+def test_etags_are_not_shared_between_users(api_client, team):
+    manager_etag = api_client.get("/teams/1", headers=MANAGER).headers["etag"]
+    response = api_client.get("/teams/1", headers={**EMPLOYEE, "If-None-Match": manager_etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != manager_etag
+
+
+def test_check_ins_keep_the_emotion_list_etags(api_client, team, query_budget):
+    catalog = api_client.get("/emotions/", headers=EMPLOYEE).headers["etag"]
+    team_emotions = api_client.get("/teams/1/emotions", headers=EMPLOYEE).headers["etag"]
+
+    created = api_client.post("/emotion_record/", json={"emotion_id": 1, "intensity": 4}, headers=EMPLOYEE)
+    assert created.status_code == 200, created.text
+
+    for path, etag in (("/emotions/", catalog), ("/teams/1/emotions", team_emotions)):
+        response = api_client.get(path, headers={**EMPLOYEE, "If-None-Match": etag})
+        assert response.status_code == 304
+    # A versão do catálogo é uma única consulta por chave primária, não uma por time
+    query_budget(api_client.get("/emotions/", headers={**EMPLOYEE, "If-None-Match": catalog}), 3)
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.crud import feedback_crud
+from app.models.feedback_model import FeedbackCreate
+from app.routers.authentication import create_access_token
+from app.schemas.emotion_record_schema import EmotionRecord
+from app.schemas.feedback_schema import Feedback
+from app.schemas.team_schema import user_teams
+
+EMPLOYEE = {"Authorization": f"Bearer {create_access_token({'sub': 'employee@example.com'})}"}
+START = datetime(2024, 5, 1, 9)
+
+
+@pytest.fixture
+def inbox(db):
+    # Cinco feedbacks para o colaborador, um por dia; o terceiro é sobre um registro anônimo
+    for index in range(5):
+        record = EmotionRecord(user_id=2, emotion_id=1, intensity=3, is_anonymous=index == 2)
+        db.add(record)
+        db.flush()
+        db.add(Feedback(message=f"Feedback {index}", emotion_record_id=record.id, manager_id=1,
+                        is_anonymous=False, created_at=START + timedelta(days=index)))
+    # Feedback de outro usuário, que nunca aparece na caixa do colaborador
+    other = EmotionRecord(user_id=1, emotion_id=1, intensity=3)
+    db.add(other)
+    db.flush()
+    db.add(Feedback(message="Outro", emotion_record_id=other.id, manager_id=1, created_at=START))
+    db.commit()
+    return db
+
+
+def test_inbox_is_one_query_newest_first_with_identity_computed_in_sql(inbox):
+    statements = []
+    event.listen(inbox.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    feedbacks, next_cursor = feedback_crud.get_feedbacks_by_user_id(inbox, 2)
+
+    assert len(statements) == 1
+    assert next_cursor is None
+    assert [feedback["message"] for feedback in feedbacks] == [f"Feedback {index}" for index in (4, 3, 2, 1, 0)]
+    assert [feedback["manager_knows_identity"] for feedback in feedbacks] == [True, True, False, True, True]
+
+
+def test_inbox_pages_follow_the_cursor_and_honor_since(api_client, inbox):
+    first = api_client.get("/feedback/?limit=2", headers=EMPLOYEE).json()
+    second = api_client.get(f"/feedback/?limit=2&cursor={first['next_cursor']}", headers=EMPLOYEE).json()
+    last = api_client.get(f"/feedback/?limit=2&cursor={second['next_cursor']}", headers=EMPLOYEE).json()
+
+    pages = [[feedback["message"] for feedback in page["feedbacks"]] for page in (first, second, last)]
+    assert pages == [["Feedback 4", "Feedback 3"], ["Feedback 2", "Feedback 1"], ["Feedback 0"]]
+    assert last["next_cursor"] is None
+
+    since = (START + timedelta(days=3)).isoformat()
+    recent = api_client.get("/feedback/", params={"since": since}, headers=EMPLOYEE).json()
+    assert [feedback["message"] for feedback in recent["feedbacks"]] == ["Feedback 4", "Feedback 3"]
+
+
+def test_inbox_rejects_invalid_cursors(api_client, inbox):
+    assert api_client.get("/feedback/?cursor=not-a-cursor", headers=EMPLOYEE).status_code == 422
+
+
+def test_feedback_creation_is_a_permission_check_plus_one_insert(inbox):
+    # O gerente (1) passa a gerenciar o time do colaborador (2)
+    inbox.execute(user_teams.insert().values(user_id=2, team_id=1))
+    inbox.commit()
+    anonymous_record = inbox.query(EmotionRecord).filter(EmotionRecord.is_anonymous.is_(True)).one()
+
+    statements = []
+    event.listen(inbox.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    created = feedback_crud.create_feedback(
+        inbox, FeedbackCreate(message="Vamos conversar?", emotion_record_id=anonymous_record.id), manager_id=1
+    )
+
+    assert len(statements) == 2
+    assert statements[1].lstrip().upper().startswith("INSERT")
+    assert created.id is not None and created.created_at is not None
+    assert created.manager_knows_identity is False
+
+
+def test_only_managers_of_the_record_owner_can_send_feedback(inbox):
+    # Sem vínculo entre o colaborador e um time do gerente
+    record_id = inbox.query(EmotionRecord.id).filter(EmotionRecord.user_id == 2).first().id
+    feedback = FeedbackCreate(message="Oi", emotion_record_id=record_id)
+
+    assert feedback_crud.create_feedback(inbox, feedback, manager_id=1) is None
+    assert inbox.query(Feedback).filter(Feedback.emotion_record_id == record_id).count() == 1
+    assert feedback_crud.create_feedback(inbox, FeedbackCreate(message="Oi", emotion_record_id=999), 1) is None
+
+
+def test_create_feedback_route_answers_403_without_permission(api_client, inbox):
+    manager = {"Authorization": f"Bearer {create_access_token({'sub': 'manager@example.com'})}"}
+    response = api_client.post("/feedback/", json={"message": "Oi", "emotion_record_id": 1}, headers=manager)
+    assert response.status_code == 403
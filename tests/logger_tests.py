@@ -0,0 +1,27 @@
+import json
+import logging
+
+from app.utils.logger import JsonFormatter, SamplingFilter, parse_sampling
+
+
+def _record(name, level, message, *args, **extra):
+    record = logging.LogRecord(name, level, __file__, 1, message, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_emits_message_and_extra_fields():
+    line = JsonFormatter().format(_record("MA", logging.INFO, "Team %s updated", 7, team_id=7))
+    entry = json.loads(line)
+    assert entry["message"] == "Team 7 updated"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "MA"
+    assert entry["team_id"] == 7
+
+
+def test_sampling_uses_the_most_specific_logger_and_keeps_warnings():
+    sampling = SamplingFilter(parse_sampling("MA=1, MA.request=0"))
+    assert sampling.filter(_record("MA", logging.DEBUG, "kept"))
+    assert not sampling.filter(_record("MA.request", logging.DEBUG, "dropped"))
+    assert not sampling.filter(_record("MA.request.slow", logging.INFO, "dropped"))
+    assert sampling.filter(_record("MA.request", logging.WARNING, "always kept"))
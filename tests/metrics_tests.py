@@ -0,0 +1,82 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.main import app
+from app.routers import authentication
+from app.core.request_metrics import (
+    RequestMetrics,
+    RequestTiming,
+    current_timing,
+    instrument_engine,
+    request_metrics,
+)
+
+
+def test_responses_carry_server_timing_header():
+    response = TestClient(app).get("/ping")
+    assert response.status_code == 200
+    assert [part.split(";")[0] for part in response.headers["server-timing"].split(", ")] == [
+        "db", "serialize", "total"
+    ]
+
+
+def test_metrics_are_labelled_by_route_template(monkeypatch):
+    monkeypatch.setattr(authentication, "METRICS_TOKEN", "scraper-secret")
+    request_metrics.reset()
+    client = TestClient(app)
+    client.get("/teams/1")
+    client.get("/teams/2")
+    client.get("/does-not-exist")
+
+    assert client.get("/metrics").status_code == 401
+    body = client.get("/metrics", headers={"Authorization": "Bearer scraper-secret"}).text
+    assert 'http_requests_total{method="GET",route="/teams/{team_id}",status="401"} 2' in body
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in body
+    assert 'http_requests_total{method="GET",route="/metrics",status="401"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/teams/{team_id}"} 2' in body
+    assert 'http_response_size_bytes_bucket{method="GET",route="/teams/{team_id}",le="+Inf"} 2' in body
+    # A própria requisição de /metrics ainda está em andamento
+    assert "http_requests_in_flight 1" in body
+
+
+def test_histograms_are_cumulative():
+    metrics = RequestMetrics()
+    for seconds in (0.001, 0.02, 0.02, 20):
+        metrics.request_started()
+        metrics.request_finished("GET", "/ping", 200, seconds, 10)
+
+    body = metrics.render()
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/ping",le="0.005"} 1' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/ping",le="0.025"} 3' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/ping",le="10"} 3' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/ping",le="+Inf"} 4' in body
+    assert "http_requests_in_flight 0" in body
+
+
+def test_database_time_is_added_to_the_current_request(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+
+    async def query_async():
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        await async_engine.dispose()
+
+    timing = RequestTiming()
+    token = current_timing.set(timing)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        sync_seconds = timing.db_seconds
+        asyncio.run(query_async())
+    finally:
+        current_timing.reset(token)
+        engine.dispose()
+
+    assert sync_seconds > 0
+    assert timing.db_seconds > sync_seconds
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import Session
+
+from app.crud import emotion_crud, emotion_record_crud, team_crud
+from app.databases.postgres_database import Base
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _upgrade(url: str) -> None:
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+
+def _query_plans(engine, run) -> list[str]:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as db:
+            run(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    plans = []
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append(" | ".join(row[-1] for row in rows))
+    return plans
+
+
+def test_migrations_build_the_model_schema(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    _upgrade(url)
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+    engine.dispose()
+
+
+def test_migrations_adopt_a_database_created_by_create_all(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+
+    _upgrade(url)
+
+    assert "alembic_version" in inspect(engine).get_table_names()
+    engine.dispose()
+
+
+def test_hot_path_queries_use_indexes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'plans.db'}"
+    _upgrade(url)
+    engine = create_engine(url)
+
+    plans = _query_plans(engine, lambda db: emotion_record_crud.get_emotion_records_by_user_id(db, [1], limit=10))
+    assert "ix_emotion_record_user_id_created_at" in plans[0]
+
+    plans = _query_plans(engine, lambda db: emotion_record_crud.get_feedback_summaries_by_record_ids(db, [1, 2]))
+    assert "ix_feedback_emotion_record_id" in plans[0]
+
+    plans = _query_plans(engine, lambda db: emotion_crud.get_emotions_by_team(db, 1))
+    assert "ix_emotion_team_id" in plans[0]
+
+    plans = _query_plans(engine, lambda db: team_crud.get_team_role(db, 1, 1))
+    assert "SCAN" not in plans[0]
+
+    engine.dispose()
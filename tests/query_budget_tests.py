@@ -0,0 +1,62 @@
+import pytest
+
+from app.routers.authentication import create_access_token
+from app.schemas.emotion_record_schema import EmotionRecord
+from app.schemas.feedback_schema import Feedback
+from app.schemas.team_schema import user_teams
+
+# Registros suficientes para que uma consulta por linha estoure qualquer orçamento abaixo
+RECORDS = 20
+
+
+def _headers(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+@pytest.fixture
+def team_with_feedbacks(db):
+    db.execute(user_teams.insert().values(user_id=2, team_id=1))
+    for index in range(RECORDS):
+        record = EmotionRecord(user_id=2, emotion_id=1 + index % 2, intensity=3, is_anonymous=index % 3 == 0)
+        db.add(record)
+        db.flush()
+        db.add(Feedback(message="Obrigado!", emotion_record_id=record.id, manager_id=1, is_anonymous=False))
+    db.commit()
+    return db
+
+
+def test_requests_report_their_sql_statements(api_client, db):
+    response = api_client.get("/user/logged", headers=_headers("employee@example.com"))
+    assert response.status_code == 200
+    assert int(response.headers["x-db-statements"]) > 0
+    assert response.headers["server-timing"].startswith("db;dur=")
+
+
+@pytest.mark.parametrize(
+    "email, path, budget",
+    [
+        ("employee@example.com", "/feedback/", 2),
+        ("employee@example.com", "/emotion_record/?include_feedbacks=true", 3),
+        ("employee@example.com", "/emotion_record/Feliz?include_feedbacks=true", 4),
+        ("employee@example.com", "/feedback/emotion-record/1", 3),
+        ("employee@example.com", "/emotion_record/id/1?include_feedbacks=true", 2),
+        ("manager@example.com", "/teams/1", 8),
+        ("manager@example.com", "/reports/dashboard/1", 4),
+        ("manager@example.com", "/teams/1/emotions", 4),
+    ],
+)
+def test_read_endpoints_stay_within_their_query_budget(api_client, team_with_feedbacks, query_budget,
+                                                       email, path, budget):
+    response = api_client.get(path, headers=_headers(email))
+    assert response.status_code == 200, response.text
+    query_budget(response, budget)
+
+
+def test_feedback_creation_stays_within_its_query_budget(api_client, team_with_feedbacks, query_budget):
+    response = api_client.post(
+        "/feedback/",
+        json={"message": "Vamos conversar?", "emotion_record_id": 1},
+        headers=_headers("manager@example.com"),
+    )
+    assert response.status_code == 200, response.text
+    query_budget(response, 3)
@@ -0,0 +1,219 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app  # noqa: F401  (registra todos os schemas)
+from app.core import report_cache as report_cache_module
+from app.core.report_cache import cached_report, invalidate_team_reports, report_cache
+from app.crud import emotion_crud, emotion_record_crud, reports_crud
+from app.crud.team_emotion_daily_crud import rebuild_daily_rollup
+from app.models.emotion_record_model import EmotionRecord as EmotionRecordModel
+from app.models.team_model import TeamRole
+from app.models.user_model import UserInDB
+from app.routers.authentication import create_access_token
+from app.schemas.emotion_record_schema import EmotionRecord, TeamEmotionDaily
+from app.utils.constants import Analytics, Role
+
+
+def _record(db, emotion_id, intensity):
+    return emotion_record_crud.create_emotion_record(
+        db, EmotionRecordModel(user_id=2, emotion_id=emotion_id, intensity=intensity)
+    )
+
+
+def _rollup(db):
+    return sorted(
+        (row.team_id, row.emotion_id, row.day, row.count, row.intensity_sum, row.negative_count)
+        for row in db.query(TeamEmotionDaily).all()
+    )
+
+
+def test_create_emotion_record_updates_daily_rollup(db):
+    for emotion_id, intensity in [(1, 5), (1, 3), (2, 2)]:
+        _record(db, emotion_id, intensity)
+
+    today = datetime.date.today()
+    assert _rollup(db) == [(1, 1, today, 2, 8, 0), (1, 2, today, 1, 2, 1)]
+
+    distribution = reports_crud.get_emoji_distribution_report(db, 1, None, None)
+    assert [(item.emotion_name, item.frequency) for item in distribution.emoji_distribution] == [
+        ("Feliz", 2), ("Triste", 1)
+    ]
+    assert distribution.negative_emotion_ratio == pytest.approx(100 / 3)
+
+    intensity = reports_crud.get_average_intensity_report(db, 1, today, today)
+    assert [(item["emotion_name"], item["avg_intensity"]) for item in intensity["average_intensity"]] == [
+        ("Feliz", 4.0), ("Triste", 2.0)
+    ]
+
+    yesterday = today - datetime.timedelta(days=1)
+    assert reports_crud.get_emoji_distribution_report(db, 1, None, yesterday).emoji_distribution == []
+
+
+def test_rebuild_daily_rollup_matches_incremental_updates(db):
+    _record(db, 1, 2)
+    _record(db, 2, 5)
+    old_record = _record(db, 2, 1)
+    old_record.created_at = datetime.datetime(2024, 1, 10, 9, 30)
+    db.commit()
+
+    rebuild_daily_rollup(db)
+    rebuilt = _rollup(db)
+    assert (1, 2, datetime.date(2024, 1, 10), 1, 1, 1) in rebuilt
+
+    rebuild_daily_rollup(db, team_id=1)
+    assert _rollup(db) == rebuilt
+    assert sum(row[3] for row in rebuilt) == db.query(EmotionRecord).count()
+
+
+def test_emotion_changes_are_propagated_to_rollup(db):
+    _record(db, 1, 3)
+    _record(db, 2, 3)
+
+    emotion_crud.update_emotion(db, 1, {"is_negative": True}, user_id=1)
+    assert reports_crud.get_emoji_distribution_report(db, 1, None, None).negative_emotion_ratio == 100
+
+    db.query(EmotionRecord).delete()
+    db.commit()
+    assert emotion_crud.delete_emotion(db, 2, user_id=1)
+    assert [row[1] for row in _rollup(db)] == [1]
+
+
+def test_reports_are_cached_until_the_team_changes(db):
+    _record(db, 1, 4)
+    first = reports_crud.get_emoji_distribution_report(db, 1, None, None)
+    assert reports_crud.get_emoji_distribution_report(db, 1, None, None) == first
+    assert report_cache.stats()["hits"] == 1
+
+    # Outro time não invalida os relatórios deste
+    invalidate_team_reports(2)
+    assert reports_crud.get_emoji_distribution_report(db, 1, None, None) == first
+    assert report_cache.stats()["hits"] == 2
+
+    _record(db, 2, 1)
+    refreshed = reports_crud.get_emoji_distribution_report(db, 1, None, None)
+    assert sum(item.frequency for item in refreshed.emoji_distribution) == 2
+
+    reports_crud.get_average_intensity_report(db, 1, None, None)
+    emotion_crud.update_emotion(db, 1, {"name": "Alegre"}, user_id=1)
+    intensity = reports_crud.get_average_intensity_report(db, 1, None, None)
+    assert "Alegre" in [item["emotion_name"] for item in intensity["average_intensity"]]
+
+
+def test_cached_reports_are_copies(db):
+    _record(db, 1, 4)
+    first = reports_crud.get_emoji_distribution_report(db, 1, None, None)
+    first.emoji_distribution.clear()
+    intensity = reports_crud.get_average_intensity_report(db, 1, None, None)
+    intensity["average_intensity"].clear()
+    hits = report_cache.stats()["hits"]
+
+    assert len(reports_crud.get_emoji_distribution_report(db, 1, None, None).emoji_distribution) == 1
+    assert len(reports_crud.get_average_intensity_report(db, 1, None, None)["average_intensity"]) == 1
+    assert report_cache.stats()["hits"] == hits + 2
+
+
+def test_reports_built_during_an_invalidation_are_not_cached():
+    @cached_report("test")
+    def build_then_write(db, team_id, start_date, end_date):
+        invalidate_team_reports(team_id)
+        return {"team_id": team_id}
+
+    assert build_then_write(None, 1) == {"team_id": 1}
+    assert report_cache.stats()["size"] == 0
+    # Nenhum time fica registrado depois que o cálculo termina
+    assert report_cache_module._building == {}
+
+
+def test_admin_metrics_exposes_report_cache_stats(api_client):
+    manager = {"Authorization": f"Bearer {create_access_token({'sub': 'manager@example.com'})}"}
+    response = api_client.get("/admin/metrics", headers=manager)
+    assert response.status_code == 200
+    assert {"hits", "misses", "size"} <= response.json()["report_cache"].keys()
+
+
+def test_dashboard_report_matches_the_separate_reports(db):
+    for emotion_id, intensity in [(1, 5), (1, 4), (2, 1), (2, 2), (2, 3)]:
+        _record(db, emotion_id, intensity)
+
+    dashboard = reports_crud.get_dashboard_report(db, 1, None, None)
+    distribution = reports_crud.get_emoji_distribution_report(db, 1, None, None)
+    intensity = reports_crud.get_average_intensity_report(db, 1, None, None)
+
+    assert [(item.emotion_name, item.frequency) for item in dashboard.emotions] == [
+        (item.emotion_name, item.frequency) for item in distribution.emoji_distribution
+    ]
+    assert {item.emotion_name: item.avg_intensity for item in dashboard.emotions} == {
+        item["emotion_name"]: item["avg_intensity"] for item in intensity["average_intensity"]
+    }
+    assert dashboard.total_records == 5
+    assert dashboard.negative_emotion_ratio == distribution.negative_emotion_ratio == 60
+    assert dashboard.alert == distribution.alert
+
+
+def test_dashboard_endpoint_is_restricted_to_the_team_manager():
+    token = create_access_token({"sub": "employee@example.com"})
+    employee = UserInDB(id=2, name="Employee", email="employee@example.com", disabled=False,
+                        role=Role.MANAGER, hashed_password="x")
+    with patch("app.crud.user_crud.get_user_by_email", return_value=employee), \
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=TeamRole.MEMBER), \
+         patch("app.routers.reports_router.reports_crud.get_dashboard_report") as mock_dashboard:
+        response = TestClient(app).get("/reports/dashboard/1", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 403
+        mock_dashboard.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "granularity, expected",
+    [
+        ("day", [(datetime.date(2025, 1, 5), 1), (datetime.date(2025, 1, 6), 2), (datetime.date(2025, 2, 3), 1)]),
+        ("week", [(datetime.date(2024, 12, 30), 1), (datetime.date(2025, 1, 6), 2), (datetime.date(2025, 2, 3), 1)]),
+        ("month", [(datetime.date(2025, 1, 1), 3), (datetime.date(2025, 2, 1), 1)]),
+    ],
+)
+def test_trend_report_groups_records_by_bucket(db, granularity, expected):
+    # 05/01/2025 é um domingo: pertence à semana iniciada na segunda 30/12/2024
+    for day, emotion_id, intensity in [(5, 1, 4), (6, 1, 2), (6, 2, 3)]:
+        _record(db, emotion_id, intensity).created_at = datetime.datetime(2025, 1, day, 12)
+    _record(db, 2, 5).created_at = datetime.datetime(2025, 2, 3, 12)
+    db.commit()
+    rebuild_daily_rollup(db)
+
+    trend = reports_crud.get_trend_report(db, 1, None, None, granularity=granularity)
+    assert [(bucket.bucket_start, bucket.count) for bucket in trend.buckets] == expected
+
+    if granularity == "month":
+        january = trend.buckets[0]
+        assert january.avg_intensity == 3.0
+        assert january.negative_ratio == pytest.approx(100 / 3)
+
+
+def test_anomaly_report_flags_an_unusual_day(db):
+    start = datetime.date(2025, 3, 1)
+    for offset in range(40):
+        day = start + datetime.timedelta(days=offset)
+        intensities = [5, 5, 5] if offset == 35 else [2, 3] if offset % 2 else [3, 2, 3]
+        for intensity in intensities:
+            _record(db, 1, intensity).created_at = datetime.datetime.combine(day, datetime.time(10))
+    db.commit()
+    rebuild_daily_rollup(db)
+
+    report = reports_crud.get_anomaly_report(db, 1, None, start + datetime.timedelta(days=45))
+
+    assert report.end_date - report.start_date == datetime.timedelta(days=365)
+    assert len(report.points) == 40
+    assert report.anomalies == [start + datetime.timedelta(days=35)]
+    assert report.points[35].intensity_zscore > Analytics.ZSCORE_THRESHOLD
+    assert report.points[6].rolling_intensity is not None
+
+
+@pytest.mark.parametrize("start, end", [("2024-05-02", "2024-05-01"), ("2024-05-10", "2024-05-01")])
+def test_anomaly_report_rejects_inverted_periods(api_client, db, start, end):
+    assert reports_crud.get_anomaly_report(db, 1, datetime.date.fromisoformat(start),
+                                           datetime.date.fromisoformat(end)) is None
+
+    manager = {"Authorization": f"Bearer {create_access_token({'sub': 'manager@example.com'})}"}
+    response = api_client.get(f"/reports/anomalies/1?start_date={start}&end_date={end}", headers=manager)
+    assert response.status_code == 422
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Importação a frio de app.main (tempo acumulado do -X importtime); ajustável para máquinas lentas
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "3000"))
+
+
+def _run_python(code: str, database_url: str, *options: str, **env_vars: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DATABASE_URL": database_url, "LOG_LEVEL": "WARNING", **env_vars}
+    return subprocess.run(
+        [sys.executable, *options, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def test_importing_the_app_does_not_touch_the_database(tmp_path):
+    database = tmp_path / "app.db"
+    result = _run_python(
+        "import sys, app.main\n"
+        "from app.databases import postgres_database\n"
+        "print(postgres_database._engine is None, postgres_database._async_engine is None, 'aiosqlite' in sys.modules)",
+        f"sqlite:///{database}",
+    )
+
+    assert result.stdout.split() == ["True", "True", "False"]
+    assert not database.exists()
+
+
+def test_app_import_stays_within_its_time_budget(tmp_path):
+    result = _run_python("import app.main", f"sqlite:///{tmp_path / 'app.db'}", "-X", "importtime")
+
+    # Linhas no formato "import time: self [us] | cumulative | imported package"
+    cumulative_us = next(
+        int(line.split("|")[1]) for line in result.stderr.splitlines() if line.split("|")[-1].strip() == "app.main"
+    )
+    assert cumulative_us / 1000 < IMPORT_TIME_BUDGET_MS, f"app.main took {cumulative_us / 1000:.0f} ms to import"
+
+
+def test_startup_creates_the_schema_and_warms_the_pools(tmp_path):
+    database = tmp_path / "app.db"
+    result = _run_python(
+        "from fastapi.testclient import TestClient\n"
+        "from sqlalchemy import inspect\n"
+        "from app.main import app\n"
+        "from app.databases import postgres_database\n"
+        "with TestClient(app) as client:\n"
+        "    assert client.get('/ping').status_code == 200\n"
+        "    print(sorted(inspect(postgres_database.get_engine()).get_table_names()))\n"
+        "    print(postgres_database.get_engine().pool.checkedin(), postgres_database.get_async_engine().pool.checkedin())\n",
+        f"sqlite:///{database}",
+        DB_POOL_WARMUP="2",
+    )
+
+    tables, pools = result.stdout.splitlines()
+    assert "emotion_record" in tables and "team" in tables
+    assert pools.split() == ["2", "2"]
@@ -1,6 +1,14 @@
+import json
+from datetime import datetime
+
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from app.main import app
+from app.crud import team_crud
+from app.schemas.emotion_record_schema import EmotionRecord
+from app.schemas.team_schema import user_teams
+from app.schemas.user_schema import User
+from app.models.team_model import TeamRole
 from app.models.user_model import UserInDB
 from app.utils.constants import Role
 from app.routers.authentication import create_access_token
@@ -11,34 +19,150 @@ manager_user = UserInDB(id=1, name="Manager", email="manager@example.com", disab
 employee_user = UserInDB(id=2, name="Employee", email="employee@example.com", disabled=False, role=Role.EMPLOYEE, hashed_password="x")
 outsider_user = UserInDB(id=3, name="Other", email="other@example.com", disabled=False, role=Role.EMPLOYEE, hashed_password="x")
 
-mock_team = {
-    "team_data": MagicMock(id=1, manager_id=1),
-    "members": [MagicMock(id=2)],
-    "emotions_reports": []
-}
 
+def test_employee_can_get_team(api_client, db):
+    # A rota usa o CRUD assíncrono; o colaborador entra no time do banco real da fixture
+    db.execute(user_teams.insert().values(user_id=2, team_id=1))
+    db.commit()
+    token = create_access_token({"sub": employee_user.email})
+
+    response = api_client.get("/teams/1", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["team_data"]["id"] == 1
+    assert [member["email"] for member in body["members"]] == [employee_user.email]
+    assert body["manager"]["email"] == manager_user.email
+    assert sorted(emotion["name"] for emotion in body["emotions"]) == ["Feliz", "Triste"]
+
+
+def test_outsider_cannot_get_team():
+    token = create_access_token({"sub": outsider_user.email})
+    with patch("app.crud.user_crud.get_user_by_email", return_value=outsider_user), \
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=TeamRole.NONE), \
+         patch("app.routers.team_router.team_crud.get_team_by_id") as mock_get_team:
+        response = client.get("/teams/1", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 403
+        mock_get_team.assert_not_called()
 
-def test_employee_can_get_team():
+
+def test_employee_can_get_team_emotions(api_client):
     token = create_access_token({"sub": employee_user.email})
     with patch("app.crud.user_crud.get_user_by_email", return_value=employee_user), \
-         patch("app.routers.team_router.team_crud.get_team_by_id", return_value=mock_team), \
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=TeamRole.MEMBER), \
+         patch("app.routers.team_router.team_crud.get_team_by_id") as mock_get_team, \
          patch("app.routers.team_router.emotion_crud.get_emotions_by_team", return_value=[]):
-        response = client.get("/teams/1", headers={"Authorization": f"Bearer {token}"})
+        response = api_client.get("/teams/1/emotions", headers={"Authorization": f"Bearer {token}"})
         assert response.status_code == 200
+        mock_get_team.assert_not_called()
 
 
-def test_outsider_cannot_get_team():
+def test_outsider_cannot_get_team_emotions():
     token = create_access_token({"sub": outsider_user.email})
     with patch("app.crud.user_crud.get_user_by_email", return_value=outsider_user), \
-         patch("app.routers.team_router.team_crud.get_team_by_id", return_value=mock_team):
-        response = client.get("/teams/1", headers={"Authorization": f"Bearer {token}"})
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=TeamRole.NONE):
+        response = client.get("/teams/1/emotions", headers={"Authorization": f"Bearer {token}"})
         assert response.status_code == 403
 
 
-def test_employee_can_get_team_emotions():
+def test_get_emotions_of_missing_team():
     token = create_access_token({"sub": employee_user.email})
     with patch("app.crud.user_crud.get_user_by_email", return_value=employee_user), \
-         patch("app.routers.team_router.team_crud.get_team_by_id", return_value=mock_team), \
-         patch("app.routers.team_router.emotion_crud.get_emotions_by_team", return_value=[]):
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=None):
         response = client.get("/teams/1/emotions", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 404
+
+
+def test_member_cannot_add_team_member():
+    token = create_access_token({"sub": employee_user.email})
+    with patch("app.crud.user_crud.get_user_by_email", return_value=employee_user), \
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=TeamRole.MEMBER), \
+         patch("app.routers.team_router.team_crud.add_team_member") as mock_add_member:
+        response = client.post(
+            "/teams/1?user_email=other@example.com", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 403
+        mock_add_member.assert_not_called()
+
+
+def test_manager_can_add_team_member():
+    token = create_access_token({"sub": manager_user.email})
+    with patch("app.crud.user_crud.get_user_by_email", side_effect=[manager_user, outsider_user]), \
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=TeamRole.MANAGER), \
+         patch("app.routers.team_router.team_crud.get_team_by_id") as mock_get_team, \
+         patch("app.routers.team_router.team_crud.add_team_member", return_value=True) as mock_add_member:
+        response = client.post(
+            "/teams/1?user_email=other@example.com", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+        mock_add_member.assert_called_once()
+        assert mock_add_member.call_args.args[1:] == (1, outsider_user.id)
+        mock_get_team.assert_not_called()
+
+
+def test_manager_can_export_team_records_as_csv():
+    token = create_access_token({"sub": manager_user.email})
+    rows = [
+        {"id": 2, "created_at": datetime(2025, 1, 2, 9), "emotion_id": 1, "emotion_name": "Feliz", "intensity": 4,
+         "notes": "ok, tudo bem", "is_anonymous": False, "user_id": 2, "user_name": "Employee"},
+        {"id": 1, "created_at": datetime(2025, 1, 1, 9), "emotion_id": 1, "emotion_name": "Feliz", "intensity": 2,
+         "notes": None, "is_anonymous": True, "user_id": None, "user_name": None},
+    ]
+    with patch("app.crud.user_crud.get_user_by_email", return_value=manager_user), \
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=TeamRole.MANAGER), \
+         patch("app.routers.team_router.SessionLocal"), \
+         patch("app.routers.team_router.team_crud.iter_team_emotion_records", return_value=iter(rows)):
+        response = client.get("/teams/1/export", headers={"Authorization": f"Bearer {token}"})
         assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.splitlines()
+        assert lines[0] == "id,created_at,emotion_id,emotion_name,intensity,notes,is_anonymous,user_id,user_name"
+        assert lines[1] == '2,2025-01-02T09:00:00,1,Feliz,4,"ok, tudo bem",False,2,Employee'
+        assert lines[2] == "1,2025-01-01T09:00:00,1,Feliz,2,,True,,"
+
+
+def test_manager_can_export_team_records_as_ndjson():
+    token = create_access_token({"sub": manager_user.email})
+    rows = [{"id": 1, "created_at": datetime(2025, 1, 1, 9), "user_name": None}]
+    with patch("app.crud.user_crud.get_user_by_email", return_value=manager_user), \
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=TeamRole.MANAGER), \
+         patch("app.routers.team_router.SessionLocal"), \
+         patch("app.routers.team_router.team_crud.iter_team_emotion_records", return_value=iter(rows)):
+        response = client.get("/teams/1/export?format=ndjson", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert [json.loads(line) for line in response.text.splitlines()] == [
+            {"id": 1, "created_at": "2025-01-01T09:00:00", "user_name": None}
+        ]
+
+
+def test_member_cannot_export_team_records():
+    token = create_access_token({"sub": employee_user.email})
+    with patch("app.crud.user_crud.get_user_by_email", return_value=employee_user), \
+         patch("app.core.auth_utils.team_crud.get_team_role", return_value=TeamRole.MEMBER):
+        response = client.get("/teams/1/export", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 403
+
+
+def test_iter_team_emotion_records_masks_anonymous_records(db):
+    outsider = User(id=3, name="Outsider", email="outsider@example.com", hashed_password="x", role="employee")
+    db.add(outsider)
+    db.execute(user_teams.insert().values(user_id=2, team_id=1))
+    db.add_all([
+        EmotionRecord(id=1, user_id=2, emotion_id=1, intensity=3, is_anonymous=False, created_at=datetime(2025, 1, 1)),
+        EmotionRecord(id=2, user_id=2, emotion_id=2, intensity=5, is_anonymous=True, created_at=datetime(2025, 1, 2)),
+        EmotionRecord(id=3, user_id=3, emotion_id=1, intensity=1, is_anonymous=False, created_at=datetime(2025, 1, 3)),
+    ])
+    db.commit()
+
+    rows = list(team_crud.iter_team_emotion_records(db, 1, batch_size=1))
+    assert [(row["id"], row["user_id"], row["user_name"]) for row in rows] == [(2, None, None), (1, 2, "Employee")]
+    assert rows[1]["emotion_name"] == "Feliz"
+
+
+def test_manager_can_rename_team(api_client):
+    token = create_access_token({"sub": manager_user.email})
+    response = api_client.put("/teams/1", json={"name": "Time Renomeado"}, headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Time Renomeado"
+    assert response.json()["manager_id"] == 1